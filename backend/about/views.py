@@ -3,12 +3,13 @@ from rest_framework.response import Response
 from .models import *
 from .serializers import *
 
-from backend.utils import get_serialized_page_data
+from backend.page_cache import aget_cached_page_response
+from django.views import View
 from backend.custom_views import *
 
 
-class AboutFullView(generics.GenericAPIView):
-    def get(self, request, *args, **kwargs):
+class AboutFullView(View):
+    async def get(self, request, *args, **kwargs):
         model_dict = {
             "header": {
                 "app_label": "about",
@@ -31,9 +32,7 @@ class AboutFullView(generics.GenericAPIView):
             },
         }
 
-        data = get_serialized_page_data(model_dict, request)
-
-        return Response(data)
+        return await aget_cached_page_response("about", model_dict, request)
 
 
 class AboutHeaderAPIView(BaseListView):
@@ -0,0 +1,214 @@
+import datetime
+import hashlib
+import math
+import threading
+import time
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from backend.versions import bump_cache_counter, uses_shared_cache
+from .models import TokenBlacklist
+from .tokens import get_token_hash
+
+
+BLACKLIST_VERSION_KEY = "token-blacklist-version"
+BLACKLIST_GENERATION_KEY = "token-blacklist-generation"
+BLACKLIST_REFRESH_INTERVAL = getattr(settings, "TOKEN_BLACKLIST_REFRESH_INTERVAL", 30)
+
+
+def get_token_expiry(token):
+    """
+    Return the ``exp`` claim of a token as an aware datetime, or None.
+
+    The signature is still checked; only the expiry itself is ignored.
+    """
+    try:
+        payload = jwt.decode(
+            jwt=token,
+            key=settings.SECRET_KEY,
+            algorithms=["HS256"],
+            options={"verify_exp": False},
+        )
+    except jwt.exceptions.InvalidTokenError:
+        return None
+
+    if "exp" not in payload:
+        return None
+
+    return datetime.datetime.fromtimestamp(payload["exp"], tz=datetime.timezone.utc)
+
+
+class BloomFilter:
+    """
+    A fixed-size bloom filter over hex token hashes.
+
+    ``in`` never gives a false negative; false positives happen at roughly
+    ``error_rate`` once ``capacity`` items have been added.
+    """
+
+    def __init__(self, capacity=1024, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(
+            8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def get_positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self.get_positions(item):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self.get_positions(item)
+        )
+
+
+class TokenBlacklistFilter:
+    """
+    Process-local bloom filter in front of the TokenBlacklist table.
+
+    Tokens that are not in the filter are known not to be blacklisted and
+    are answered without a query; only filter hits are confirmed against
+    the indexed ``token_hash`` column.
+
+    New entries from this process are added directly. Entries written by
+    other processes are loaded incrementally (rows added since the last
+    refresh) when the shared blacklist version in the Django cache changes,
+    and at least every ``TOKEN_BLACKLIST_REFRESH_INTERVAL`` seconds in case
+    a version was evicted. Without a shared cache the version cannot be
+    seen, so ``is_token_blacklisted`` skips the filter. Purging expired entries
+    bumps the generation, which rebuilds the filter from scratch. Removed
+    entries only ever cause false positives, which the table check answers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._last_id = 0
+        self._version = None
+        self._generation = None
+        self._refreshed_at = 0
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+
+    def rebuild(self):
+        active = TokenBlacklist.objects.exclude(expires_at__lt=timezone.now())
+        bloom = BloomFilter(capacity=max(1024, active.count() * 2))
+        last_id = 0
+
+        for pk, token_hash in active.values_list("id", "token_hash").iterator():
+            if token_hash:
+                bloom.add(token_hash)
+
+            last_id = max(last_id, pk)
+
+        self._filter = bloom
+        self._last_id = last_id
+
+    def refresh(self):
+        rows = TokenBlacklist.objects.filter(id__gt=self._last_id).values_list(
+            "id", "token_hash"
+        )
+
+        for pk, token_hash in rows:
+            if token_hash:
+                self._filter.add(token_hash)
+
+            self._last_id = max(self._last_id, pk)
+
+    def ensure_current(self):
+        keys = cache.get_many([BLACKLIST_VERSION_KEY, BLACKLIST_GENERATION_KEY])
+        version = keys.get(BLACKLIST_VERSION_KEY, 0)
+        generation = keys.get(BLACKLIST_GENERATION_KEY, 0)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._filter is None or generation != self._generation:
+                self.rebuild()
+            elif (
+                version != self._version
+                or now - self._refreshed_at >= BLACKLIST_REFRESH_INTERVAL
+            ):
+                self.refresh()
+            else:
+                return
+
+            self._version = version
+            self._generation = generation
+            self._refreshed_at = now
+
+    def add(self, token_hash):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(token_hash)
+
+    def might_contain(self, token_hash):
+        self.ensure_current()
+
+        return token_hash in self._filter
+
+
+blacklist_filter = TokenBlacklistFilter()
+
+
+def is_token_blacklisted(token):
+    """
+    Return whether a token has been blacklisted.
+
+    Without a shared cache, the filter would miss entries written by other
+    processes, so the table is always checked.
+    """
+    token_hash = get_token_hash(token)
+
+    if uses_shared_cache() and not blacklist_filter.might_contain(token_hash):
+        return False
+
+    return TokenBlacklist.objects.filter(token_hash=token_hash).exists()
+
+
+def blacklist_token(token):
+    """
+    Blacklist a token; blacklisting the same token twice is a no-op.
+    """
+    token_hash = get_token_hash(token)
+
+    try:
+        with transaction.atomic():
+            TokenBlacklist.objects.get_or_create(
+                token_hash=token_hash, defaults={"token": token}
+            )
+    except IntegrityError:
+        pass
+
+    # TokenBlacklist's post_save receiver updates the filter and the version.
+
+
+def purge_expired_tokens(now=None):
+    """
+    Delete the blacklist entries of tokens that have expired anyway.
+
+    Returns:
+        The number of deleted entries.
+    """
+    deleted, _ = TokenBlacklist.objects.filter(
+        expires_at__lt=now or timezone.now()
+    ).delete()
+
+    if deleted:
+        bump_cache_counter(BLACKLIST_GENERATION_KEY)
+
+    return deleted
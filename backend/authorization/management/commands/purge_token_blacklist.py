@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from authorization.blacklist import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete blacklisted tokens whose JWT has already expired."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired tokens"))
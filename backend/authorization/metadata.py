@@ -91,4 +91,5 @@ TOKEN_BLACKLIST_METADATA = {
         },
     },
     "allowed": False,
+    "paginate": True,
 }
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:15
+
+import datetime
+import hashlib
+
+import jwt
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def get_token_expiry(token):
+    try:
+        payload = jwt.decode(
+            jwt=token,
+            key=settings.SECRET_KEY,
+            algorithms=['HS256'],
+            options={'verify_exp': False},
+        )
+    except jwt.exceptions.InvalidTokenError:
+        return None
+
+    if 'exp' not in payload:
+        return None
+
+    return datetime.datetime.fromtimestamp(payload['exp'], tz=datetime.timezone.utc)
+
+
+def fill_token_hashes(apps, schema_editor):
+    TokenBlacklist = apps.get_model('authorization', 'TokenBlacklist')
+    entries = []
+
+    for entry in TokenBlacklist.objects.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        entry.token_hash = hashlib.sha256(entry.token.encode()).hexdigest()
+        entry.expires_at = get_token_expiry(entry.token)
+        entries.append(entry)
+
+        if len(entries) >= BATCH_SIZE:
+            TokenBlacklist.objects.bulk_update(entries, ['token_hash', 'expires_at'])
+            entries = []
+
+    TokenBlacklist.objects.bulk_update(entries, ['token_hash', 'expires_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authorization', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tokenblacklist',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, editable=False, null=True, verbose_name='Expires At'),
+        ),
+        migrations.AddField(
+            model_name='tokenblacklist',
+            name='token_hash',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True, verbose_name='Token Hash'),
+        ),
+        migrations.RunPython(fill_token_hashes, migrations.RunPython.noop),
+    ]
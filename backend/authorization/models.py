@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import AbstractUser, UserManager
 from backend.customs import *
 from .metadata import *
@@ -143,15 +145,59 @@ class TokenBlacklist(models.Model):
         verbose_name="Token",
         help_text="Token",
     )
+    token_hash = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        editable=False,
+        verbose_name="Token Hash",
+    )
     blacklisted_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Blacklisted At",
         help_text="",
     )
+    expires_at = models.DateTimeField(
+        null=True,
+        db_index=True,
+        editable=False,
+        verbose_name="Expires At",
+    )
 
     def __str__(self):
         return self.token
 
+    def save(self, *args, **kwargs):
+        from .blacklist import get_token_expiry
+        from .tokens import get_token_hash
+
+        self.token_hash = get_token_hash(self.token)
+
+        if self.expires_at is None:
+            self.expires_at = get_token_expiry(self.token)
+
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Token Blacklist"
         verbose_name_plural = "Token Blacklist"
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    from .tokens import invalidate_user
+
+    invalidate_user(instance.username)
+
+
+@receiver(post_save, sender=TokenBlacklist)
+def add_to_blacklist_filter(sender, instance, created, **kwargs):
+    from backend.versions import bump_cache_counter
+    from .blacklist import BLACKLIST_VERSION_KEY, blacklist_filter
+    from .tokens import invalidate_token
+
+    if created:
+        blacklist_filter.add(instance.token_hash)
+        bump_cache_counter(BLACKLIST_VERSION_KEY)
+        invalidate_token(instance.token)
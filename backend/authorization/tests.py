@@ -1,3 +1,142 @@
-from django.test import TestCase
+import datetime
+from importlib import import_module
+from io import StringIO
 
-# Create your tests here.
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from backend.middleware import JWTMiddleware
+from .blacklist import blacklist_filter, blacklist_token, is_token_blacklisted
+from .models import TokenBlacklist, User
+from .tokens import get_token_hash
+
+
+class JWTMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="member", email="member@example.com", password="password"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_token(self, username="member"):
+        exp = datetime.datetime.utcnow() + datetime.timedelta(days=7)
+
+        return jwt.encode(
+            {"user": username, "exp": exp}, settings.SECRET_KEY, algorithm="HS256"
+        )
+
+    def process(self, token):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        JWTMiddleware(lambda request: None)(request)
+
+        return request
+
+    def test_user_is_resolved_lazily_and_once(self):
+        token = self.get_token()
+
+        with CaptureQueriesContext(connection) as queries:
+            request = self.process(token)
+
+        self.assertEqual(len(queries), 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(request.username.id, self.user.id)
+            self.assertEqual(request.username.username, "member")
+
+        self.assertEqual(len(queries), 1)
+
+    def test_cached_user_is_invalidated_when_the_user_changes(self):
+        token = self.get_token()
+        self.assertEqual(self.process(token).username.id, self.user.id)
+
+        self.user.username = "renamed"
+        self.user.save()
+
+        with self.assertRaises(User.DoesNotExist):
+            self.process(token).username.id
+
+    def test_invalid_token_leaves_no_user(self):
+        self.assertIsNone(self.process("invalid").username)
+
+
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        blacklist_filter.reset()
+
+    def get_token(self, days=7, username="member"):
+        exp = datetime.datetime.utcnow() + datetime.timedelta(days=days)
+
+        return jwt.encode(
+            {"user": username, "exp": exp}, settings.SECRET_KEY, algorithm="HS256"
+        )
+
+    def test_unknown_tokens_are_answered_without_queries(self):
+        blacklist_token(self.get_token(username="other"))
+        self.assertFalse(is_token_blacklisted(self.get_token()))
+
+        with CaptureQueriesContext(connection) as queries:
+            for days in range(1, 20):
+                self.assertFalse(is_token_blacklisted(self.get_token(days)))
+
+        self.assertEqual(len(queries), 0)
+
+    def test_blacklisted_tokens_are_found(self):
+        token = self.get_token()
+        blacklist_token(token)
+        blacklist_token(token)
+
+        entry = TokenBlacklist.objects.get()
+        self.assertEqual(entry.token_hash, get_token_hash(token))
+        self.assertIsNotNone(entry.expires_at)
+        self.assertTrue(is_token_blacklisted(token))
+
+        blacklist_filter.reset()
+        self.assertTrue(is_token_blacklisted(token))
+
+    def test_purge_removes_expired_tokens(self):
+        expired = self.get_token(days=-1)
+        active = self.get_token()
+        blacklist_token(expired)
+        blacklist_token(active)
+
+        call_command("purge_token_blacklist", stdout=StringIO())
+
+        self.assertEqual(
+            list(TokenBlacklist.objects.values_list("token", flat=True)), [active]
+        )
+        self.assertTrue(is_token_blacklisted(active))
+
+    @override_settings(CACHE_SINGLE_PROCESS=False)
+    def test_entries_of_other_processes_are_seen_without_a_shared_cache(self):
+        token = self.get_token()
+        self.assertFalse(is_token_blacklisted(token))
+
+        # Written by another process: neither this filter nor a shared
+        # version hears about it.
+        TokenBlacklist.objects.bulk_create(
+            [TokenBlacklist(token=token, token_hash=get_token_hash(token))]
+        )
+
+        self.assertTrue(is_token_blacklisted(token))
+
+    def test_migration_fills_hashes_and_expiries(self):
+        token = self.get_token()
+        TokenBlacklist.objects.bulk_create([TokenBlacklist(token=token)])
+
+        name = "0002_tokenblacklist_token_hash_expires_at"
+        migration = import_module(f"authorization.migrations.{name}")
+        state = MigrationLoader(connection).project_state(("authorization", name))
+        migration.fill_token_hashes(state.apps, None)
+
+        entry = TokenBlacklist.objects.get()
+        self.assertEqual(entry.token_hash, get_token_hash(token))
+        self.assertIsNotNone(entry.expires_at)
@@ -0,0 +1,105 @@
+import hashlib
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from backend.versions import bump_cache_counter
+from .models import User
+
+
+TOKEN_USER_CACHE_TIMEOUT = getattr(settings, "JWT_USER_CACHE_TIMEOUT", 300)
+
+
+def get_token_hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_user_generation(username):
+    return cache.get(f"jwt-user-generation:{username}", 0)
+
+
+def get_token_cache_key(token, username):
+    return f"jwt-user:{username}:{get_user_generation(username)}:{get_token_hash(token)}"
+
+
+def decode_token(token):
+    return jwt.decode(jwt=token, key=settings.SECRET_KEY, algorithms=["HS256"])
+
+
+def get_token_from_header(request):
+    auth_header = request.headers.get("Authorization")
+
+    if not auth_header:
+        return None
+
+    parts = auth_header.split(" ")
+
+    return parts[1] if len(parts) > 1 else None
+
+
+def resolve_token_user(token, username):
+    """
+    Return the user a verified token belongs to.
+
+    The user id is cached per token for ``JWT_USER_CACHE_TIMEOUT`` seconds,
+    so the lookup is a primary key fetch once the token has been seen.
+
+    Raises:
+        User.DoesNotExist: If the user no longer exists or was renamed.
+    """
+    cache_key = get_token_cache_key(token, username)
+    user_id = cache.get(cache_key)
+
+    if user_id is not None:
+        user = User.objects.get(pk=user_id)
+
+        if user.username != username:
+            cache.delete(cache_key)
+            raise User.DoesNotExist
+
+        return user
+
+    user = User.objects.get(username=username)
+    cache.set(cache_key, user.pk, TOKEN_USER_CACHE_TIMEOUT)
+
+    return user
+
+
+def get_lazy_token_user(token):
+    """
+    Verify a token and return a lazy object for its user.
+
+    Only the signature and expiry are checked here; the database is queried
+    the first time the returned user is actually used, and at most once.
+
+    Raises:
+        jwt.exceptions.InvalidTokenError: If the token is invalid or expired.
+    """
+    username = decode_token(token)["user"]
+
+    return SimpleLazyObject(lambda: resolve_token_user(token, username))
+
+
+def invalidate_token(token):
+    """
+    Drop the cached user of a token, e.g. on logout.
+    """
+    try:
+        username = jwt.decode(
+            jwt=token,
+            key=settings.SECRET_KEY,
+            algorithms=["HS256"],
+            options={"verify_exp": False},
+        )["user"]
+    except (jwt.exceptions.InvalidTokenError, KeyError):
+        return
+
+    cache.delete(get_token_cache_key(token, username))
+
+
+def invalidate_user(username):
+    """
+    Drop every cached token of a user, e.g. when the user changes.
+    """
+    bump_cache_counter(f"jwt-user-generation:{username}")
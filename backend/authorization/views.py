@@ -10,6 +10,8 @@ from rest_framework.response import Response
 from django.db import IntegrityError
 from .models import User, TokenBlacklist
 from .serializers import *
+from .blacklist import blacklist_token, is_token_blacklisted
+from .tokens import resolve_token_user
 import json
 import jwt
 from rest_framework.decorators import permission_classes
@@ -48,7 +50,7 @@ def verify_jwt(request):
             jwt=token, key=settings.SECRET_KEY, algorithms=["HS256"]
         )
         username = decoded_token["user"]
-        user = User.objects.get(username=username)
+        user = resolve_token_user(token, username)
         expiration_time = datetime.datetime.fromtimestamp(decoded_token["exp"])
 
         if expiration_time - datetime.timedelta(days=1) <= datetime.datetime.now():
@@ -60,15 +62,7 @@ def verify_jwt(request):
                 algorithm="HS256",
             )
 
-            try:
-                print("BLACKLISTED BLACKLISTED")
-                old_token = TokenBlacklist.objects.get(token=token)
-            except TokenBlacklist.DoesNotExist:
-                old_token = TokenBlacklist(token=token)
-                print("BLACKLISTED2 BLACKLISTED2")
-                token = "None"
-
-            old_token.save()
+            blacklist_token(token)
 
             return JsonResponse(
                 {
@@ -81,8 +75,7 @@ def verify_jwt(request):
                 status=200,
             )
 
-        if TokenBlacklist.objects.filter(token=token).exists():
-            print("BLACKLISTED3 BLACKLISTED3")
+        if is_token_blacklisted(token):
             return JsonResponse({"authenticated": False}, status=401)
 
     except (jwt.exceptions.DecodeError, User.DoesNotExist, ObjectDoesNotExist):
@@ -214,10 +207,9 @@ def logout_view(request):
             jwt=token, key=settings.SECRET_KEY, algorithms=["HS256"]
         )
         username = decoded_token["user"]
-        user = User.objects.get(username=username)
+        user = resolve_token_user(token, username)
         logout(request)
-        TokenBlacklist.objects.create(token=token)
-        print("BLACKLISTED4 BLACKLISTED4")
+        blacklist_token(token)
 
         return JsonResponse({"message": "User logged out successfully"})
 
@@ -0,0 +1,186 @@
+import hashlib
+from collections import defaultdict
+
+from auditlog.models import LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .versions import bump_cache_counter
+
+
+FEED_VERSION_KEY = "activity-feed-version"
+FEED_CACHE_TIMEOUT = 60 * 5
+
+MODEL_APP_LABELS = {
+    "messages": "support",
+    "questionnaire": "quizes",
+    "questionset": "quizes",
+    "question": "quizes",
+    "answerchoice": "quizes",
+    "teammember": "contact",
+    "servicetablelabels": "tables",
+    "servicecomparerows": "tables",
+    "servicetable": "tables",
+    "header": "general",
+    "contactinformation": "contact",
+    "page": "pages",
+    "faq": "faqs",
+    "servicetier": "services",
+}
+
+READ_URL_MODELS = ["messages", "application"]
+
+
+def get_feed_version():
+    return cache.get(FEED_VERSION_KEY, 0)
+
+
+def bump_feed_version():
+    bump_cache_counter(FEED_VERSION_KEY)
+
+
+# Bulk writes save it one object at a time, so the receivers below run.
+LogEntry.save_hooks = True
+
+
+@receiver(post_save, sender=LogEntry)
+@receiver(post_delete, sender=LogEntry)
+def invalidate_activity_feed(sender, **kwargs):
+    bump_feed_version()
+
+
+def get_feed_cache_key(request):
+    query = hashlib.md5(request.get_full_path().encode()).hexdigest()
+
+    return f"activity-feed:{get_feed_version()}:{query}"
+
+
+def get_content_type(model_name):
+    """
+    Return the ContentType of a model name sent by the admin dashboard.
+
+    Raises:
+        ContentType.DoesNotExist: If no such model is installed.
+    """
+    model_name = model_name.lower()
+    app_label = MODEL_APP_LABELS.get(model_name)
+
+    if app_label:
+        return ContentType.objects.get_by_natural_key(app_label, model_name)
+
+    return ContentType.objects.get(model=model_name)
+
+
+def get_feed_queryset(app=None, model_name=None):
+    queryset = LogEntry.objects.select_related("content_type", "actor")
+
+    if app:
+        queryset = queryset.filter(content_type__app_label=app)
+    elif model_name:
+        queryset = queryset.filter(content_type=get_content_type(model_name))
+
+    return queryset.order_by("-timestamp", "-pk")
+
+
+def get_existing_objects(entries):
+    """
+    Find which logged objects still exist, with one query per content type.
+
+    Returns:
+        A dict mapping ``(content_type_id, str(pk))`` to the object's pk.
+    """
+    candidates = defaultdict(set)
+
+    for entry in entries:
+        if entry.action == LogEntry.Action.DELETE:
+            continue
+
+        for value in (entry.object_pk, entry.object_id):
+            if value not in (None, ""):
+                candidates[entry.content_type].add(value)
+
+    existing = {}
+
+    for content_type, values in candidates.items():
+        model = content_type.model_class()
+
+        if model is None:
+            continue
+
+        pks = set()
+
+        for value in values:
+            try:
+                pks.add(model._meta.pk.to_python(value))
+            except Exception:
+                continue
+
+        for pk in model._base_manager.only("pk").in_bulk(pks):
+            existing[(content_type.id, str(pk))] = pk
+
+    return existing
+
+
+def build_activity_feed(entries):
+    """
+    Serialize log entries for the admin dashboard's recent actions widget.
+    """
+    entries = list(entries)
+    existing = get_existing_objects(entries)
+    data = []
+
+    for action in entries:
+        content_type = action.content_type
+        object_repr = action.object_repr
+        app_label = content_type.app_label
+        model_name = content_type.model
+        model_class = content_type.model_class()
+        change_message_str = ""
+        obj_url = "Not Applicable"
+
+        if model_class is not None:
+            model_verbose_name = model_class._meta.verbose_name.title()
+        else:
+            model_verbose_name = "Not Found"
+
+        if action.action in (LogEntry.Action.CREATE, LogEntry.Action.UPDATE):
+            if action.action == LogEntry.Action.CREATE:
+                object_repr = f"Added {object_repr}"
+                change_message_str = object_repr
+                obj_url = "Object not found"
+            else:
+                object_repr = f"Changed {object_repr}"
+                change_message_str = action.changes
+                obj_url = "Failed"
+
+            for value in (action.object_pk, action.object_id):
+                pk = existing.get((content_type.id, str(value)))
+
+                if pk is not None:
+                    if model_name in READ_URL_MODELS:
+                        obj_url = f"/admin/{model_name}/read/{pk}/"
+                    else:
+                        obj_url = f"/admin/{model_name}/control/{pk}/"
+                    break
+
+        elif action.action == LogEntry.Action.DELETE:
+            object_repr = f"Deleted {object_repr}"
+            change_message_str = object_repr
+
+        data.append(
+            {
+                "user": str(action.actor),
+                "action_time": action.timestamp,
+                "action_flag": action.get_action_display().capitalize(),
+                "content_type": str(content_type),
+                "app_label": app_label.capitalize(),
+                "model_name": model_verbose_name,
+                "object_id": str(action.object_pk),
+                "object_repr": object_repr,
+                "change_message": change_message_str,
+                "obj_url": obj_url,
+            }
+        )
+
+    return data
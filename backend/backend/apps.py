@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class BackendConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "backend"
+    verbose_name = "Backend"
+
+    def ready(self):
+        super().ready()
+        from . import activity, choices, counts, versions
+        from .registry import model_registry
+        from .search import connect_search_signals
+
+        model_registry.build()
+        connect_search_signals()
@@ -0,0 +1,190 @@
+import atexit
+import logging
+import queue
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from auditlog.models import LogEntry
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from .activity import bump_feed_version
+
+
+logger = logging.getLogger(__name__)
+
+_request_buffer = ContextVar("audit_log_buffer", default=None)
+
+
+def build_log_entry(action, actor, instance, changes, timestamp=None):
+    return LogEntry(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+        object_repr=str(instance),
+        action=action,
+        actor=actor,
+        changes=changes or "",
+        timestamp=timestamp or timezone.now(),
+    )
+
+
+class AuditLogWriter:
+    """
+    Background thread that writes queued log entries with ``bulk_create``.
+
+    Used when ``AUDIT_LOG_ASYNC`` is enabled so the INSERT does not add to
+    the response time. Entries still pending at interpreter exit are
+    flushed by an ``atexit`` hook.
+    """
+
+    batch_size = 500
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="audit-log-writer", daemon=True
+                )
+                self.thread.start()
+
+    def put(self, entries):
+        self.start()
+        self.queue.put(list(entries))
+
+    def run(self):
+        while True:
+            batches = [self.queue.get()]
+
+            while True:
+                try:
+                    batches.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self.write(batches)
+
+    def write(self, batches):
+        entries = [entry for batch in batches for entry in batch]
+
+        try:
+            close_old_connections()
+            LogEntry.objects.bulk_create(entries, batch_size=self.batch_size)
+            bump_feed_version()
+        except Exception:
+            logger.exception("Could not write %s audit log entries", len(entries))
+        finally:
+            for _ in batches:
+                self.queue.task_done()
+
+    def flush(self):
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+
+audit_log_writer = AuditLogWriter()
+atexit.register(audit_log_writer.flush)
+
+
+def write_log_entries(entries):
+    """
+    Write log entries now, or hand them to the background writer when
+    ``AUDIT_LOG_ASYNC`` is enabled.
+    """
+    entries = list(entries)
+
+    if not entries:
+        return
+
+    if getattr(settings, "AUDIT_LOG_ASYNC", False):
+        audit_log_writer.put(entries)
+    else:
+        LogEntry.objects.bulk_create(entries, batch_size=AuditLogWriter.batch_size)
+        bump_feed_version()
+
+
+def queue_log_entries(entries):
+    """
+    Record log entries once the current transaction commits.
+
+    Inside ``buffered_audit_log`` (every request, see AuditLogMiddleware)
+    the entries are collected and written with one INSERT at the end of the
+    block; outside of it they are written on commit. Entries of a rolled
+    back transaction are dropped.
+    """
+    entries = list(entries)
+
+    if not entries:
+        return
+
+    def enqueue():
+        buffer = _request_buffer.get()
+
+        if buffer is None:
+            write_log_entries(entries)
+        else:
+            buffer.extend(entries)
+
+    transaction.on_commit(enqueue)
+
+
+@contextmanager
+def buffered_audit_log():
+    """
+    Collect the log entries queued inside the block and write them with one
+    INSERT when it ends. Nested blocks hand their entries to the outer one.
+    """
+    outer = _request_buffer.get()
+    token = _request_buffer.set([])
+
+    try:
+        yield
+    finally:
+        entries = _request_buffer.get()
+        _request_buffer.reset(token)
+
+        if outer is not None:
+            outer.extend(entries)
+        else:
+            write_log_entries(entries)
+
+
+def flush_audit_log():
+    """
+    Write the entries collected so far by the innermost
+    ``buffered_audit_log`` now, so long imports do not hold every entry
+    until the request ends.
+    """
+    buffer = _request_buffer.get()
+
+    if buffer:
+        entries = buffer[:]
+        del buffer[:]
+        write_log_entries(entries)
+
+
+@asynccontextmanager
+async def abuffered_audit_log():
+    """
+    Async ``buffered_audit_log``; the entries are written from a thread.
+    """
+    outer = _request_buffer.get()
+    token = _request_buffer.set([])
+
+    try:
+        yield
+    finally:
+        entries = _request_buffer.get()
+        _request_buffer.reset(token)
+
+        if outer is not None:
+            outer.extend(entries)
+        else:
+            await sync_to_async(write_log_entries)(entries)
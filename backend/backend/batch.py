@@ -0,0 +1,256 @@
+import contextvars
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import close_old_connections
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_REQUESTS = getattr(settings, "BATCH_MAX_REQUESTS", 20)
+BATCH_WORKERS = getattr(settings, "BATCH_WORKERS", 4)
+
+BATCH_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+SAFE_METHODS = ("GET",)
+
+# Attributes the middleware sets on a request. Sub-requests skip the
+# middleware and share these with the batch request instead.
+SHARED_ATTRIBUTES = ("user", "username", "session", "auth")
+
+batch_executor = ThreadPoolExecutor(
+    max_workers=BATCH_WORKERS, thread_name_prefix="batch-request"
+)
+
+
+class BatchError(ValueError):
+    pass
+
+
+def parse_batch(data):
+    """
+    Validate the sub-requests of a batch.
+
+    Each sub-request is a dict with a ``path`` and optional ``method``
+    (default ``GET``), ``params`` (query parameters), ``body`` (JSON data)
+    and ``id`` (echoed back in its result, defaults to its position).
+
+    Raises:
+        BatchError: If the batch or one of its sub-requests is malformed.
+    """
+    if not isinstance(data, list) or not data:
+        raise BatchError("'requests' must be a non-empty list.")
+
+    if len(data) > BATCH_MAX_REQUESTS:
+        raise BatchError(f"A batch can hold at most {BATCH_MAX_REQUESTS} requests.")
+
+    sub_requests = []
+
+    for index, item in enumerate(data):
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            raise BatchError(f"Request {index} needs a 'path'.")
+
+        method = str(item.get("method", "GET")).upper()
+
+        if method not in BATCH_METHODS:
+            raise BatchError(f"Request {index} has an unsupported method '{method}'.")
+
+        params = item.get("params") or {}
+
+        if not isinstance(params, dict):
+            raise BatchError(f"Request {index} has invalid 'params'.")
+
+        sub_requests.append(
+            {
+                "id": item.get("id", index),
+                "method": method,
+                "path": item["path"],
+                "params": params,
+                "body": item.get("body"),
+            }
+        )
+
+    return sub_requests
+
+
+def share_authentication(request):
+    """
+    Resolve the lazy users of the batch request once, so sub-requests,
+    including those run on other threads, reuse them without a query each.
+    """
+    for attribute in ("username", "user"):
+        user = getattr(request, attribute, None)
+
+        if user is None:
+            continue
+
+        try:
+            user.pk
+        except Exception:
+            setattr(request, attribute, None)
+
+
+def build_sub_request(request, sub_request):
+    path, _, query_string = sub_request["path"].partition("?")
+    query = QueryDict(query_string, mutable=True)
+
+    for key, value in sub_request["params"].items():
+        query.setlist(key, value if isinstance(value, list) else [value])
+
+    sub = HttpRequest()
+    sub.method = sub_request["method"]
+    sub.path = sub.path_info = path
+    sub.META = {
+        **request.META,
+        "REQUEST_METHOD": sub.method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query.urlencode(),
+    }
+    sub.GET = QueryDict(sub.META["QUERY_STRING"])
+
+    if sub_request["body"] is not None:
+        body = json.dumps(sub_request["body"]).encode()
+        sub.META["CONTENT_TYPE"] = "application/json"
+        sub.META["CONTENT_LENGTH"] = str(len(body))
+        sub._stream = io.BytesIO(body)
+    else:
+        sub.META["CONTENT_LENGTH"] = "0"
+        sub._stream = io.BytesIO()
+
+    sub._read_started = False
+
+    for attribute in SHARED_ATTRIBUTES:
+        if hasattr(request, attribute):
+            setattr(sub, attribute, getattr(request, attribute))
+
+    return sub
+
+
+def get_response_body(response):
+    data = getattr(response, "data", None)
+
+    if data is not None and response.status_code != 304:
+        return data
+
+    if getattr(response, "streaming", False):
+        return None
+
+    content = response.content
+
+    if not content:
+        return None
+
+    if response.get("Content-Type", "").startswith("application/json"):
+        return json.loads(content)
+
+    return content.decode(response.charset or "utf-8", errors="replace")
+
+
+def run_sub_request(request, sub_request, batch_view):
+    """
+    Resolve one sub-request and call its view in-process.
+
+    Returns:
+        A dict with the sub-request's ``id``, ``status``, ``headers`` and
+        ``body``.
+    """
+    result = {"id": sub_request["id"]}
+    sub = build_sub_request(request, sub_request)
+
+    try:
+        match = resolve(sub.path_info)
+    except Resolver404:
+        result.update(status=404, headers={}, body={"detail": "Not found."})
+        return result
+
+    if getattr(match.func, "view_class", None) is batch_view:
+        result.update(
+            status=400, headers={}, body={"detail": "Batches cannot be nested."}
+        )
+        return result
+
+    sub.resolver_match = match
+
+    try:
+        if iscoroutinefunction(match.func):
+            response = async_to_sync(match.func)(sub, *match.args, **match.kwargs)
+        else:
+            response = match.func(sub, *match.args, **match.kwargs)
+
+        if hasattr(response, "render") and not response.is_rendered:
+            response.render()
+    except Http404:
+        result.update(status=404, headers={}, body={"detail": "Not found."})
+        return result
+    except PermissionDenied:
+        result.update(
+            status=403,
+            headers={},
+            body={"detail": "You do not have permission to perform this action."},
+        )
+        return result
+    except Exception:
+        logger.exception("Batch request %s %s failed", sub.method, sub.path)
+        result.update(
+            status=500, headers={}, body={"detail": "Internal server error."}
+        )
+        return result
+
+    result.update(
+        status=response.status_code,
+        headers={
+            name: response[name]
+            for name in ("ETag", "Last-Modified", "Location")
+            if response.has_header(name)
+        },
+        body=get_response_body(response),
+    )
+
+    return result
+
+
+def run_in_thread(context, request, sub_request, batch_view):
+    close_old_connections()
+
+    try:
+        return context.run(run_sub_request, request, sub_request, batch_view)
+    finally:
+        close_old_connections()
+
+
+def run_batch(request, sub_requests, batch_view, parallel=False):
+    """
+    Run the sub-requests of a batch and return their results in order.
+
+    With ``parallel``, batches of GET requests run concurrently on a pool
+    of ``BATCH_WORKERS`` threads; batches that change data always run one
+    sub-request after another, in the order given.
+    """
+    share_authentication(request)
+
+    if not parallel or len(sub_requests) < 2 or any(
+        sub_request["method"] not in SAFE_METHODS for sub_request in sub_requests
+    ):
+        return [
+            run_sub_request(request, sub_request, batch_view)
+            for sub_request in sub_requests
+        ]
+
+    futures = [
+        batch_executor.submit(
+            run_in_thread,
+            contextvars.copy_context(),
+            request,
+            sub_request,
+            batch_view,
+        )
+        for sub_request in sub_requests
+    ]
+
+    return [future.result() for future in futures]
@@ -0,0 +1,232 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models, transaction
+from rest_framework.exceptions import ValidationError
+from .choices import invalidate_filter_choices
+from .counts import adjust_row_count
+from .search import get_search_keys, index_objects
+from .utils import return_snapshot_changes, take_snapshot
+from .versions import bump_model_version
+
+
+BULK_CHUNK_SIZE = getattr(settings, "BULK_CHUNK_SIZE", 500)
+BULK_MAX_ITEMS = getattr(settings, "BULK_MAX_ITEMS", 5000)
+
+
+class BulkItem:
+    """
+    One validated item of a bulk write: the object to save, the concrete
+    field values written to it and the many-to-many values to set after.
+    """
+
+    def __init__(self, index, obj, values, many_to_many, snapshot=None):
+        self.index = index
+        self.obj = obj
+        self.values = values
+        self.many_to_many = many_to_many
+        self.snapshot = snapshot
+
+
+def split_validated_data(model, validated_data):
+    """
+    Split validated data into concrete field values and many-to-many values.
+
+    Raises:
+        ValidationError: For nested or reverse relations, which cannot be
+            written in bulk.
+    """
+    values = {}
+    many_to_many = {}
+
+    for name, value in validated_data.items():
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            field = None
+
+        if field is not None and field.many_to_many and field.concrete:
+            many_to_many[name] = value
+        elif field is not None and field.concrete:
+            values[name] = value
+        else:
+            raise ValidationError({name: ["This field cannot be written in bulk."]})
+
+    return values, many_to_many
+
+
+def validate_bulk_items(serializer_class, model, items, instances=None, context=None):
+    """
+    Validate bulk items with a model serializer.
+
+    The items run through the serializer's ``ListSerializer`` one child at
+    a time, so invalid items are reported without rejecting the others.
+    Items with an ``id`` update the matching object in ``instances`` and
+    are validated as partial updates; the others create new objects.
+
+    Returns:
+        A ``(valid, errors)`` tuple: the ``BulkItem``s to write and a list
+        of ``{"index", "id", "errors"}`` dicts.
+    """
+    instances = instances or {}
+    serializers = {
+        partial: serializer_class(many=True, partial=partial, context=context or {})
+        for partial in (False, True)
+    }
+    valid = []
+    errors = []
+
+    for index, item in enumerate(items):
+        pk = item.get("id") if isinstance(item, dict) else None
+
+        try:
+            if not isinstance(item, dict):
+                raise ValidationError({"non_field_errors": ["Expected an object."]})
+
+            obj = None
+
+            if pk is not None:
+                obj = instances.get(model._meta.pk.to_python(pk))
+
+                if obj is None:
+                    raise ValidationError({"id": ["Not found."]})
+
+            serializer = serializers[obj is not None]
+            serializer.child.instance = obj
+            serializer.child.initial_data = item
+            validated_data = serializer.run_child_validation(item)
+            values, many_to_many = split_validated_data(model, validated_data)
+        except ValidationError as exc:
+            errors.append({"index": index, "id": pk, "errors": exc.detail})
+            continue
+        except DjangoValidationError as exc:
+            errors.append({"index": index, "id": pk, "errors": {"id": exc.messages}})
+            continue
+
+        if obj is None:
+            valid.append(BulkItem(index, model(**values), values, many_to_many))
+        else:
+            snapshot = take_snapshot(obj)
+
+            for name, value in values.items():
+                setattr(obj, name, value)
+
+            valid.append(BulkItem(index, obj, values, many_to_many, snapshot))
+
+    return valid, errors
+
+
+def get_update_fields(model, items):
+    names = set()
+
+    for item in items:
+        names.update(model._meta.get_field(name).name for name in item.values)
+
+    for field in model._meta.concrete_fields:
+        if getattr(field, "auto_now", False):
+            names.add(field.name)
+
+            for item in items:
+                field.pre_save(item.obj, add=False)
+
+    return sorted(names)
+
+
+def expire_model_caches(model):
+    """
+    Expire what depends on the rows of ``model`` after a write that sends
+    no model signals, e.g. ``bulk_create``: its cached filter choices and
+    its version, which the ETags and the page cache are built from.
+    """
+    invalidate_filter_choices(model)
+    bump_model_version(model)
+
+
+def has_save_hooks(model):
+    """
+    Whether saving ``model`` runs code that ``bulk_create`` and
+    ``bulk_update`` would skip: an overridden ``save()``, or ``pre_save`` /
+    ``post_save`` receivers of its own, which the model declares with
+    ``save_hooks = True``. The receivers every model has (row counts,
+    filter choices, versions) and the search index are handled by
+    ``write_bulk_items``.
+    """
+    return model.save is not models.Model.save or getattr(model, "save_hooks", False)
+
+
+def save_bulk_items(model, created, updated):
+    """
+    Write items one ``save()`` at a time, sending the model's signals.
+    """
+    for item in created:
+        item.obj.save(force_insert=True)
+
+    fields = get_update_fields(model, updated) if updated else []
+
+    if fields:
+        for item in updated:
+            item.obj.save(update_fields=fields)
+
+
+def write_bulk_items(model, items, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Insert and update validated items with ``bulk_create`` and
+    ``bulk_update`` in chunks of ``chunk_size``, in one transaction.
+
+    The bulk queries send no model signals, so the row count, filter
+    choices, model version and search index are updated here. Models with
+    their own save hooks (see ``has_save_hooks``) are saved one object at a
+    time instead, so those hooks run. Many-to-many values are set per
+    object, which does send ``m2m_changed``.
+
+    Returns:
+        A ``(created, updated)`` tuple of the written items.
+    """
+    created = [item for item in items if item.snapshot is None]
+    updated = [item for item in items if item.snapshot is not None]
+    bulk = not has_save_hooks(model)
+
+    with transaction.atomic():
+        if not bulk:
+            save_bulk_items(model, created, updated)
+
+        if bulk and created:
+            model._base_manager.bulk_create(
+                [item.obj for item in created], batch_size=chunk_size
+            )
+            adjust_row_count(model, len(created))
+
+        if bulk and updated:
+            fields = get_update_fields(model, updated)
+
+            if fields:
+                model._base_manager.bulk_update(
+                    [item.obj for item in updated], fields, batch_size=chunk_size
+                )
+
+        for item in items:
+            for name, value in item.many_to_many.items():
+                getattr(item.obj, name).set(value)
+
+        if bulk and items:
+            expire_model_caches(model)
+
+            if get_search_keys(model):
+                index_objects(model, [item.obj for item in items])
+
+    return created, updated
+
+
+def get_bulk_changes(items):
+    """
+    Return ``{pk: change message}`` for updated items that changed.
+    """
+    changes = {}
+
+    for item in items:
+        message = return_snapshot_changes(item.obj, item.snapshot)
+
+        if message:
+            changes[item.obj.pk] = message
+
+    return changes
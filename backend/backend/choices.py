@@ -0,0 +1,192 @@
+import hashlib
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .versions import bump_cache_counter
+
+
+FILTER_CHOICES_LIMIT = getattr(settings, "FILTER_CHOICES_LIMIT", 100)
+FILTER_CHOICES_CACHE_TIMEOUT = getattr(settings, "FILTER_CHOICES_CACHE_TIMEOUT", 60 * 5)
+
+DISPLAY_FIELDS = ["name", "title", "username", "slug", "email"]
+
+
+def get_filter_options(model):
+    return list(getattr(model._meta, "filter_options", None) or [])
+
+
+def get_display_field(model):
+    """
+    Return the field prefix searches match for choices of a related model.
+
+    ``str()`` of an object cannot be queried, so the first of the usual
+    display fields is used instead, or None to match on the primary key.
+    """
+    field_names = {field.name for field in model._meta.concrete_fields}
+    username_field = getattr(model, "USERNAME_FIELD", None)
+
+    for name in [username_field, *DISPLAY_FIELDS]:
+        if name in field_names:
+            return name
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_dependents():
+    """
+    Map each model label to the labels whose filter choices it appears in.
+
+    A model always depends on itself; a related model is added for every
+    relation used as a filter option, since renaming it changes the
+    ``display_name`` of the choices.
+    """
+    dependents = {}
+
+    for model in apps.get_models():
+        options = get_filter_options(model)
+
+        if not options:
+            continue
+
+        dependents.setdefault(model._meta.label, set()).add(model._meta.label)
+
+        for option in options:
+            try:
+                field = model._meta.get_field(option)
+            except Exception:
+                continue
+
+            if field.is_relation and field.related_model is not None:
+                label = field.related_model._meta.label
+                dependents.setdefault(label, set()).add(model._meta.label)
+
+    return dependents
+
+
+def get_version_key(label):
+    return f"filter-choices-version:{label}"
+
+
+def invalidate_filter_choices(model):
+    """
+    Drop the cached filter choices that depend on rows of ``model``.
+    """
+    for label in get_dependents().get(model._meta.label, ()):
+        bump_cache_counter(get_version_key(label))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_filter_choices_on_change(sender, **kwargs):
+    invalidate_filter_choices(sender)
+
+
+@receiver(m2m_changed)
+def invalidate_filter_choices_on_m2m_change(sender, instance, action, model, **kwargs):
+    if action.startswith("post_"):
+        invalidate_filter_choices(type(instance))
+        invalidate_filter_choices(model)
+
+
+def get_cache_key(model, option, query, limit):
+    label = model._meta.label
+    version = cache.get(get_version_key(label), 0)
+    query = hashlib.md5((query or "").encode()).hexdigest()
+
+    return f"filter-choices:{label}:{version}:{option}:{query}:{limit}"
+
+
+def query_field_choices(model, option, query=None, limit=FILTER_CHOICES_LIMIT):
+    field = model._meta.get_field(option)
+    queryset = model._base_manager.order_by()
+
+    if field.is_relation:
+        queryset = queryset.filter(**{f"{option}__isnull": False})
+
+    if query:
+        lookup = option
+
+        if field.is_relation:
+            display_field = get_display_field(field.related_model)
+
+            if display_field:
+                lookup = f"{option}__{display_field}"
+
+        queryset = queryset.filter(**{f"{lookup}__istartswith": query})
+
+    rows = list(
+        queryset.values(option)
+        .annotate(count=Count("pk"))
+        .order_by("-count", option)[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if field.is_relation:
+        related = field.related_model._base_manager.in_bulk(
+            [row[option] for row in rows]
+        )
+        choices = [
+            {
+                "value": row[option],
+                "display_name": str(related.get(row[option], row[option])),
+                "count": row["count"],
+            }
+            for row in rows
+        ]
+    else:
+        choices = [
+            {
+                "value": row[option],
+                "display_name": str(row[option]),
+                "count": row["count"],
+            }
+            for row in rows
+        ]
+
+    return {"choices": choices, "has_more": has_more}
+
+
+def get_field_choices(model, option, query=None, limit=FILTER_CHOICES_LIMIT):
+    """
+    Return the most used values of one filter option with their row counts.
+
+    Values come from one GROUP BY over the model's table, most frequent
+    first. ``query`` keeps only values starting with it (case-insensitive),
+    matched on the display field for relations. Results are cached per
+    model until a row of the model, or of the related model, changes.
+
+    Returns:
+        dict: ``choices`` (``value``, ``display_name``, ``count`` dicts) and
+        ``has_more``, true when more than ``limit`` values match.
+
+    Raises:
+        FieldDoesNotExist: If ``option`` is not a field of the model.
+    """
+    cache_key = get_cache_key(model, option, query, limit)
+    result = cache.get(cache_key)
+
+    if result is None:
+        result = query_field_choices(model, option, query, limit)
+        cache.set(cache_key, result, FILTER_CHOICES_CACHE_TIMEOUT)
+
+    return result
+
+
+def get_filter_choices(model, filter_options=None, limit=FILTER_CHOICES_LIMIT):
+    """
+    Return the choices of each filter option, keyed by option name.
+    """
+    if filter_options is None:
+        filter_options = get_filter_options(model)
+
+    return {
+        option: get_field_choices(model, option, limit=limit)["choices"]
+        for option in filter_options
+    }
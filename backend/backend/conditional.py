@@ -0,0 +1,91 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from .versions import (
+    get_last_modified,
+    get_model_versions,
+    get_serializer_models,
+    uses_shared_cache,
+)
+
+
+_view_dependencies = {}
+
+
+def get_view_dependencies(view):
+    """
+    Return the labels of the models a view's responses are built from: its
+    ``model_class`` and the models its serializer reads.
+    """
+    view_class = type(view)
+    dependencies = _view_dependencies.get(view_class)
+
+    if dependencies is None:
+        models = {view.model_class}
+
+        if view.serializer_class is not None:
+            models |= get_serializer_models(view.serializer_class())
+
+        dependencies = _view_dependencies[view_class] = sorted(
+            model._meta.label for model in models
+        )
+
+    return dependencies
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GETs of list and detail views with 304 Not Modified.
+
+    The ETag is built from the change versions of the models the view
+    depends on, the full URL and the Authorization header, and the
+    Last-Modified date from the latest of those changes. Both are known
+    before any query runs, so a matching ``If-None-Match`` or
+    ``If-Modified-Since`` skips the queryset and the serializer entirely.
+    Without a shared cache (see ``uses_shared_cache``) the versions cannot
+    be trusted, so no validators are sent.
+    """
+
+    def get_validators(self, request):
+        versions = get_model_versions(get_view_dependencies(self))
+        signature = "|".join(
+            [
+                request.build_absolute_uri(),
+                hashlib.md5(
+                    request.META.get("HTTP_AUTHORIZATION", "").encode()
+                ).hexdigest(),
+                ",".join(f"{label}={version}" for label, version in versions.items()),
+            ]
+        )
+
+        return (
+            quote_etag(hashlib.md5(signature.encode()).hexdigest()),
+            get_last_modified(versions),
+        )
+
+    def conditional_get(self, handler, request, *args, **kwargs):
+        if self.model_class is None or not uses_shared_cache():
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+
+        if not_modified is not None:
+            response = not_modified
+        else:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(super().retrieve, request, *args, **kwargs)
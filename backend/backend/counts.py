@@ -0,0 +1,124 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+_pending_counts = ContextVar("row_count_deltas", default=None)
+
+
+def get_count_key(model):
+    return f"row-count:{model._meta.label}"
+
+
+def get_row_count(model, refresh=False):
+    """
+    Return the number of rows of a model without scanning its table.
+
+    The count is kept in the cache and moved by the save/delete signals and
+    by ``adjust_row_count`` for bulk writes. It is counted exactly on a cold
+    start, after ``forget_row_count`` and when ``refresh`` is set.
+    """
+    key = get_count_key(model)
+
+    if not refresh:
+        count = cache.get(key)
+
+        if count is not None:
+            return count
+
+    count = model._base_manager.count()
+    cache.set(key, count, None)
+
+    return count
+
+
+def get_row_counts(models, refresh=False):
+    """
+    Return ``{model: count}`` for several models with one cache read.
+    """
+    keys = {model: get_count_key(model) for model in models}
+    cached = {} if refresh else cache.get_many(list(keys.values()))
+    counts = {}
+
+    for model, key in keys.items():
+        if key in cached:
+            counts[model] = cached[key]
+        else:
+            counts[model] = get_row_count(model, refresh=True)
+
+    return counts
+
+
+def forget_row_count(model):
+    """
+    Drop the stored count of a model, e.g. after a bulk write of unknown
+    size, so the next read counts it exactly.
+    """
+    cache.delete(get_count_key(model))
+
+
+def apply_row_count_deltas(deltas):
+    for model, delta in deltas.items():
+        if not delta:
+            continue
+
+        try:
+            if delta > 0:
+                cache.incr(get_count_key(model), delta)
+            else:
+                cache.decr(get_count_key(model), -delta)
+        except ValueError:
+            # Not counted yet; the first read counts the table.
+            pass
+
+
+def adjust_row_count(model, delta):
+    """
+    Move the stored count of a model once the current transaction commits.
+
+    Inside ``batched_row_counts`` the deltas are added up and applied once
+    per model when the block ends.
+    """
+    pending = _pending_counts.get()
+
+    if pending is not None:
+        pending[model] += delta
+    else:
+        transaction.on_commit(lambda: apply_row_count_deltas({model: delta}))
+
+
+@contextmanager
+def batched_row_counts():
+    """
+    Collect the row count changes of a bulk operation, such as a queryset
+    delete that sends one post_delete per row, and apply them together.
+    """
+    outer = _pending_counts.get()
+    deltas = Counter()
+    token = _pending_counts.set(deltas)
+
+    try:
+        yield
+    finally:
+        _pending_counts.reset(token)
+
+        if outer is not None:
+            outer.update(deltas)
+        elif deltas:
+            transaction.on_commit(lambda: apply_row_count_deltas(deltas))
+
+
+@receiver(post_save)
+def count_created_row(sender, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_row_count(sender, 1)
+
+
+@receiver(post_delete)
+def count_deleted_row(sender, **kwargs):
+    adjust_row_count(sender, -1)
@@ -4,15 +4,34 @@ from rest_framework.exceptions import NotFound
 from rest_framework.serializers import Serializer
 from auditlog.models import LogEntry
 from authorization.models import User
-from backend.utils import create_log_entry, return_changes
+from backend.choices import invalidate_filter_choices
+from backend.conditional import ConditionalGetMixin
+from backend.bulk import BULK_CHUNK_SIZE, BULK_MAX_ITEMS, validate_bulk_items
+from backend.counts import batched_row_counts
+from backend.fieldsets import SparseFieldsetMixin
+from backend.importers import write_import_batch
+from backend.references import get_field_plan, resolve_references
+from backend.utils import (
+    create_log_entries,
+    create_log_entry,
+    return_change_message_str,
+    return_snapshot_changes,
+    take_snapshot,
+)
+from backend.versions import bump_model_version
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.shortcuts import get_object_or_404
-from django.db.models import ForeignKey, ManyToManyField, Model, ImageField
-import re
+from django.db.models import Model, ImageField
 
-from typing import Dict, Any, List, Type
+from typing import Dict, Any, List, Optional, Type
 
 
-class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
+class SyView(
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    generics.ListCreateAPIView,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     """
     A custom view that combines list, create, retrieve, update, and destroy operations.
     """
@@ -22,6 +41,7 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
     fk_fields: List[str] = []
     mtm_fields: Dict[str, str] = {}
     mtm_values: Dict[str, List[Any]] = {}
+    paginate: Optional[bool] = None
 
     def get_queryset(self):
         return self.model_class.objects.all()
@@ -54,7 +74,7 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
         else:
             return self.list(request, *args, **kwargs)
 
-    def create(self, request) -> Response:
+    def create(self, request, *args, **kwargs) -> Response:
         """
         Handle POST requests for object creation.
 
@@ -83,7 +103,7 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
             serializer.data, status=status.HTTP_201_CREATED, headers=headers
         )
 
-    def update(self, request) -> Response:
+    def update(self, request, *args, **kwargs) -> Response:
         """
         Handle PUT requests for object update.
 
@@ -97,22 +117,22 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
         """
 
         instance = self.get_object()
-        old_instance = self.model_class.objects.get(pk=instance.pk)
+        snapshot = take_snapshot(instance)
         model_fields = self.serializer_class.Meta.model._meta.get_fields()
 
         data = self.check_data_for_images(instance, request)
-        self.pre_process_fields(request, data, model_fields, True)
+        self.pre_process_fields(request, data, model_fields, True, instance)
         serializer = self.get_serializer(instance, data=data, partial=True)
 
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
 
         self.update_instance_mtm_fields(instance)
-        self.log_entry(request, instance, old_instance, "update")
+        self.log_entry(request, instance, snapshot, "update")
 
         return Response(serializer.data)
 
-    def destroy(self, request) -> Response:
+    def destroy(self, request, *args, **kwargs) -> Response:
         """
         Handle DELETE requests for object deletion.
 
@@ -140,6 +160,7 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
         data: Dict[str, Any],
         model_fields: List[Any],
         update: bool = False,
+        instance: Optional[Model] = None,
     ) -> None:
         """
         Pre-process the fields in the request data.
@@ -149,13 +170,11 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
             data (Dict[str, Any]): The request data.
             model_fields: The model fields.
             update (bool): Indicates whether it's an update operation.
+            instance (Model): The instance being updated.
         """
 
-        if self.fk_fields:
-            self.process_foreign_key_fields(data, update)
-
-        if self.mtm_fields:
-            self.process_many_to_many_fields(data, model_fields)
+        if self.fk_fields or self.mtm_fields:
+            self.process_reference_fields(data, update, instance)
 
         if any(field.name == "author" for field in model_fields):
             self.process_author_field(request, data)
@@ -176,7 +195,7 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
         self,
         request,
         instance,
-        old_instance,
+        snapshot,
         type="create",
     ) -> None:
         """
@@ -185,11 +204,13 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
         Args:
             request (HttpRequest): The request object.
             instance: The instance object.
-            old_instance: The old instance object.
+            snapshot: The ``take_snapshot`` of the instance before an update.
             type (str): The type of action ("create", "update", "delete").
         """
 
-        changes = return_changes(instance, old_instance) if type == "update" else None
+        changes = (
+            return_snapshot_changes(instance, snapshot) if type == "update" else None
+        )
 
         action = (
             LogEntry.Action.UPDATE
@@ -206,106 +227,42 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
             changes,
         )
 
-    def process_foreign_key_fields(
+    def process_reference_fields(
         self,
         data: Dict[str, Any],
         update: bool = False,
+        instance: Optional[Model] = None,
     ) -> None:
         """
-        Process foreign key fields in the request data.
-
-        Args:
-            data (Dict): The request data.
-
-        Raises:
-            NotFound: If the related object is not found.
-        """
-
-        for field in self.fk_fields:
-            if field in data:
-                related_class = self.serializer_class.Meta.model._meta.get_field(
-                    field
-                ).remote_field.model
-
-                try:
-                    related_obj = related_class.objects.get(id=data[field])
-                except related_class.DoesNotExist:
-                    raise NotFound(
-                        detail=f"{related_class.__name__} with id {data[field]} does not exist"
-                    )
-
-                data[f"{field}"] = related_obj.id
+        Resolve the foreign keys and many-to-many elements in the request data.
 
-                if update:
-                    instance = self.get_object()
-                    setattr(instance, field, related_obj)
-
-    def process_many_to_many_fields(
-        self,
-        data: Dict[str, Any],
-        model_fields: List[Any],
-    ) -> None:
-        """
-        Process many-to-many fields in the request data.
+        Only ``fk_fields`` are resolved, or every foreign key if the view
+        has ``mtm_fields``; the many-to-many elements are kept in
+        ``mtm_values`` for ``update_instance_mtm_fields``.
 
         Args:
             data (Dict): The request data.
-            model_fields (List[Field]): The model fields.
+            update (bool): Indicates whether it's an update operation.
+            instance (Model): The instance being updated.
 
         Raises:
-            NotFound: If the related object is not found.
+            ValidationError: If a referenced object does not exist.
         """
 
-        model_fields = self.serializer_class.Meta.model._meta.get_fields()
-
-        self.mtm_fields = {
-            field.name: ""
-            for field in model_fields
-            if isinstance(field, ManyToManyField)
-        }
-
-        for field in model_fields:
-            if isinstance(field, ForeignKey) and field.name == "tag":
-                related_class = field.remote_field.model
-                if "tag" in data and not data["tag"].isnumeric():
-                    tag = data.pop("tag", None)
-                    tag_obj, created = related_class.objects.get_or_create(name=tag[0])
-                    data["tag"] = tag_obj.id
-
-            elif isinstance(field, ForeignKey):
-                related_class = field.remote_field.model
-
-                if field.name in data:
-                    obj = data.pop(field.name, None)
-                    foo_obj, created = related_class.objects.get_or_create(id=obj[0])
-                    data[field.name] = foo_obj.id
-
-            elif isinstance(field, ManyToManyField):
-                self.mtm_fields[field.name] = field.remote_field.model
-
-        self.mtm_values = {
-            field.name: []
-            for field in model_fields
-            if isinstance(field, ManyToManyField)
-        }
-
-        pop_keys = []
-
-        for key, value in data.items():
-            parts = re.findall(r"\[(.*?)\]", key)
-            name = key.split("[")[0]
-
-            if name in self.mtm_fields:
-                if len(parts) == 2 and parts[0].isdigit() and parts[1] == "id":
-                    element_obj, created = self.mtm_fields[name].objects.get_or_create(
-                        id=value
-                    )
-                    self.mtm_values[name].append(element_obj)
+        fk_objects, mtm_values = resolve_references(
+            self.model_class,
+            data,
+            foreign_keys=None if self.mtm_fields else self.fk_fields,
+            many_to_many=bool(self.mtm_fields),
+            pop_keys=True,
+        )
 
-                pop_keys.append(key)
+        if self.mtm_fields:
+            self.mtm_values = mtm_values
 
-        for key in pop_keys:
-            data.pop(key, None)
+        if update and instance is not None:
+            for field, related_obj in fk_objects.items():
+                setattr(instance, field, related_obj)
 
     def process_author_field(
         self,
@@ -320,8 +277,7 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
             data (Dict): The request data.
         """
 
-        author = User.objects.get(username=request.username)
-        data["author"] = author.id
+        data["author"] = request.username.id
 
     def check_data_for_images(self, instance, request) -> Dict[str, Any]:
         """
@@ -357,76 +313,21 @@ class SyView(generics.ListCreateAPIView, generics.RetrieveUpdateDestroyAPIView):
         return data
 
 
-class BaseListView(generics.ListCreateAPIView):
+class BaseListView(
+    ConditionalGetMixin, SparseFieldsetMixin, generics.ListCreateAPIView
+):
     serializer_class = None
     model_class = None
     foreign_key_fields = []
     mtm_fields = {}
+    paginate = None
 
     def create(self, request, *args, **kwargs):
         data = request.data.copy()
+        _, mtm_values = resolve_references(self.model_class, data)
 
-        for field in self.foreign_key_fields:
-            if field in data:
-                related_class = self.serializer_class.Meta.model._meta.get_field(
-                    field
-                ).remote_field.model
-
-                try:
-                    related_obj = related_class.objects.get(id=data[field])
-
-                except related_class.DoesNotExist:
-                    raise NotFound(
-                        detail=f"{related_class.__name__} with id {data[field]} does not exist"
-                    )
-
-                data[f"{field}"] = related_obj.id
-
-        model_fields = self.serializer_class.Meta.model._meta.get_fields()
-
-        mtm_fields = {
-            field.name: ""
-            for field in model_fields
-            if isinstance(field, ManyToManyField)
-        }
-
-        for field in model_fields:
-            if isinstance(field, ForeignKey) and field.name == "tag":
-                related_class = field.remote_field.model
-                if "tag" in data and not data["tag"].isnumeric():
-                    tag = data.pop("tag", None)
-                    tag_obj, created = related_class.objects.get_or_create(name=tag[0])
-                    data["tag"] = tag_obj.id
-            elif isinstance(field, ForeignKey):
-                related_class = field.remote_field.model
-
-                if field.name in data:
-                    obj = data.pop(field.name, None)
-                    foo_obj, created = related_class.objects.get_or_create(id=obj[0])
-                    data[field.name] = foo_obj.id
-            elif isinstance(field, ManyToManyField):
-                mtm_fields[field.name] = field.remote_field.model
-
-        mtm_values = {
-            field.name: []
-            for field in model_fields
-            if isinstance(field, ManyToManyField)
-        }
-
-        for key, value in data.items():
-            parts = re.findall(r"\[(.*?)\]", key)
-            name = key.split("[")[0]
-
-            if name in mtm_fields:
-                if len(parts) == 2 and parts[0].isdigit() and parts[1] == "id":
-                    element_obj, created = mtm_fields[name].objects.get_or_create(
-                        id=value
-                    )
-                    mtm_values[name].append(element_obj)
-
-        if any(field.name == "author" for field in model_fields):
-            author = User.objects.get(username=request.username)
-            data["author"] = author.id
+        if get_field_plan(self.model_class).has_author:
+            data["author"] = request.username.id
 
         serializer = self.model_class.serializer_class(data=data)
         serializer.is_valid()
@@ -457,14 +358,16 @@ class BaseListView(generics.ListCreateAPIView):
         return self.model_class.objects.all()
 
 
-class BaseDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BaseDetailView(
+    ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView
+):
     serializer_class = None
     model_class = None
     mtm_fields = {}
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
-        old_instance = self.model_class.objects.get(pk=instance.pk)
+        snapshot = take_snapshot(instance)
 
         image_field_name = None
         for field in instance._meta.fields:
@@ -484,47 +387,10 @@ class BaseDetailView(generics.RetrieveUpdateDestroyAPIView):
         else:
             data = request.data.copy()
 
-        model_fields = self.serializer_class.Meta.model._meta.get_fields()
+        fk_objects, mtm_values = resolve_references(self.model_class, data)
 
-        mtm_fields = {
-            field.name: ""
-            for field in model_fields
-            if isinstance(field, ManyToManyField)
-        }
-
-        for field in model_fields:
-            if isinstance(field, ForeignKey) and field.name == "tag":
-                related_class = field.remote_field.model
-                if "tag" in data and not data["tag"].isnumeric():
-                    tag = data.pop("tag", None)
-                    tag_obj, created = related_class.objects.get_or_create(name=tag[0])
-                    data["tag"] = tag_obj.id
-            elif isinstance(field, ForeignKey):
-                related_class = field.remote_field.model
-                if field.name in data:
-                    obj = data.pop(field.name, None)
-                    foo_obj, created = related_class.objects.get_or_create(id=obj[0])
-                    data[field.name] = foo_obj.id
-
-            elif isinstance(field, ManyToManyField):
-                mtm_fields[field.name] = field.remote_field.model
-
-        mtm_values = {
-            field.name: []
-            for field in model_fields
-            if isinstance(field, ManyToManyField)
-        }
-
-        for key, value in data.items():
-            parts = re.findall(r"\[(.*?)\]", key)
-            name = key.split("[")[0]
-
-            if name in mtm_fields:
-                if len(parts) == 2 and parts[0].isdigit() and parts[1] == "id":
-                    element_obj, created = mtm_fields[name].objects.get_or_create(
-                        id=value
-                    )
-                    mtm_values[name].append(element_obj)
+        for field, related_obj in fk_objects.items():
+            setattr(instance, field, related_obj)
 
         serializer = self.get_serializer(instance, data=data, partial=True)
         serializer.is_valid(raise_exception=True)
@@ -535,7 +401,7 @@ class BaseDetailView(generics.RetrieveUpdateDestroyAPIView):
                 instance_field = getattr(instance, field)
                 instance_field.set(mtm_values[field])
 
-        changes = return_changes(instance, old_instance)
+        changes = return_snapshot_changes(instance, snapshot)
 
         create_log_entry(
             LogEntry.Action.UPDATE,
@@ -568,6 +434,7 @@ class BaseDetailView(generics.RetrieveUpdateDestroyAPIView):
 class BaseBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
     serializer_class = None
     model_class = None
+    bulk_chunk_size = BULK_CHUNK_SIZE
 
     def destroy(self, request, *args, **kwargs):
         ids = request.data.get("ids", [])
@@ -576,12 +443,18 @@ class BaseBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
 
         queryset = self.filter_queryset(self.get_queryset())
         queryset = queryset.filter(id__in=ids)
+        objects = list(queryset)
 
-        for obj in queryset:
+        for obj in objects:
             if hasattr(obj, "image") and obj.image is not None:
                 obj.image.delete()
 
-        deleted = queryset.delete()
+        with batched_row_counts():
+            deleted = queryset.delete()
+
+        create_log_entries(
+            LogEntry.Action.DELETE, getattr(request, "username", None), objects
+        )
 
         if self.model_class.__name__ == "Messages":
             unread_queryset = self.filter_queryset(self.get_queryset())
@@ -596,7 +469,28 @@ class BaseBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def post(self, request, *args, **kwargs):
+        """
+        Create and update objects in bulk.
+
+        The body is ``{"items": [...]}``; items with an ``id`` update that
+        object and the others are created.
+        """
+
+        items = request.data.get("items")
+
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"items": "Must be a non-empty list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return self.perform_bulk_write(request, items)
+
     def update(self, request, *args, **kwargs):
+        if "items" in request.data or "values" in request.data:
+            return self.partial_bulk_update(request)
+
         ids = request.data.get("ids", [])
         if not ids:
             return Response(status=status.HTTP_400_BAD_REQUEST)
@@ -609,13 +503,15 @@ class BaseBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
 
         queryset = self.filter_queryset(self.get_queryset())
         queryset = queryset.filter(id__in=ids)
+        objects = list(queryset)
 
         if field[0] == "is_archived":
-            print({field[0]: value, "is_read": True})
-            updated = queryset.update(**{field[0]: value, "is_read": True})
+            values = {field[0]: value, "is_read": True}
+            updated = self.perform_bulk_update(request, queryset, objects, values)
 
         if field[0] == "is_read" and value == True:
-            updated = queryset.update(**{field[0]: value})
+            values = {field[0]: value}
+            updated = self.perform_bulk_update(request, queryset, objects, values)
             unread_queryset = self.filter_queryset(self.get_queryset())
             unread_queryset = unread_queryset.filter(is_read=False)
             count = unread_queryset.count()
@@ -624,7 +520,8 @@ class BaseBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
             return Response({"count": count}, status=status.HTTP_200_OK)
 
         elif field[0] == "is_read" and value == False:
-            updated = queryset.update(**{field[0]: value, "is_archived": False})
+            values = {field[0]: value, "is_archived": False}
+            updated = self.perform_bulk_update(request, queryset, objects, values)
             unread_queryset = self.filter_queryset(self.get_queryset())
             unread_queryset = unread_queryset.filter(is_read=False)
             count = unread_queryset.count()
@@ -636,3 +533,149 @@ class BaseBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
             return Response(status=status.HTTP_404_NOT_FOUND)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def partial_bulk_update(self, request) -> Response:
+        """
+        Update objects in bulk with per-item values.
+
+        The body is either ``{"items": [{"id": 1, ...}, ...]}`` or
+        ``{"ids": [...], "values": {...}}`` to write the same values to
+        several objects.
+        """
+
+        if "values" in request.data:
+            ids = request.data.get("ids")
+            values = request.data.get("values")
+
+            if not isinstance(ids, list) or not ids or not isinstance(values, dict):
+                return Response(
+                    {"ids": "Give a list of ids and a dict of values."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            items = [{**values, "id": pk} for pk in ids]
+        else:
+            items = request.data.get("items")
+
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"items": "Must be a non-empty list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if any(not isinstance(item, dict) or "id" not in item for item in items):
+            return Response(
+                {"items": "Every item needs an id."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return self.perform_bulk_write(request, items)
+
+    def perform_bulk_write(self, request, items: List[Any]) -> Response:
+        """
+        Validate ``items`` with the serializer, then write the valid ones in
+        chunks of ``bulk_chunk_size`` and log them in bulk. Items that break
+        a database constraint, e.g. two items with the same unique value,
+        are reported with the validation errors instead of failing the
+        whole request.
+
+        Returns:
+            Response: The number of created and updated objects and the
+            errors of the items that were not written.
+        """
+
+        if len(items) > BULK_MAX_ITEMS:
+            return Response(
+                {"items": f"At most {BULK_MAX_ITEMS} items can be written at once."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        ids = [
+            item["id"]
+            for item in items
+            if isinstance(item, dict) and item.get("id") is not None
+        ]
+        instances = {}
+
+        if ids:
+            try:
+                instances = self.filter_queryset(self.get_queryset()).in_bulk(ids)
+            except (TypeError, ValueError, DjangoValidationError):
+                return Response(
+                    {"items": "Invalid ids."}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+        valid, errors = validate_bulk_items(
+            self.get_serializer_class(),
+            self.model_class,
+            items,
+            instances,
+            self.get_serializer_context(),
+        )
+        created, updated, write_errors = write_import_batch(
+            self.model_class,
+            valid,
+            getattr(request, "username", None),
+            self.bulk_chunk_size,
+        )
+        errors = sorted(errors + write_errors, key=lambda error: error["index"])
+
+        return Response(
+            {
+                "created": len(created),
+                "updated": len(updated),
+                "errors": errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST
+            if errors and not (created or updated)
+            else status.HTTP_200_OK,
+        )
+
+    def perform_bulk_update(
+        self, request, queryset, objects, values: Dict[str, Any]
+    ) -> int:
+        """
+        Write ``values`` to every row of ``queryset`` with one UPDATE.
+
+        ``QuerySet.update`` sends no signals, so the audit log entries and
+        the cached filter choices and the model's version are updated here.
+
+        Returns:
+            int: The number of updated rows.
+        """
+
+        updated = queryset.update(**values)
+        self.log_bulk_update(request, objects, values)
+        invalidate_filter_choices(self.model_class)
+        bump_model_version(self.model_class)
+
+        return updated
+
+    def log_bulk_update(self, request, objects, values: Dict[str, Any]) -> None:
+        """
+        Log one UPDATE entry per object changed by a bulk update.
+
+        Args:
+            request (Request): The request object.
+            objects (List[Model]): The objects as they were before the update.
+            values (Dict): The field values written by the update.
+        """
+
+        changes = {}
+
+        for obj in objects:
+            obj_changes = {
+                name: [getattr(obj, name), new_value]
+                for name, new_value in values.items()
+                if str(getattr(obj, name)) != str(new_value)
+            }
+
+            if obj_changes:
+                changes[obj.pk] = return_change_message_str(obj_changes)
+
+        create_log_entries(
+            LogEntry.Action.UPDATE,
+            getattr(request, "username", None),
+            [obj for obj in objects if obj.pk in changes],
+            changes,
+        )
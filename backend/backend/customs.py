@@ -20,6 +20,7 @@ def metadata(
     filter_choices=[],
     allowed=False,
     category="None",
+    paginate=False,
 ):
     def decorator(cls):
         cls._meta.autoform_label = autoform_label
@@ -39,6 +40,7 @@ def metadata(
         cls._meta.filter_choices = filter_choices
         cls._meta.allowed = allowed
         cls._meta.category = category
+        cls._meta.paginate = paginate
         return cls
 
     return decorator
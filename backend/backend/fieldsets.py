@@ -0,0 +1,175 @@
+from rest_framework.serializers import (
+    BaseSerializer,
+    ListSerializer,
+    SerializerMethodField,
+)
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def get_requested_fields(query_params):
+    """
+    Return the ``(fields, expand)`` sets of a request, or ``None`` for a
+    parameter that was not given.
+    """
+    fields = query_params.get("fields")
+    expand = query_params.get("expand")
+
+    return (
+        None if fields is None else parse_field_list(fields),
+        None if expand is None else parse_field_list(expand),
+    )
+
+
+def is_expandable(field):
+    """
+    Return whether a field is left out unless asked for by name: nested
+    serializers and method fields, the expensive parts of a representation.
+    """
+    return isinstance(field, (BaseSerializer, SerializerMethodField))
+
+
+def get_kept_fields(serializer, fields, expand):
+    names = []
+
+    for name, field in serializer.fields.items():
+        if name == "id" or (expand is not None and name in expand):
+            names.append(name)
+        elif fields is not None:
+            if name in fields:
+                names.append(name)
+        elif not is_expandable(field):
+            names.append(name)
+
+    return names
+
+
+def apply_sparse_fields(serializer, fields, expand):
+    """
+    Drop the fields of a serializer that were not asked for.
+
+    ``fields`` selects fields by name and ``expand`` adds nested and method
+    fields; the ``id`` is always kept. Without ``fields``, ``expand`` keeps
+    every plain field and only the listed expandable ones. A dropped field
+    is removed from the serializer, so its value is never computed.
+
+    Returns:
+        The names of the fields left on the serializer.
+    """
+    child = serializer.child if isinstance(serializer, ListSerializer) else serializer
+    kept = get_kept_fields(child, fields, expand)
+
+    for name in list(child.fields):
+        if name not in kept:
+            child.fields.pop(name)
+
+    return kept
+
+
+def get_field_sources(serializer, model):
+    """
+    Return the model fields a serializer's fields read.
+
+    Returns:
+        The names of the model fields, or ``None`` if a field may read
+        attributes that cannot be known up front, e.g. a method field or a
+        property.
+    """
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+
+    sources = set()
+
+    for field in serializer.fields.values():
+        if isinstance(field, SerializerMethodField) or field.source == "*":
+            return None
+
+        try:
+            model_field = model._meta.get_field(field.source.split(".")[0])
+        except Exception:
+            return None
+
+        sources.add(model_field.name)
+
+    return sources
+
+
+def narrow_queryset(queryset, serializer):
+    """
+    Load only the columns and relations a (sparse) serializer reads.
+
+    The queryset is narrowed with ``only()`` and loses the prefetches of
+    relations no field reads. Querysets whose serializer has method or
+    property fields are returned as they are.
+    """
+    model = queryset.model
+    sources = get_field_sources(serializer, model)
+
+    if sources is None or queryset.query.select_related is True:
+        return queryset
+
+    only = {model._meta.pk.name}
+
+    for name in sources:
+        model_field = model._meta.get_field(name)
+
+        if model_field.concrete and not model_field.many_to_many:
+            only.add(name)
+
+    if queryset.query.select_related:
+        if sources.isdisjoint(queryset.query.select_related):
+            queryset = queryset.select_related(None)
+        else:
+            only.update(queryset.query.select_related)
+
+    lookups = queryset._prefetch_related_lookups
+    kept_lookups = [
+        lookup
+        for lookup in lookups
+        if getattr(lookup, "prefetch_through", lookup).split("__")[0] in sources
+    ]
+
+    if len(kept_lookups) != len(lookups):
+        queryset = queryset.prefetch_related(None).prefetch_related(*kept_lookups)
+
+    return queryset.only(*sorted(only))
+
+
+class SparseFieldsetMixin:
+    """
+    Let GET requests pick the fields of a representation.
+
+    ``?fields=title,author`` returns only those fields (and the ``id``);
+    ``?expand=author_details`` adds nested or method fields, which are
+    otherwise left out once either parameter is given. Fields that are left
+    out are never computed, and the queryset only loads what the remaining
+    fields read.
+    """
+
+    def get_requested_fields(self):
+        request = getattr(self, "request", None)
+
+        if request is None or request.method != "GET":
+            return None, None
+
+        return get_requested_fields(request.query_params)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields, expand = self.get_requested_fields()
+
+        if fields is not None or expand is not None:
+            apply_sparse_fields(serializer, fields, expand)
+
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields, expand = self.get_requested_fields()
+
+        if fields is None and expand is None:
+            return queryset
+
+        return narrow_queryset(queryset, self.get_serializer())
@@ -0,0 +1,332 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from auditlog.models import LogEntry
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from .audit import flush_audit_log
+from .bulk import get_bulk_changes, validate_bulk_items, write_bulk_items
+from .utils import create_log_entries
+
+
+DEFAULT_BATCH_SIZE = 500
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_MAX_ERRORS = getattr(settings, "IMPORT_MAX_ERRORS", 100)
+
+
+class ImportFormatError(ValueError):
+    """
+    Raised when a streamed import payload cannot be parsed.
+    """
+
+    def __init__(self, message, line=None):
+        self.line = line
+        super().__init__(f"Line {line}: {message}" if line else message)
+
+
+def iter_lines(stream, encoding="utf-8", chunk_size=64 * 1024):
+    """
+    Yield decoded text lines from a binary stream without reading it whole.
+
+    ``stream`` can be a Django ``HttpRequest``, an uploaded file or any
+    object with a ``read(size)`` method.
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    buffer = ""
+
+    while True:
+        chunk = stream.read(chunk_size)
+
+        if not chunk:
+            break
+
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+
+        buffer += chunk
+        lines = buffer.splitlines(keepends=True)
+
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            buffer = lines.pop()
+        else:
+            buffer = ""
+
+        yield from lines
+
+    buffer += decoder.decode(b"", final=True)
+
+    if buffer:
+        yield buffer
+
+
+def iter_csv_rows(stream, encoding="utf-8", **kwargs):
+    """
+    Yield each CSV record of a stream as a list of strings.
+    """
+
+    lines = iter_lines(stream, encoding)
+
+    # csv handles quoted newlines itself as long as it is fed line by line.
+    yield from csv.reader(lines, **kwargs)
+
+
+def iter_ndjson_lines(stream, encoding="utf-8"):
+    """
+    Yield ``(line, value)`` for each non-empty line of an NDJSON stream.
+    """
+
+    for line_number, line in enumerate(iter_lines(stream, encoding), start=1):
+        line = line.strip()
+
+        if not line:
+            continue
+
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ImportFormatError(exc.msg, line_number) from exc
+
+
+def iter_ndjson(stream, encoding="utf-8"):
+    """
+    Yield one decoded JSON value per non-empty line of a stream.
+    """
+
+    for line_number, value in iter_ndjson_lines(stream, encoding):
+        yield value
+
+
+def iter_csv_records(stream, encoding="utf-8"):
+    """
+    Yield ``(line, record)`` for each CSV record after the header, with the
+    record as a dict keyed by the header's field names.
+
+    Empty fields are left out so the serializer's defaults apply to them.
+    """
+
+    records = csv.reader(iter_lines(stream, encoding))
+    header = [name.strip() for name in next(records, None) or []]
+
+    if not any(header):
+        raise ImportFormatError("The CSV header is missing", 1)
+
+    for record in records:
+        if not record:
+            continue
+
+        if len(record) > len(header):
+            raise ImportFormatError(
+                f"Expected at most {len(header)} values, got {len(record)}",
+                records.line_num,
+            )
+
+        yield records.line_num, {
+            name: value for name, value in zip(header, record) if value != ""
+        }
+
+
+def get_import_format(content_type="", file_name=""):
+    """
+    Return ``"csv"`` for CSV content types and ``.csv`` files and
+    ``"ndjson"`` for anything else.
+    """
+
+    if (content_type or "").split(";")[0].strip() == "text/csv":
+        return "csv"
+
+    if (file_name or "").lower().endswith(".csv"):
+        return "csv"
+
+    return "ndjson"
+
+
+def iter_import_records(stream, import_format="ndjson", encoding="utf-8"):
+    if import_format == "csv":
+        return iter_csv_records(stream, encoding)
+
+    return iter_ndjson_lines(stream, encoding)
+
+
+def chunked(iterable, size=DEFAULT_BATCH_SIZE):
+    """
+    Split an iterable into lists of at most ``size`` items.
+    """
+
+    iterator = iter(iterable)
+
+    while True:
+        batch = list(islice(iterator, size))
+
+        if not batch:
+            return
+
+        yield batch
+
+
+def get_import_instances(model, items):
+    """
+    Return the existing objects referenced by the ``id`` of ``items``.
+    Invalid ids are skipped here and reported when the item is validated.
+    """
+
+    pks = set()
+
+    for item in items:
+        pk = item.get("id") if isinstance(item, dict) else None
+
+        if pk is None:
+            continue
+
+        try:
+            pks.add(model._meta.pk.to_python(pk))
+        except DjangoValidationError:
+            continue
+
+    return model._base_manager.in_bulk(pks) if pks else {}
+
+
+def write_import_items(model, items, username=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Write validated items and log them, in one transaction.
+    """
+
+    with transaction.atomic():
+        created, updated = write_bulk_items(model, items, batch_size)
+
+        if created:
+            create_log_entries(
+                LogEntry.Action.CREATE, username, [item.obj for item in created]
+            )
+
+        changes = get_bulk_changes(updated)
+
+        if changes:
+            create_log_entries(
+                LogEntry.Action.UPDATE,
+                username,
+                [item.obj for item in updated if item.obj.pk in changes],
+                changes,
+            )
+
+    return created, updated
+
+
+def write_import_batch(model, items, username=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Write a batch of validated items, falling back to one item at a time
+    when the batch breaks a database constraint, e.g. two rows with the
+    same unique value, so only the offending items fail.
+
+    Returns:
+        A ``(created, updated, errors)`` tuple.
+    """
+
+    try:
+        return (*write_import_items(model, items, username, batch_size), [])
+    except IntegrityError:
+        pass
+
+    created = []
+    updated = []
+    errors = []
+
+    for item in items:
+        try:
+            item_created, item_updated = write_import_items(
+                model, [item], username, batch_size
+            )
+        except IntegrityError as exc:
+            errors.append(
+                {
+                    "index": item.index,
+                    "id": item.obj.pk if item.snapshot is not None else None,
+                    "errors": {"non_field_errors": [str(exc)]},
+                }
+            )
+            continue
+
+        created.extend(item_created)
+        updated.extend(item_updated)
+
+    return created, updated, errors
+
+
+def import_records(
+    model,
+    records,
+    serializer_class=None,
+    username=None,
+    batch_size=DEFAULT_BATCH_SIZE,
+    context=None,
+    progress=None,
+    max_errors=IMPORT_MAX_ERRORS,
+):
+    """
+    Write a stream of records to ``model`` one batch at a time.
+
+    Each batch is validated with the model's serializer, written with
+    ``bulk_create``/``bulk_update`` and logged with one INSERT, all in its
+    own transaction, so only one batch is held in memory and the batches
+    written before a bad line are kept. Records with an ``id`` update that
+    object, the others are created.
+
+    Args:
+        records: ``(line, record)`` pairs, see ``iter_import_records``.
+        username: The actor of the audit log entries.
+        progress: Called after every batch with the result so far and the
+            errors of the batch.
+        max_errors: How many errors to keep in the result; the others are
+            only counted.
+
+    Returns:
+        A dict with the number of ``rows`` read and ``created``, ``updated``
+        and ``failed`` objects, and the ``errors`` as ``{"line", "id",
+        "errors"}`` dicts.
+
+    Raises:
+        ImportFormatError: If a line cannot be parsed.
+    """
+
+    serializer_class = serializer_class or model.serializer_class
+    result = {"rows": 0, "created": 0, "updated": 0, "failed": 0, "errors": []}
+
+    for batch in chunked(records, batch_size):
+        lines = [line for line, record in batch]
+        items = [record for line, record in batch]
+
+        valid, errors = validate_bulk_items(
+            serializer_class,
+            model,
+            items,
+            get_import_instances(model, items),
+            context,
+        )
+        created, updated, write_errors = write_import_batch(
+            model, valid, username, batch_size
+        )
+        flush_audit_log()
+
+        errors = [
+            {
+                "line": lines[error["index"]],
+                "id": error["id"],
+                "errors": error["errors"],
+            }
+            for error in sorted(errors + write_errors, key=lambda e: e["index"])
+        ]
+
+        result["rows"] += len(batch)
+        result["created"] += len(created)
+        result["updated"] += len(updated)
+        result["failed"] += len(errors)
+        kept = max(0, max_errors - len(result["errors"]))
+        result["errors"].extend(errors[:kept])
+
+        if progress is not None:
+            progress(result, errors)
+
+    return result
@@ -0,0 +1,83 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from backend.importers import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    ImportFormatError,
+    get_import_format,
+    import_records,
+    iter_import_records,
+)
+from backend.registry import model_registry
+
+
+class Command(BaseCommand):
+    help = "Import a CSV or NDJSON file into a model in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="The model (model_name or app_label.model).")
+        parser.add_argument("path", help="The file to import, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="The file format; by default csv for .csv files, else ndjson.",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--user", help="The username of the audit log entries' actor."
+        )
+
+    def report(self, result, errors):
+        for error in errors:
+            self.stderr.write(
+                f"Line {error['line']}: {json.dumps(error['errors'])}"
+            )
+
+        self.stdout.write(
+            f"{result['rows']} rows: {result['created']} created, "
+            f"{result['updated']} updated, {result['failed']} failed"
+        )
+
+    def handle(self, *args, **options):
+        app_label, _, model_name = options["model"].lower().rpartition(".")
+        entry = model_registry.get(model_name, app_label or None)
+
+        if entry is None or entry["serializer_class"] is None:
+            raise CommandError(f"Cannot import into '{options['model']}'.")
+
+        user = None
+
+        if options["user"]:
+            user = get_user_model().objects.filter(username=options["user"]).first()
+
+            if user is None:
+                raise CommandError(f"Unknown user '{options['user']}'.")
+
+        path = options["path"]
+        import_format = options["format"] or get_import_format(file_name=path)
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+
+        try:
+            result = import_records(
+                entry["model"],
+                iter_import_records(stream, import_format),
+                entry["serializer_class"],
+                user,
+                max(1, options["batch_size"]),
+                progress=self.report,
+            )
+        except (ImportFormatError, UnicodeDecodeError) as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['created'] + result['updated']} "
+                f"of {result['rows']} rows"
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from backend.search import get_searchable_models, rebuild_search_index, uses_fts
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of the searchable models."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help="Only rebuild these models (app_label.ModelName).",
+        )
+
+    def handle(self, *args, **options):
+        if not uses_fts():
+            raise CommandError("The search index needs an SQLite database.")
+
+        models = get_searchable_models()
+
+        if options["models"]:
+            labels = {label.lower() for label in options["models"]}
+            models = [m for m in models if m._meta.label_lower in labels]
+
+            if len(models) != len(labels):
+                raise CommandError("Unknown or unsearchable model in arguments.")
+
+        for label, count in rebuild_search_index(models).items():
+            self.stdout.write(f"{label}: {count} objects")
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt"))
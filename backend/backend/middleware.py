@@ -6,15 +6,31 @@ from django.conf import settings
 from django.http import HttpResponseForbidden
 import jwt
 from django.contrib.auth.models import AnonymousUser
+from authorization.tokens import get_lazy_token_user, get_token_from_header
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from .audit import abuffered_audit_log, buffered_audit_log
 
 
 class Default404ResponseMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
 
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
     def __call__(self, request):
-        response = self.get_response(request)
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        return self.process_response(request, self.get_response(request))
 
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
         if (
             response.status_code == 404
             and response["Content-Type"] == "text/html; charset=utf-8"
@@ -71,23 +87,73 @@ User = get_user_model()
 
 
 class JWTMiddleware:
+    """
+    Attach the user of the request's JWT to ``request.username``.
+
+    The token is verified up front, but the user is loaded lazily the first
+    time a view uses it; invalid or expired tokens leave it as ``None``.
+    Verifying a token needs no database access, so the middleware runs
+    natively under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
 
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
     def __call__(self, request):
-        auth_header = request.headers.get("Authorization")
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
 
-        if auth_header:
-            token = auth_header.split(" ")[1]
+        self.process_request(request)
 
-            decoded_token = jwt.decode(
-                jwt=token, key=settings.SECRET_KEY, algorithms=["HS256"]
-            )
-            username = decoded_token["user"]
-            user = User.objects.get(username=username)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.process_request(request)
+
+        return await self.get_response(request)
+
+    def process_request(self, request):
+        token = get_token_from_header(request)
 
-            request.username = user
+        if token:
+            try:
+                request.username = get_lazy_token_user(token)
+            except (jwt.exceptions.InvalidTokenError, KeyError):
+                request.username = None
+
+
+class AuditLogMiddleware:
+    """
+    Collect the audit log entries of a request and write them with one
+    INSERT once the response has been produced.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with buffered_audit_log():
+            response = self.get_response(request)
+
+        return response
 
-        response = self.get_response(request)
+    async def __acall__(self, request):
+        async with abuffered_audit_log():
+            response = await self.get_response(request)
 
         return response
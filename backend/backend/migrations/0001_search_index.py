@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute(
+        "CREATE TABLE IF NOT EXISTS search_documents ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "model VARCHAR(100) NOT NULL, "
+        "object_id VARCHAR(64) NOT NULL, "
+        "UNIQUE (model, object_id))"
+    )
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "title, body, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute("DROP TABLE IF EXISTS search_index")
+    schema_editor.execute("DROP TABLE IF EXISTS search_documents")
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,82 @@
+from django.db import migrations
+
+# The searchable models and their SEARCH_KEYS when the index was added.
+# Models made searchable later are indexed with ``rebuild_search_index``.
+SEARCH_KEYS = {
+    "faqs.FAQQuestion": ["name", "question"],
+    "faqs.FAQAnswer": ["name", "answer"],
+    "jobs.JobPosting": [
+        "position",
+        "location",
+        "type",
+        "tagline",
+        "who_we_are",
+        "looking_for",
+        "why_apply",
+    ],
+    "jobs.Application": ["last_name", "first_name", "email", "city"],
+    "posts.Post": ["title", "content"],
+    "support.Messages": ["subject", "name", "email", "message"],
+}
+
+BATCH_SIZE = 500
+
+
+def get_text(instance, key):
+    value = getattr(instance, key, None)
+
+    return "" if value is None else str(value)
+
+
+def populate_search_index(apps, schema_editor):
+    """
+    Index the rows that existed before the search index did; later changes
+    are indexed by the ``post_save`` and ``post_delete`` receivers.
+    """
+    connection = schema_editor.connection
+
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for label, keys in SEARCH_KEYS.items():
+            model = apps.get_model(label)
+            queryset = model._base_manager.order_by("pk")
+
+            for instance in queryset.iterator(chunk_size=BATCH_SIZE):
+                texts = [get_text(instance, key) for key in keys]
+                title = texts[0]
+                body = " ".join(text for text in texts[1:] if text)
+                cursor.execute(
+                    "INSERT OR IGNORE INTO search_documents (model, object_id) "
+                    "VALUES (%s, %s)",
+                    [label, str(instance.pk)],
+                )
+                cursor.execute(
+                    "SELECT id FROM search_documents "
+                    "WHERE model = %s AND object_id = %s",
+                    [label, str(instance.pk)],
+                )
+                document_id = cursor.fetchone()[0]
+                cursor.execute(
+                    "DELETE FROM search_index WHERE rowid = %s", [document_id]
+                )
+                cursor.execute(
+                    "INSERT INTO search_index (rowid, title, body) "
+                    "VALUES (%s, %s, %s)",
+                    [document_id, title, body],
+                )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("backend", "0001_search_index"),
+        ("faqs", "0001_initial"),
+        ("jobs", "0001_initial"),
+        ("posts", "0001_initial"),
+        ("support", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
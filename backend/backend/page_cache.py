@@ -0,0 +1,192 @@
+import asyncio
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.renderers import JSONRenderer
+from .utils import get_serialized_page_data, serialize_page_section
+from .versions import (
+    get_last_modified,
+    get_model_versions,
+    get_serializer_models,
+    uses_shared_cache,
+)
+
+
+PAGE_CACHE_TIMEOUT = getattr(settings, "PAGE_CACHE_TIMEOUT", 60 * 60 * 24)
+PAGE_SECTION_WORKERS = getattr(settings, "PAGE_SECTION_WORKERS", 4)
+
+section_executor = ThreadPoolExecutor(
+    max_workers=PAGE_SECTION_WORKERS, thread_name_prefix="page-section"
+)
+
+_page_dependencies = {}
+
+
+def get_entry_model(dto_name, model_options):
+    return apps.get_model(
+        app_label=model_options.get("app_label"),
+        model_name=model_options.get("model_name", dto_name),
+    )
+
+
+def get_page_dependencies(page_name, model_dict):
+    """
+    Return the labels of the models a page is built from.
+
+    Each ``model_dict`` entry depends on its model and the models its
+    serializer reads; an entry can add others, e.g. models only queried by
+    a SerializerMethodField, with ``"depends_on": ["app_label.ModelName"]``.
+    """
+    dependencies = _page_dependencies.get(page_name)
+
+    if dependencies is None:
+        labels = set()
+
+        for dto_name, model_options in model_dict.items():
+            model = get_entry_model(dto_name, model_options)
+            serializer = model.serializer_class()
+            labels.update(m._meta.label for m in get_serializer_models(serializer))
+            labels.update(model_options.get("depends_on", []))
+
+        dependencies = _page_dependencies[page_name] = sorted(labels)
+
+    return dependencies
+
+
+def get_page_cache_key(page_name, model_dict, request):
+    """
+    Return the cache key of a page and the Last-Modified timestamp of the
+    models it depends on.
+
+    The key is built from the current version of each of those models, so a
+    change to any of them selects a new key. Serialized file and image URLs
+    are absolute, so the host is part of the key.
+    """
+    versions = get_model_versions(get_page_dependencies(page_name, model_dict))
+    signature = ",".join(f"{label}={version}" for label, version in versions.items())
+    signature = f"{request.build_absolute_uri(request.path)}|{signature}"
+    cache_key = f"page:{page_name}:{hashlib.md5(signature.encode()).hexdigest()}"
+
+    return cache_key, get_last_modified(versions)
+
+
+def get_page_validators(cache_key, last_modified, request):
+    """
+    Return the ETag of a page, taken from its cache key, and a 304 response
+    if the request's validators still match it.
+    """
+    etag = quote_etag(cache_key.rsplit(":", 1)[1])
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+
+    if not_modified is not None:
+        not_modified["ETag"] = etag
+        not_modified["Last-Modified"] = http_date(last_modified)
+
+    return etag, not_modified
+
+
+def build_page_response(content, etag=None, last_modified=None):
+    response = HttpResponse(content, content_type="application/json")
+
+    if etag is not None:
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+
+    return response
+
+
+def get_cached_page_response(page_name, model_dict, request):
+    """
+    Return a page built by ``get_serialized_page_data`` as a JSON response.
+
+    The rendered bytes are cached until a model the page depends on
+    changes; cache hits are returned as they are, without serializing or
+    rendering anything. The cache key doubles as the ETag, so conditional
+    requests for an unchanged page get a 304 before the cache is read.
+    Without a shared cache (see ``uses_shared_cache``) the page is built
+    for every request.
+    """
+    if not uses_shared_cache():
+        data = get_serialized_page_data(model_dict, request)
+        return build_page_response(JSONRenderer().render(data))
+
+    cache_key, last_modified = get_page_cache_key(page_name, model_dict, request)
+    etag, not_modified = get_page_validators(cache_key, last_modified, request)
+
+    if not_modified is not None:
+        return not_modified
+
+    content = cache.get(cache_key)
+
+    if content is None:
+        data = get_serialized_page_data(model_dict, request)
+        content = JSONRenderer().render(data)
+        cache.set(cache_key, content, PAGE_CACHE_TIMEOUT)
+
+    return build_page_response(content, etag, last_modified)
+
+
+def run_page_section(dto_name, model_options, request):
+    close_old_connections()
+
+    try:
+        return serialize_page_section(dto_name, model_options, request)
+    finally:
+        close_old_connections()
+
+
+async def aget_serialized_page_data(model_dict, request):
+    """
+    Async ``get_serialized_page_data``: the sections are queried and
+    serialized concurrently on a pool of ``PAGE_SECTION_WORKERS`` threads,
+    each with its own database connection.
+    """
+    loop = asyncio.get_running_loop()
+    sections = await asyncio.gather(
+        *[
+            loop.run_in_executor(
+                section_executor,
+                functools.partial(run_page_section, dto_name, model_options, request),
+            )
+            for dto_name, model_options in model_dict.items()
+        ]
+    )
+
+    return dict(zip(model_dict, sections))
+
+
+async def aget_cached_page_response(page_name, model_dict, request):
+    """
+    Async ``get_cached_page_response`` for the composite page views.
+    """
+    if not uses_shared_cache():
+        data = await aget_serialized_page_data(model_dict, request)
+        return build_page_response(JSONRenderer().render(data))
+
+    cache_key, last_modified = await sync_to_async(get_page_cache_key)(
+        page_name, model_dict, request
+    )
+    etag, not_modified = get_page_validators(cache_key, last_modified, request)
+
+    if not_modified is not None:
+        return not_modified
+
+    content = await cache.aget(cache_key)
+
+    if content is None:
+        data = await aget_serialized_page_data(model_dict, request)
+        content = JSONRenderer().render(data)
+        await cache.aset(cache_key, content, PAGE_CACHE_TIMEOUT)
+
+    return build_page_response(content, etag, last_modified)
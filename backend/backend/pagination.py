@@ -0,0 +1,91 @@
+from urllib import parse
+
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination on ``created_at`` or the primary key.
+
+    Pagination is opt-in per view or model: lists are paginated when the
+    view sets ``paginate = True``, or leaves ``paginate`` unset and the
+    model was declared with ``@metadata(paginate=True)``. Their responses
+    then hold at most ``page_size`` rows, whether or not the request asks
+    for a page, so a large table is never returned in one response. Other
+    lists keep returning every row.
+
+    The response body stays a list of serialized rows, as the admin tables
+    expect; the cursors are sent in a ``Link`` header and in
+    ``X-Next-Cursor`` / ``X-Previous-Cursor``, which
+    ``CORS_EXPOSE_HEADERS`` makes readable to the admin.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_enabled(queryset, request, view):
+            return None
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def requests_page(self, request):
+        params = request.query_params
+
+        return (
+            self.cursor_query_param in params or self.page_size_query_param in params
+        )
+
+    def is_enabled(self, queryset, request, view=None):
+        paginate = getattr(view, "paginate", None)
+
+        if paginate is not None:
+            return paginate
+
+        return getattr(queryset.model._meta, "paginate", False)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "pagination_ordering", None)
+
+        if ordering:
+            return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+        fields = {field.name: field for field in queryset.model._meta.fields}
+        created_at = fields.get("created_at")
+
+        if created_at is not None and not created_at.null:
+            return ("-created_at", "-pk")
+
+        return ("-pk",)
+
+    def get_paginated_response(self, data):
+        next_link = self.get_next_link()
+        previous_link = self.get_previous_link()
+        links = []
+
+        if next_link:
+            links.append(f'<{next_link}>; rel="next"')
+
+        if previous_link:
+            links.append(f'<{previous_link}>; rel="prev"')
+
+        headers = {"X-Page-Size": str(self.page_size)}
+
+        if links:
+            headers["Link"] = ", ".join(links)
+
+        if next_link:
+            headers["X-Next-Cursor"] = self.get_cursor_from_link(next_link)
+
+        if previous_link:
+            headers["X-Previous-Cursor"] = self.get_cursor_from_link(previous_link)
+
+        return Response(data, headers=headers)
+
+    def get_cursor_from_link(self, link):
+        query = parse.parse_qs(parse.urlsplit(link).query)
+
+        return query.get(self.cursor_query_param, [""])[0]
@@ -0,0 +1,206 @@
+import re
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import ForeignKey, ManyToManyField
+from rest_framework.exceptions import ValidationError
+
+
+class FieldPlan:
+    """
+    The relation fields of a model, worked out once per model.
+
+    ``many_to_many_key`` matches the bracketed form keys of many-to-many
+    elements, e.g. ``features[3][id]``.
+    """
+
+    def __init__(self, model):
+        fields = model._meta.get_fields()
+
+        self.foreign_keys = {
+            field.name: field.remote_field.model
+            for field in fields
+            if isinstance(field, ForeignKey)
+        }
+        self.many_to_many = {
+            field.name: field.remote_field.model
+            for field in fields
+            if isinstance(field, ManyToManyField)
+        }
+        self.has_author = any(field.name == "author" for field in fields)
+        self.many_to_many_key = re.compile(
+            r"^(%s)\[(\d+)\]\[id\]$"
+            % "|".join(re.escape(name) for name in self.many_to_many)
+            if self.many_to_many
+            else r"(?!)"
+        )
+
+
+@lru_cache(maxsize=None)
+def get_field_plan(model):
+    return FieldPlan(model)
+
+
+def get_single_value(data, name):
+    if hasattr(data, "getlist"):
+        values = data.getlist(name)
+        return values[0] if values else None
+
+    value = data.get(name)
+
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+
+    return value
+
+
+class ReferenceResolver:
+    """
+    Turn the related ids of a write request into objects in bulk.
+
+    Every id referenced for a related model, by foreign keys and
+    many-to-many elements alike, is looked up with one ``in_bulk`` query,
+    and ids that do not exist are reported as validation errors instead of
+    being created.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.plan = get_field_plan(model)
+        self.ids = {}
+        self.errors = {}
+
+    def to_pk(self, field_name, related_model, value):
+        try:
+            return related_model._meta.pk.to_python(value)
+        except DjangoValidationError:
+            self.errors.setdefault(field_name, []).append(
+                f'Incorrect type. Expected pk value, received "{value}".'
+            )
+
+    def add(self, field_name, related_model, value):
+        pk = self.to_pk(field_name, related_model, value)
+
+        if pk is not None:
+            self.ids.setdefault(related_model, set()).add(pk)
+
+        return pk
+
+    def fetch(self):
+        return {
+            related_model: related_model._base_manager.in_bulk(pks)
+            for related_model, pks in self.ids.items()
+        }
+
+    def get(self, objects, field_name, related_model, pk):
+        obj = objects[related_model].get(pk)
+
+        if obj is None:
+            self.errors.setdefault(field_name, []).append(
+                f'Invalid pk "{pk}" - object does not exist.'
+            )
+
+        return obj
+
+    def resolve(self, data, foreign_keys=None, many_to_many=True, pop_keys=False):
+        """
+        Resolve the references in ``data`` in place.
+
+        Foreign key values are checked and normalized to the related pk;
+        a non-numeric ``tag`` is looked up or created by name. Many-to-many
+        elements are collected from the ``name[i][id]`` keys.
+
+        Args:
+            data: The (copied) request data.
+            foreign_keys: The foreign keys to resolve, all by default.
+            many_to_many: Whether to collect the many-to-many elements.
+            pop_keys: Remove the many-to-many keys from ``data``.
+
+        Returns:
+            A ``(foreign_keys, many_to_many)`` tuple mapping field names to
+            the related object and to the list of related objects.
+
+        Raises:
+            ValidationError: If a referenced id does not exist.
+        """
+        plan = self.plan
+        names = plan.foreign_keys if foreign_keys is None else foreign_keys
+        fk_pks = {}
+        m2m_pks = {name: [] for name in plan.many_to_many} if many_to_many else {}
+
+        for name in names:
+            related_model = plan.foreign_keys.get(name)
+
+            if related_model is None or name not in data:
+                continue
+
+            value = get_single_value(data, name)
+
+            if value in (None, ""):
+                continue
+
+            if name == "tag" and not str(value).isnumeric():
+                tag, created = related_model.objects.get_or_create(name=value)
+                data[name] = tag.pk
+                continue
+
+            fk_pks[name] = self.add(name, related_model, value)
+
+        if many_to_many and plan.many_to_many:
+            matched_keys = []
+
+            for key, value in data.items():
+                if key.split("[", 1)[0] not in plan.many_to_many:
+                    continue
+
+                matched_keys.append(key)
+                match = plan.many_to_many_key.match(key)
+
+                if match is not None:
+                    name = match.group(1)
+                    m2m_pks[name].append(
+                        self.add(name, plan.many_to_many[name], value)
+                    )
+
+            if pop_keys:
+                for key in matched_keys:
+                    data.pop(key, None)
+
+        objects = self.fetch()
+        fk_objects = {}
+        m2m_objects = {}
+
+        for name, pk in fk_pks.items():
+            if pk is None:
+                continue
+
+            obj = self.get(objects, name, plan.foreign_keys[name], pk)
+
+            if obj is not None:
+                fk_objects[name] = obj
+                data[name] = obj.pk
+
+        for name, pks in m2m_pks.items():
+            related_model = plan.many_to_many[name]
+            m2m_objects[name] = [
+                obj
+                for obj in (
+                    self.get(objects, name, related_model, pk)
+                    for pk in pks
+                    if pk is not None
+                )
+                if obj is not None
+            ]
+
+        if self.errors:
+            raise ValidationError(self.errors)
+
+        return fk_objects, m2m_objects
+
+
+def resolve_references(model, data, **kwargs):
+    """
+    Resolve the related ids in the request data of a ``model`` write; see
+    ``ReferenceResolver.resolve``.
+    """
+    return ReferenceResolver(model).resolve(data, **kwargs)
@@ -0,0 +1,375 @@
+import os
+import sys
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.urls import reverse, NoReverseMatch
+from django.utils.module_loading import autodiscover_modules
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+EXCLUDED_METADATA_FIELDS = [
+    "data_source",
+    "content_type_info",
+    "used_on",
+    "page_set_data",
+    "jobs_data",
+    "contact_set_data",
+    "author_details",
+    "category_details",
+    "seo_data_details",
+    "element_data",
+    "tag_details",
+    "list_items",
+    "question_sets",
+    "question_data",
+    "answer_data",
+    "completed_date",
+]
+
+CUSTOM_FIELD_ATTRIBUTES = {
+    "xs_column_count": 12,
+    "md_column_count": 12,
+    "justify": "left",
+    "markdown": "false",
+    "min_rows": 6,
+}
+
+
+def get_meta_option(model, option, default=None):
+    return getattr(model._meta, option) if hasattr(model._meta, option) else default
+
+
+def get_verbose_name(model, field_name):
+    try:
+        return model._meta.get_field(field_name).verbose_name
+    except Exception:
+        return None
+
+
+def get_list_url(model_name):
+    try:
+        url = reverse(f"{model_name}-list")
+        return url.replace("/api/", "/")
+    except NoReverseMatch:
+        return None
+
+
+def has_database_choices(field_name, field):
+    """
+    Whether the choices of a serializer field are read from the database:
+    related fields and the ``content`` content type choices. They change
+    with the data, so they are resolved per request, not in the registry.
+    """
+    return field_name == "content" or isinstance(
+        field, (RelatedField, ManyRelatedField)
+    )
+
+
+def build_field_choices(field_name, field):
+    all_fields_choices = []
+    choices = getattr(field, "choices", None)
+
+    if not choices:
+        return all_fields_choices
+
+    choices_dict = dict(choices)
+
+    if field_name == "content":
+        for value, display in choices_dict.items():
+            field_choices = {"value": value, "display": display}
+
+            try:
+                content_model = ContentType.objects.get_for_id(value).model_class()
+            except ContentType.DoesNotExist:
+                content_model = None
+
+            if content_model is not None:
+                field_choices["model_name"] = content_model.__name__
+                field_choices["category"] = get_meta_option(content_model, "category")
+
+            all_fields_choices.append(field_choices)
+    else:
+        all_fields_choices.append(
+            [{"value": value, "display": display} for value, display in choices_dict.items()]
+        )
+
+    return all_fields_choices
+
+
+def build_model_metadata(model, serializer):
+    """
+    Build the static part of the /api/get_metadata/ payload for a model.
+
+    The live ``filter_choices`` key and the choices of fields with database
+    choices (see ``has_database_choices``) are left out and filled in per
+    request by ``resolve_field_choices``.
+    """
+
+    metadata = {
+        "modelName": model.__name__,
+        "verboseName": model._meta.verbose_name,
+        "verboseNamePlural": model._meta.verbose_name_plural,
+        "appLabel": model._meta.app_label,
+        "primaryKey": model._meta.pk.name,
+        "ordering": model._meta.ordering,
+        "uniqueTogether": model._meta.unique_together,
+        "indexes": model._meta.indexes,
+        "permissions": model._meta.permissions,
+        "abstract": model._meta.abstract,
+        "fields": {},
+        "autoFormLabel": get_meta_option(model, "autoform_label"),
+        "longDescription": get_meta_option(model, "long_description"),
+        "shortDescription": get_meta_option(model, "short_description"),
+        "pagesAssociated": get_meta_option(model, "pages_associated"),
+        "preview": get_meta_option(model, "include_preview", False),
+        "icon": get_meta_option(model, "icon"),
+        "icon_class": get_meta_option(model, "icon_class"),
+        "slug": get_meta_option(model, "slug"),
+        "tags": get_meta_option(model, "tags", False),
+        "relatedComponents": get_meta_option(model, "related_components"),
+        "visibility": get_meta_option(model, "visibility"),
+        "access_level": get_meta_option(model, "access_level"),
+        "info_dump": get_meta_option(model, "info_dump"),
+        "filter_options": get_meta_option(model, "filter_options"),
+        "filter_choices": None,
+        "allowed": get_meta_option(model, "allowed"),
+        "category": get_meta_option(model, "category"),
+    }
+
+    for field_name, field in serializer.get_fields().items():
+        if field_name in EXCLUDED_METADATA_FIELDS:
+            continue
+
+        if isinstance(field, models.ForeignKey):
+            field_type = "ForeignKey"
+        else:
+            field_type = field.__class__.__name__
+
+        if field_type == "CharField" and "base_template" in field.style:
+            field_type = "TextField"
+
+        metadata["fields"][field_name] = {
+            "type": field_type,
+            "required": field.required,
+            "read_only": field.read_only,
+            "label": field.label,
+            "help_text": field.help_text,
+            "min_length": getattr(field, "min_length", None),
+            "max_length": getattr(field, "max_length", None),
+            "min_value": getattr(field, "min_value", None),
+            "max_value": getattr(field, "max_value", None),
+            "source": getattr(field, "source", None),
+            "choices": None
+            if has_database_choices(field_name, field)
+            else build_field_choices(field_name, field),
+            "verbose_name": get_verbose_name(model, field_name),
+        }
+
+    for field in model._meta.fields:
+        if field.name in ("password", "salt") or field.name not in metadata["fields"]:
+            continue
+
+        for attribute, default in CUSTOM_FIELD_ATTRIBUTES.items():
+            if hasattr(field, attribute):
+                metadata["fields"][field.name][attribute] = getattr(
+                    field, attribute, default
+                )
+
+    return metadata
+
+
+def get_database_choice_fields(serializer):
+    return {
+        field_name: field
+        for field_name, field in serializer.get_fields().items()
+        if field_name not in EXCLUDED_METADATA_FIELDS
+        and has_database_choices(field_name, field)
+    }
+
+
+def resolve_field_choices(entry):
+    """
+    Return the ``fields`` of a registry entry's metadata with the choices
+    read from the database filled in.
+    """
+    fields = {**entry["metadata"]["fields"]}
+
+    for field_name, field in entry["choice_fields"].items():
+        fields[field_name] = {
+            **fields[field_name],
+            "choices": build_field_choices(field_name, field),
+        }
+
+    return fields
+
+
+def build_model_endpoint(model, serializer):
+    """
+    Build the endpoint description served by /api/get_models/ and /api/get_app/.
+    """
+
+    model_name = model.__name__.lower()
+    metadata = {}
+    unresolved = []
+
+    for field_name, field in serializer.get_fields().items():
+        if field_name == "id":
+            continue
+
+        metadata[field_name] = {"type": field.__class__.__name__}
+
+        try:
+            if model._meta.get_field(field_name).verbose_name:
+                metadata[field_name]["verbose_name"] = model._meta.get_field(
+                    field_name
+                ).verbose_name
+        except Exception:
+            metadata[field_name]["verbose_name"] = None
+            unresolved.append(field_name)
+
+    if "alignment" in metadata:
+        metadata["alignment"]["choices"] = dict(model.ALIGNMENT_CHOICES)
+
+    endpoint = {
+        "model_name": model_name,
+        "verbose_name": model._meta.verbose_name,
+        "verbose_name_plural": model._meta.verbose_name_plural,
+        "url": get_list_url(model_name),
+        "metadata": metadata,
+        "keys": serializer.FIELD_KEYS,
+        "autoFormLabel": get_meta_option(model, "autoform_label"),
+        "longDescription": get_meta_option(model, "long_description"),
+        "shortDescription": get_meta_option(model, "short_description"),
+        "pagesAssociated": get_meta_option(model, "pages_associated"),
+        "preview": get_meta_option(model, "include_preview", False),
+        "icon": get_meta_option(model, "icon"),
+        "icon_class": get_meta_option(model, "icon_class"),
+        "slug": get_meta_option(model, "slug"),
+        "tags": get_meta_option(model, "tags", False),
+        "relatedComponents": get_meta_option(model, "related_components"),
+        "visibility": get_meta_option(model, "visibility"),
+        "access_level": get_meta_option(model, "access_level"),
+        "info_dump": get_meta_option(model, "info_dump"),
+    }
+
+    if hasattr(serializer, "SEARCH_KEYS"):
+        endpoint["search_keys"] = serializer.SEARCH_KEYS
+
+    return endpoint, unresolved
+
+
+class ModelRegistry:
+    """
+    Precomputed model and serializer metadata for the admin endpoints.
+
+    Entries are built once when the app registry is ready and are keyed by
+    ``(app_label, model_name)``, with a secondary index on the lowercase
+    model name. With ``DEBUG`` on, the registry rebuilds itself whenever a
+    model or serializer module changes on disk or a model is re-bound to a
+    different serializer class.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._by_name = {}
+        self._signature = None
+        self._lock = threading.RLock()
+
+    def build(self):
+        autodiscover_modules("serializers")
+
+        entries = {}
+        by_name = {}
+
+        for model in apps.get_models(include_auto_created=True):
+            model_name = model.__name__.lower()
+            serializer_class = getattr(model, "serializer_class", None)
+            entry = {
+                "model": model,
+                "model_name": model_name,
+                "app_label": model._meta.app_label,
+                "serializer_class": serializer_class,
+                "metadata": None,
+                "choice_fields": {},
+                "endpoint": None,
+                "unresolved": [],
+            }
+
+            if serializer_class is not None:
+                serializer = serializer_class()
+                entry["metadata"] = build_model_metadata(model, serializer)
+                entry["choice_fields"] = get_database_choice_fields(serializer)
+                entry["endpoint"], entry["unresolved"] = build_model_endpoint(
+                    model, serializer
+                )
+
+            entries[(entry["app_label"], model_name)] = entry
+            by_name.setdefault(model_name, entry)
+
+        with self._lock:
+            self._entries = entries
+            self._by_name = by_name
+            self._signature = self.get_signature()
+
+    def get_signature(self):
+        signature = []
+
+        for model in apps.get_models(include_auto_created=True):
+            serializer_class = getattr(model, "serializer_class", None)
+            modules = [model.__module__]
+
+            if serializer_class is not None:
+                modules.append(serializer_class.__module__)
+
+            for module_name in modules:
+                path = getattr(sys.modules.get(module_name), "__file__", None)
+                mtime = os.stat(path).st_mtime if path and os.path.exists(path) else 0
+                signature.append((module_name, mtime))
+
+            signature.append((model._meta.label, id(serializer_class)))
+
+        return tuple(signature)
+
+    def ensure_current(self):
+        with self._lock:
+            if self._signature is None:
+                self.build()
+            elif settings.DEBUG and self.get_signature() != self._signature:
+                self.build()
+
+    def get(self, model_name, app_label=None):
+        self.ensure_current()
+        model_name = model_name.lower()
+
+        if app_label is not None:
+            return self._entries.get((app_label, model_name))
+
+        return self._by_name.get(model_name)
+
+    def get_for_model(self, model):
+        return self.get(model.__name__, model._meta.app_label)
+
+    def for_app(self, app_label):
+        self.ensure_current()
+
+        return [
+            entry
+            for key, entry in self._entries.items()
+            if key[0] == app_label and not entry["model"]._meta.auto_created
+        ]
+
+    def all(self, include_auto_created=False):
+        self.ensure_current()
+
+        return [
+            entry
+            for entry in self._entries.values()
+            if include_auto_created or not entry["model"]._meta.auto_created
+        ]
+
+
+model_registry = ModelRegistry()
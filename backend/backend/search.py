@@ -0,0 +1,239 @@
+import re
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+
+SEARCH_TABLE = "search_index"
+SEARCH_DOCUMENTS_TABLE = "search_documents"
+
+# bm25 weights of the ``title`` and ``body`` columns.
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def uses_fts():
+    return connection.vendor == "sqlite"
+
+
+def get_search_keys(model):
+    serializer_class = getattr(model, "serializer_class", None)
+
+    return list(getattr(serializer_class, "SEARCH_KEYS", None) or [])
+
+
+def get_searchable_models():
+    """
+    Return the models whose serializer declares ``SEARCH_KEYS``.
+    """
+    return [model for model in apps.get_models() if get_search_keys(model)]
+
+
+def get_document(instance):
+    """
+    Return the ``(title, body)`` text indexed for an object: the first
+    search key is the title, the others make up the body.
+    """
+    values = []
+
+    for key in get_search_keys(type(instance)):
+        value = getattr(instance, key, None)
+        values.append("" if value is None else str(value))
+
+    return values[0], " ".join(value for value in values[1:] if value)
+
+
+def build_match_query(query):
+    """
+    Turn user input into an FTS5 query matching every word as a prefix.
+
+    Returns:
+        The MATCH expression, or an empty string if the input has no words.
+    """
+    return " ".join(f'"{token}"*' for token in TOKEN_RE.findall(query))
+
+
+def index_objects(model, instances):
+    if not uses_fts():
+        return
+
+    label = model._meta.label
+    rows = [
+        (label, str(instance.pk), *get_document(instance)) for instance in instances
+    ]
+
+    if not rows:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR IGNORE INTO {SEARCH_DOCUMENTS_TABLE} (model, object_id) "
+            "VALUES (%s, %s)",
+            [row[:2] for row in rows],
+        )
+
+        for label, object_id, title, body in rows:
+            cursor.execute(
+                f"SELECT id FROM {SEARCH_DOCUMENTS_TABLE} "
+                "WHERE model = %s AND object_id = %s",
+                [label, object_id],
+            )
+            document_id = cursor.fetchone()[0]
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [document_id]
+            )
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, title, body) "
+                "VALUES (%s, %s, %s)",
+                [document_id, title, body],
+            )
+
+
+def unindex_object(model, pk):
+    if not uses_fts():
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT id FROM {SEARCH_DOCUMENTS_TABLE} "
+            "WHERE model = %s AND object_id = %s",
+            [model._meta.label, str(pk)],
+        )
+        row = cursor.fetchone()
+
+        if row is None:
+            return
+
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [row[0]])
+        cursor.execute(
+            f"DELETE FROM {SEARCH_DOCUMENTS_TABLE} WHERE id = %s", [row[0]]
+        )
+
+
+def rebuild_search_index(models=None, batch_size=500):
+    """
+    Re-index every object of the searchable models.
+
+    Returns:
+        A dict mapping each model label to the number of indexed objects.
+    """
+    if not uses_fts():
+        return {}
+
+    models = models or get_searchable_models()
+    counts = {}
+
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+                f"(SELECT id FROM {SEARCH_DOCUMENTS_TABLE} WHERE model = %s)",
+                [model._meta.label],
+            )
+            cursor.execute(
+                f"DELETE FROM {SEARCH_DOCUMENTS_TABLE} WHERE model = %s",
+                [model._meta.label],
+            )
+
+    for model in models:
+        batch = []
+        counts[model._meta.label] = 0
+
+        for instance in model._base_manager.order_by("pk").iterator(batch_size):
+            batch.append(instance)
+
+            if len(batch) >= batch_size:
+                index_objects(model, batch)
+                counts[model._meta.label] += len(batch)
+                batch = []
+
+        index_objects(model, batch)
+        counts[model._meta.label] += len(batch)
+
+    return counts
+
+
+def search_model(model, query, offset=0, limit=10):
+    """
+    Find objects of one model matching ``query``, best match first.
+
+    Uses the FTS5 index on SQLite and ``icontains`` over the search keys on
+    other databases.
+
+    Returns:
+        A ``(count, objects)`` tuple with the total number of matches and
+        the objects of the requested page.
+    """
+    if not uses_fts():
+        condition = Q()
+
+        for token in TOKEN_RE.findall(query):
+            token_condition = Q()
+
+            for key in get_search_keys(model):
+                token_condition |= Q(**{f"{key}__icontains": token})
+
+            condition &= token_condition
+
+        queryset = model._base_manager.filter(condition).order_by("-pk")
+
+        return queryset.count(), list(queryset[offset : offset + limit])
+
+    match = build_match_query(query)
+
+    if not match:
+        return 0, []
+
+    label = model._meta.label
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {SEARCH_TABLE} "
+            f"JOIN {SEARCH_DOCUMENTS_TABLE} d ON d.id = {SEARCH_TABLE}.rowid "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND d.model = %s",
+            [match, label],
+        )
+        count = cursor.fetchone()[0]
+
+        if not count:
+            return 0, []
+
+        cursor.execute(
+            f"SELECT d.object_id FROM {SEARCH_TABLE} "
+            f"JOIN {SEARCH_DOCUMENTS_TABLE} d ON d.id = {SEARCH_TABLE}.rowid "
+            f"WHERE {SEARCH_TABLE} MATCH %s AND d.model = %s "
+            f"ORDER BY bm25({SEARCH_TABLE}, %s, %s) LIMIT %s OFFSET %s",
+            [match, label, TITLE_WEIGHT, BODY_WEIGHT, limit, offset],
+        )
+        pks = [model._meta.pk.to_python(row[0]) for row in cursor.fetchall()]
+
+    queryset = model._base_manager.all()
+
+    if hasattr(model.serializer_class, "setup_eager_loading"):
+        queryset = model.serializer_class.setup_eager_loading(queryset)
+
+    objects = queryset.in_bulk(pks)
+
+    return count, [objects[pk] for pk in pks if pk in objects]
+
+
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_objects(sender, [instance])
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_object(sender, instance.pk)
+
+
+def connect_search_signals():
+    for model in get_searchable_models():
+        dispatch_uid = f"search:{model._meta.label}"
+        post_save.connect(update_search_index, sender=model, dispatch_uid=dispatch_uid)
+        post_delete.connect(
+            remove_from_search_index, sender=model, dispatch_uid=dispatch_uid
+        )
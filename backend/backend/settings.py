@@ -19,6 +19,8 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 CORS_ORIGIN_ALLOW_ALL = True
+# Let the admin read the pagination cursors of list responses.
+CORS_EXPOSE_HEADERS = ["Link", "X-Next-Cursor", "X-Previous-Cursor", "X-Page-Size"]
 CSRF_TRUSTED_ORIGINS = ["https://*.mydomain.com", "http://localhost:5173"]
 AUTH_USER_MODEL = "authorization.User"
 
@@ -48,6 +50,7 @@ INSTALLED_APPS = [
     "support",
     "tables",
     "tasks",
+    "backend",
 ]
 
 MIDDLEWARE = [
@@ -61,15 +64,25 @@ MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "backend.middleware.Default404ResponseMiddleware",
     "backend.middleware.JWTMiddleware",
+    "backend.middleware.AuditLogMiddleware",
     "auditlog.middleware.AuditlogMiddleware",
 ]
 
+REST_FRAMEWORK = {
+    "DEFAULT_PAGINATION_CLASS": "backend.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
+}
+
 AUDITLOG_CONTEXT_PROCESSORS = [
     "backend.context_processors.auditlog_context_processor",
 ]
 
 AUDITLOG_ENABLE = True
 
+# Write audit log entries from a background thread instead of at the end of
+# each request.
+AUDIT_LOG_ASYNC = False
+
 ROOT_URLCONF = "backend.urls"
 
 TEMPLATES = [
@@ -102,6 +115,33 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# Model versions, cached pages and the token blacklist live in the cache, so
+# every worker must share it: set CACHE_URL to a Redis server in production.
+# Without a shared cache, pages and conditional GETs are not cached unless
+# CACHE_SINGLE_PROCESS says one process serves every request, as the
+# development server does.
+
+CACHE_URL = os.environ.get("CACHE_URL")
+
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+CACHE_SINGLE_PROCESS = DEBUG
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
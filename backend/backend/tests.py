@@ -0,0 +1,1275 @@
+import datetime
+import json
+import tempfile
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+import jwt
+from about.models import Value
+from asgiref.sync import async_to_sync
+from auditlog.models import LogEntry
+from authorization.blacklist import is_token_blacklisted
+from authorization.models import TokenBlacklist, User
+from authorization.serializers import TokenBlacklistSerializer
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from landing.models import SectionHeader
+from posts.models import Post, PostTag
+from quizes.models import (
+    AnswerChoice,
+    Question,
+    Questionnaire,
+    QuestionnaireAnswerCount,
+    QuestionnaireResultAnswer,
+    QuestionnaireResults,
+    QuestionSet,
+)
+from quizes.utils import check_answer_counts
+from services.models import Feature, ServiceTier
+from services.views import ServiceTierView
+from support.models import Subscribers
+from tables.models import Cell, Column, Row, Table
+from tasks.models import Task
+from tasks.views import TaskBulkAPIView
+from .audit import buffered_audit_log, flush_audit_log
+from .bulk import validate_bulk_items, write_bulk_items
+from .choices import get_field_choices
+from .counts import adjust_row_count, get_count_key, get_row_count, get_row_counts
+from .page_cache import aget_serialized_page_data, get_page_dependencies
+from .pagination import KeysetPagination
+from .registry import ModelRegistry, build_field_choices
+from .search import rebuild_search_index, search_model
+from .utils import (
+    create_log_entry,
+    get_serialized_page_data,
+    return_changes,
+    return_snapshot_changes,
+    take_snapshot,
+)
+from .versions import LOCAL_CACHE_BACKENDS, check_shared_cache
+from .views import get_model_metadata
+
+
+class AuditLogTests(TestCase):
+    def setUp(self):
+        self.tables = [Table.objects.create(name=f"Table {i}") for i in range(3)]
+        LogEntry.objects.all().delete()
+
+    def test_request_entries_are_written_with_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            with buffered_audit_log():
+                with self.captureOnCommitCallbacks(execute=True):
+                    for table in self.tables:
+                        create_log_entry(LogEntry.Action.CREATE, None, table, None)
+
+                self.assertEqual(LogEntry.objects.count(), 0)
+
+        inserts = [q for q in queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(LogEntry.objects.count(), 3)
+
+    def test_flush_writes_collected_entries(self):
+        with buffered_audit_log():
+            with self.captureOnCommitCallbacks(execute=True):
+                create_log_entry(LogEntry.Action.CREATE, None, self.tables[0], None)
+
+            flush_audit_log()
+            self.assertEqual(LogEntry.objects.count(), 1)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                create_log_entry(LogEntry.Action.CREATE, None, self.tables[1], None)
+
+        self.assertEqual(LogEntry.objects.count(), 2)
+
+    def test_rolled_back_entries_are_dropped(self):
+        with buffered_audit_log(), self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    create_log_entry(LogEntry.Action.CREATE, None, self.tables[0], None)
+                    raise ValueError
+            except ValueError:
+                pass
+
+            create_log_entry(LogEntry.Action.CREATE, None, self.tables[1], None)
+
+        self.assertEqual(
+            list(LogEntry.objects.values_list("object_id", flat=True)),
+            [self.tables[1].pk],
+        )
+
+    def test_bulk_delete_logs_each_object(self):
+        ids = [table.pk for table in self.tables[:2]]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                "/api/table/bulk/", {"ids": ids}, content_type="application/json"
+            )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            sorted(
+                LogEntry.objects.filter(action=LogEntry.Action.DELETE).values_list(
+                    "object_id", flat=True
+                )
+            ),
+            ids,
+        )
+
+
+class RecentAdminActionsTests(TestCase):
+    def setUp(self):
+        self.tables = [Table.objects.create(name=f"Table {i}") for i in range(3)]
+        LogEntry.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for table in self.tables:
+                create_log_entry(LogEntry.Action.CREATE, None, table, None)
+
+        self.tables[2].delete()
+
+    def test_feed_links_existing_objects(self):
+        response = self.client.get("/api/recent_admin_actions/?items=all")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(
+            [item["obj_url"] for item in response.data],
+            [
+                "Object not found",
+                f"/admin/table/control/{self.tables[1].pk}/",
+                f"/admin/table/control/{self.tables[0].pk}/",
+            ],
+        )
+
+    def test_feed_is_cached_until_next_entry(self):
+        self.client.get("/api/recent_admin_actions/?model=table")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/recent_admin_actions/?model=table")
+        self.assertEqual(len(response.data), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_log_entry(LogEntry.Action.UPDATE, None, self.tables[0], "name")
+
+        response = self.client.get("/api/recent_admin_actions/?model=table")
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(response.data[0]["action_flag"], "Update")
+
+    def test_feed_pages_by_cursor(self):
+        response = self.client.get("/api/recent_admin_actions/?page_size=2")
+
+        self.assertEqual(len(response.data), 2)
+        cursor = response["X-Next-Cursor"]
+
+        response = self.client.get(
+            f"/api/recent_admin_actions/?page_size=2&cursor={cursor}"
+        )
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(
+            response.data[0]["obj_url"], f"/admin/table/control/{self.tables[0].pk}/"
+        )
+
+
+class ModelRegistryTests(TestCase):
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.registry.build()
+
+    def test_build_reads_no_rows(self):
+        with self.assertNumQueries(0):
+            ModelRegistry().build()
+
+    def test_database_choices_are_read_per_request(self):
+        fields = self.registry.get("post")["metadata"]["fields"]
+        self.assertIsNone(fields["author"]["choices"])
+
+        author = User.objects.create(username="author", email="a@example.com")
+        choices = get_model_metadata("post")["fields"]["author"]["choices"][0]
+
+        self.assertIn(author.pk, [choice["value"] for choice in choices])
+
+    def test_content_choices_describe_their_model(self):
+        post_type = ContentType.objects.get_for_model(Post)
+        field = mock.Mock(choices=[(post_type.pk, "Post"), (0, "Removed")])
+
+        self.assertEqual(
+            build_field_choices("content", field),
+            [
+                {
+                    "value": post_type.pk,
+                    "display": "Post",
+                    "model_name": "Post",
+                    "category": Post._meta.category,
+                },
+                {"value": 0, "display": "Removed"},
+            ],
+        )
+
+    def test_entries_are_built_per_model(self):
+        entry = self.registry.get("Post")
+
+        self.assertIs(entry["model"], Post)
+        self.assertIs(entry["serializer_class"], Post.serializer_class)
+        self.assertEqual(entry["metadata"]["modelName"], "Post")
+        self.assertIsNotNone(entry["endpoint"])
+
+        content_type = self.registry.get("contenttype")
+        self.assertIsNone(content_type["metadata"])
+        self.assertIsNone(content_type["endpoint"])
+
+        through = Post.tags.through
+        self.assertNotIn(through, [e["model"] for e in self.registry.all()])
+        self.assertIn(
+            through,
+            [e["model"] for e in self.registry.all(include_auto_created=True)],
+        )
+
+    def test_lookups(self):
+        entry = self.registry.get("post")
+
+        self.assertIs(self.registry.get("post", "posts"), entry)
+        self.assertIs(self.registry.get_for_model(Post), entry)
+        self.assertIsNone(self.registry.get("post", "landing"))
+        self.assertIsNone(self.registry.get("missing"))
+        self.assertIn(entry, self.registry.for_app("posts"))
+
+    def test_rebuilds_when_debug_sees_a_new_serializer(self):
+        serializer_class = Post.serializer_class
+
+        class RenamedPostSerializer(serializer_class):
+            pass
+
+        with mock.patch.object(Post, "serializer_class", RenamedPostSerializer):
+            with override_settings(DEBUG=False):
+                entry = self.registry.get_for_model(Post)
+            self.assertIs(entry["serializer_class"], serializer_class)
+
+            with override_settings(DEBUG=True):
+                entry = self.registry.get_for_model(Post)
+            self.assertIs(entry["serializer_class"], RenamedPostSerializer)
+
+        with mock.patch.object(self.registry, "build") as build:
+            with override_settings(DEBUG=True):
+                self.registry.get_for_model(Post)
+            build.assert_called_once_with()
+
+            build.reset_mock()
+            self.registry.ensure_current()
+            build.assert_not_called()
+
+
+class PaginationTests(TestCase):
+    def setUp(self):
+        self.subscribers = [
+            Subscribers.objects.create(email=f"{i}@example.com") for i in range(60)
+        ]
+
+    def get_ids(self, response):
+        return [row["id"] for row in response.json()]
+
+    def test_plain_requests_are_bounded(self):
+        with mock.patch.object(KeysetPagination, "page_size", 25):
+            response = self.client.get("/api/subscribers/")
+
+        self.assertEqual(len(response.json()), 25)
+        self.assertEqual(response["X-Page-Size"], "25")
+        self.assertIn("X-Next-Cursor", response)
+
+    def test_models_that_do_not_opt_in_are_not_paginated(self):
+        for i in range(3):
+            Feature.objects.create(detail=f"Feature {i}")
+
+        response = self.client.get("/api/feature/?page_size=2")
+
+        self.assertEqual(len(response.json()), 3)
+        self.assertNotIn("X-Next-Cursor", response)
+
+    def test_cursor_round_trip(self):
+        ids = []
+        cursor = ""
+
+        while True:
+            response = self.client.get(
+                f"/api/subscribers/?page_size=25&cursor={cursor}"
+            )
+            self.assertEqual(response["X-Page-Size"], "25")
+            ids += self.get_ids(response)
+            cursor = response.get("X-Next-Cursor")
+
+            if cursor is None:
+                break
+
+        self.assertEqual(ids, [obj.pk for obj in reversed(self.subscribers)])
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(KeysetPagination, "max_page_size", 10):
+            response = self.client.get("/api/subscribers/?page_size=1000")
+
+        self.assertEqual(len(response.json()), 10)
+        self.assertIn("X-Next-Cursor", response)
+
+    def test_sy_views_opt_in(self):
+        for i in range(3):
+            ServiceTier.objects.create(
+                image="pricing_images/tier.png", service_title=f"Tier {i}", price="1"
+            )
+
+        response = self.client.get("/api/servicetier/?page_size=2")
+        self.assertEqual(len(response.json()), 3)
+
+        with mock.patch.object(ServiceTierView, "paginate", True):
+            response = self.client.get("/api/servicetier/")
+            self.assertEqual(len(response.json()), 3)
+            self.assertNotIn("X-Next-Cursor", response)
+
+            response = self.client.get("/api/servicetier/?page_size=2")
+            self.assertEqual(len(response.json()), 2)
+
+            response = self.client.get(
+                f"/api/servicetier/?page_size=2&cursor={response['X-Next-Cursor']}"
+            )
+            self.assertEqual(len(response.json()), 1)
+
+
+class FilterChoicesTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username="alice", email="alice@example.com")
+        self.bob = User.objects.create(username="bob", email="bob@example.com")
+
+        Task.objects.create(title="Write", author=self.alice)
+        Task.objects.create(title="Write", author=self.bob)
+        Task.objects.create(title="Read", author=self.alice)
+
+    def test_choices_are_counted_by_frequency(self):
+        result = get_field_choices(Task, "title")
+
+        self.assertEqual(
+            result["choices"],
+            [
+                {"value": "Write", "display_name": "Write", "count": 2},
+                {"value": "Read", "display_name": "Read", "count": 1},
+            ],
+        )
+        self.assertFalse(result["has_more"])
+
+    def test_related_choices_match_prefix_on_display_field(self):
+        result = get_field_choices(Task, "author", query="AL")
+
+        self.assertEqual(
+            result["choices"],
+            [{"value": self.alice.pk, "display_name": str(self.alice), "count": 2}],
+        )
+
+    def test_rows_hidden_by_the_default_manager_are_counted(self):
+        for highlighted in (False, True):
+            Post.objects.create(
+                title="Post",
+                content="...",
+                author=self.alice,
+                is_highlighted=highlighted,
+            )
+
+        self.assertEqual(
+            get_field_choices(Post, "title")["choices"],
+            [{"value": "Post", "display_name": "Post", "count": 2}],
+        )
+        choices = get_field_choices(Post, "is_highlighted")["choices"]
+        self.assertEqual([choice["value"] for choice in choices], [False, True])
+
+    def test_choices_are_cached_until_model_changes(self):
+        get_field_choices(Task, "title", limit=1)
+
+        with self.assertNumQueries(0):
+            result = get_field_choices(Task, "title", limit=1)
+        self.assertTrue(result["has_more"])
+
+        Task.objects.filter(title="Read").update(title="Write")
+        Task.objects.first().save()
+
+        result = get_field_choices(Task, "title", limit=1)
+        self.assertEqual(result["choices"][0]["count"], 3)
+        self.assertFalse(result["has_more"])
+
+    def test_typeahead_endpoint(self):
+        response = self.client.get("/api/get_filter_choices/task/?field=title&q=r")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c["value"] for c in response.data["choices"]], ["Read"])
+
+        response = self.client.get("/api/get_filter_choices/task/?field=description")
+        self.assertEqual(response.status_code, 400)
+
+
+class RowCountTests(TestCase):
+    def setUp(self):
+        cache.delete(get_count_key(Table))
+        Table.objects.create(name="First")
+
+    def test_counts_follow_saves_and_deletes(self):
+        self.assertEqual(get_row_count(Table), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tables = [Table.objects.create(name=f"Table {i}") for i in range(3)]
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_row_counts([Table]), {Table: 4})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                "/api/table/bulk/",
+                {"ids": [table.pk for table in tables]},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(get_row_count(Table), 1)
+
+    def test_bulk_create_and_refresh(self):
+        self.assertEqual(get_row_count(Table), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Table.objects.bulk_create([Table(name="Bulk")])
+        self.assertEqual(get_row_count(Table), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            adjust_row_count(Table, 1)
+        self.assertEqual(get_row_count(Table), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Table.objects.bulk_create([Table(name="Untracked")])
+        self.assertEqual(get_row_count(Table, refresh=True), 3)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        author = User.objects.create(username="author", email="author@example.com")
+        self.body_match = Post.objects.create(
+            title="Weekly notes", content="Notes about django migrations", author=author
+        )
+        self.title_match = Post.objects.create(
+            title="Django tips", content="Small tips", author=author
+        )
+
+    def test_matches_are_ranked_title_first(self):
+        count, posts = search_model(Post, "djan")
+
+        self.assertEqual(count, 2)
+        self.assertEqual(posts, [self.title_match, self.body_match])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.title_match.title = "Python tips"
+        self.title_match.save()
+        self.body_match.delete()
+
+        self.assertEqual(search_model(Post, "django"), (0, []))
+        self.assertEqual(search_model(Post, "python")[1], [self.title_match])
+
+    def test_rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM search_index")
+
+        self.assertEqual(search_model(Post, "tips"), (0, []))
+        self.assertEqual(rebuild_search_index([Post]), {"posts.Post": 2})
+        self.assertEqual(search_model(Post, "tips")[1], [self.title_match])
+
+    def test_migration_indexes_existing_rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM search_index")
+            cursor.execute("DELETE FROM search_documents")
+
+        migration = import_module("backend.migrations.0002_populate_search_index")
+        state = MigrationLoader(connection).project_state(
+            ("backend", "0002_populate_search_index")
+        )
+        migration.populate_search_index(state.apps, mock.Mock(connection=connection))
+
+        self.assertEqual(search_model(Post, "tips")[1], [self.title_match])
+        self.assertEqual(search_model(Post, "django")[0], 2)
+
+    def test_search_endpoint_pages_per_model(self):
+        response = self.client.get("/api/search/?q=django&model=post&page_size=1")
+
+        self.assertEqual(response.status_code, 200)
+        posts = response.data["results"]["post"]
+        self.assertEqual(posts["count"], 2)
+        self.assertEqual(
+            [post["id"] for post in posts["results"]], [self.title_match.pk]
+        )
+
+        response = self.client.get("/api/search/")
+        self.assertEqual(response.status_code, 400)
+
+
+class PageCacheTests(TransactionTestCase):
+    def test_page_is_cached_until_a_dependency_changes(self):
+        value = Value.objects.create(title="Integrity", icon="mdi-heart")
+        first = self.client.get("/api/about/")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["values"][0]["title"], "Integrity")
+
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/about/")
+        self.assertEqual(second.content, first.content)
+
+        Table.objects.create(name="Unrelated")
+        with self.assertNumQueries(0):
+            self.client.get("/api/about/")
+
+        value.title = "Honesty"
+        value.save()
+
+        response = self.client.get("/api/about/")
+        self.assertEqual(response.json()["values"][0]["title"], "Honesty")
+
+    def test_concurrent_sections_match_sequential_build(self):
+        Value.objects.create(title="Integrity", icon="mdi-heart")
+        Table.objects.create(name="Unrelated")
+        model_dict = {
+            "values": {"app_label": "about", "model_name": "Value"},
+            "tables": {"app_label": "tables", "model_name": "Table"},
+        }
+        request = RequestFactory().get("/api/about/")
+
+        self.assertEqual(
+            async_to_sync(aget_serialized_page_data)(model_dict, request),
+            get_serialized_page_data(model_dict, request),
+        )
+
+    def test_dependencies_include_nested_serializers(self):
+        dependencies = get_page_dependencies(
+            "test-posts",
+            {"posts": {"app_label": "posts", "model_name": "Post"}},
+        )
+
+        self.assertEqual(
+            dependencies, ["authorization.User", "posts.Post", "posts.PostTag"]
+        )
+
+    def test_deploy_check_requires_a_shared_cache(self):
+        local = {"default": {"BACKEND": LOCAL_CACHE_BACKENDS[0]}}
+        shared = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://127.0.0.1:6379/1",
+            }
+        }
+
+        with override_settings(CACHES=local, CACHE_SINGLE_PROCESS=False):
+            warnings = check_shared_cache(None)
+        self.assertEqual([warning.id for warning in warnings], ["backend.W001"])
+
+        with override_settings(CACHES=local, CACHE_SINGLE_PROCESS=True):
+            self.assertEqual(check_shared_cache(None), [])
+
+        with override_settings(CACHES=shared, CACHE_SINGLE_PROCESS=False):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class ConditionalGetTests(TransactionTestCase):
+    def setUp(self):
+        self.value = Value.objects.create(title="Integrity", icon="mdi-heart")
+
+    def assertRevalidates(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+        self.value.title = "Honesty"
+        self.value.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_view(self):
+        self.assertRevalidates("/api/value/")
+
+    def test_detail_view(self):
+        self.assertRevalidates(f"/api/value/{self.value.pk}/")
+
+    def test_page_view(self):
+        self.assertRevalidates("/api/about/")
+
+    @override_settings(CACHE_SINGLE_PROCESS=False)
+    def test_nothing_is_cached_without_a_shared_cache(self):
+        for url in ("/api/value/", "/api/about/"):
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("ETag", response)
+
+        # Another worker's change that this process never saw.
+        Value.objects.filter(pk=self.value.pk).update(title="Honesty")
+
+        response = self.client.get("/api/about/")
+        self.assertEqual(response.json()["values"][0]["title"], "Honesty")
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="member", email="member@example.com", password="password"
+        )
+        self.value = Value.objects.create(title="Integrity", icon="mdi-heart")
+        token = jwt.encode(
+            {
+                "user": "member",
+                "exp": datetime.datetime.utcnow() + datetime.timedelta(days=1),
+            },
+            settings.SECRET_KEY,
+            algorithm="HS256",
+        )
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def batch(self, data):
+        return self.client.post(
+            "/api/batch/", data, content_type="application/json", **self.auth
+        )
+
+    def test_results_match_individual_requests(self):
+        response = self.batch(
+            {
+                "requests": [
+                    {"id": "values", "path": "/api/value/"},
+                    {"path": f"/api/value/{self.value.pk}/"},
+                    {"path": "/api/value/", "params": {"title": "Nothing"}},
+                    {"path": "/api/missing/"},
+                ]
+            }
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["responses"]
+        self.assertEqual([result["id"] for result in results], ["values", 1, 2, 3])
+        self.assertEqual(
+            [result["status"] for result in results], [200, 200, 200, 404]
+        )
+        self.assertEqual(results[0]["body"], self.client.get("/api/value/").json())
+        self.assertEqual(results[1]["body"]["title"], "Integrity")
+        self.assertIn("ETag", results[1]["headers"])
+
+    def test_django_errors_keep_their_status(self):
+        content_type = ContentType.objects.get_for_model(Value)
+
+        with mock.patch("backend.batch.logger") as logger:
+            response = self.batch(
+                [{"path": f"/admin/{content_type.pk}/{self.value.pk + 1}/"}]
+            )
+
+        self.assertEqual(response.status_code, 200)
+        result = response.json()["responses"][0]
+        self.assertEqual(result["status"], 404)
+        self.assertEqual(result["body"], {"detail": "Not found."})
+        logger.exception.assert_not_called()
+
+    def test_writes_share_one_user_lookup(self):
+        path = f"/api/value/{self.value.pk}/"
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.batch(
+                    [
+                        {"method": "PATCH", "path": path, "body": {"title": "One"}},
+                        {"method": "PATCH", "path": path, "body": {"title": "Two"}},
+                        {"path": path},
+                    ]
+                )
+
+        results = response.json()["responses"]
+        self.assertEqual([result["status"] for result in results], [200, 200, 200])
+        self.assertEqual(results[2]["body"]["title"], "Two")
+        self.assertEqual(
+            len([q for q in queries if 'FROM "authorization_user"' in q["sql"]]), 1
+        )
+
+    def test_malformed_batches_are_rejected(self):
+        self.assertEqual(self.batch({"requests": []}).status_code, 400)
+        self.assertEqual(self.batch([{"method": "GET"}]).status_code, 400)
+        self.assertEqual(
+            self.batch([{"method": "TRACE", "path": "/api/value/"}]).status_code, 400
+        )
+
+        response = self.batch([{"method": "POST", "path": "/api/batch/"}])
+        self.assertEqual(response.json()["responses"][0]["status"], 400)
+
+
+class ParallelBatchTests(TransactionTestCase):
+    def test_parallel_results_match_sequential(self):
+        Value.objects.create(title="Integrity", icon="mdi-heart")
+        requests = [
+            {"path": "/api/value/"},
+            {"path": "/api/about/"},
+            {"path": "/api/recent_admin_actions/"},
+        ]
+
+        sequential = self.client.post(
+            "/api/batch/", {"requests": requests}, content_type="application/json"
+        )
+        parallel = self.client.post(
+            "/api/batch/",
+            {"requests": requests, "parallel": True},
+            content_type="application/json",
+        )
+
+        self.assertEqual(
+            [result["status"] for result in parallel.json()["responses"]],
+            [200, 200, 200],
+        )
+        self.assertEqual(parallel.json(), sequential.json())
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        author = User.objects.create(username="author", email="author@example.com")
+        tag = PostTag.objects.create(detail="django")
+
+        for title in ("First", "Second"):
+            Post.objects.create(title=title, content="...", author=author).tags.add(
+                tag
+            )
+
+    def test_fields_narrow_representation_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/post/?fields=title")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [sorted(post) for post in response.json()],
+            [["id", "title"], ["id", "title"]],
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"content"', queries[0]["sql"])
+
+    def test_expand_adds_nested_fields_only(self):
+        response = self.client.get("/api/post/?expand=author_details")
+        post = response.json()[0]
+
+        self.assertEqual(post["author_details"]["username"], "author")
+        self.assertIn("content", post)
+        self.assertNotIn("related_posts", post)
+        self.assertNotIn("tags", post)
+
+    def test_method_fields_are_computed_when_requested(self):
+        response = self.client.get("/api/post/?fields=title&expand=related_posts")
+        post = response.json()[0]
+
+        self.assertEqual(sorted(post), ["id", "related_posts", "title"])
+        self.assertEqual(len(post["related_posts"]), 1)
+
+    def test_without_parameters_nothing_changes(self):
+        post = self.client.get("/api/post/").json()[0]
+
+        self.assertIn("tags_options", post)
+        self.assertIn("author_details", post)
+
+
+    def test_tables_load_only_the_requested_levels(self):
+        table = Table.objects.create(name="Plans")
+        column = Column.objects.create(table=table, name="Price")
+        row = Row.objects.create(table=table, name="Basic")
+        Cell.objects.create(column=column, row=row, value="10")
+
+        for url in (f"/api/table/{table.pk}/", "/api/table/"):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(f"{url}?fields=name")
+
+            data = response.json()
+            data = data if isinstance(data, dict) else data[0]
+            self.assertEqual(sorted(data), ["id", "name"])
+            self.assertFalse(
+                any("tables_column" in query["sql"] for query in queries)
+            )
+            self.assertFalse(any("tables_row" in query["sql"] for query in queries))
+
+        response = self.client.get(f"/api/table/{table.pk}/?fields=name,columns")
+        self.assertEqual(sorted(response.json()), ["columns", "id", "name"])
+
+        response = self.client.get(f"/api/table/{table.pk}/")
+        self.assertEqual(response.json()["rows"][0]["cells"][0]["value"], "10")
+
+
+class SnapshotChangeTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(username="author", email="a@example.com")
+        self.editor = User.objects.create(username="editor", email="e@example.com")
+        self.post = Post.objects.create(
+            title="Draft", content="...", author=self.author
+        )
+
+    def test_message_matches_refetch_diff(self):
+        post = Post.objects.select_related("author").get(pk=self.post.pk)
+        snapshot = take_snapshot(post)
+        post.title = "Published"
+        post.author = self.editor
+        post.save()
+
+        with self.assertNumQueries(0):
+            changes = return_snapshot_changes(post, snapshot)
+
+        self.assertEqual(changes, return_changes(post, self.post))
+        self.assertIn("title: Draft -> Published", changes)
+        self.assertIn("author: author -> editor", changes)
+
+    def test_unchanged_relations_are_not_loaded(self):
+        post = Post.objects.get(pk=self.post.pk)
+        snapshot = take_snapshot(post)
+        post.content = "Done"
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                return_snapshot_changes(post, snapshot), "content: ... -> Done"
+            )
+
+    def test_update_reads_the_object_once(self):
+        value = Value.objects.create(title="Integrity", icon="mdi-heart")
+        User.objects.create(username="member", email="member@example.com")
+        token = jwt.encode(
+            {
+                "user": "member",
+                "exp": datetime.datetime.utcnow() + datetime.timedelta(days=1),
+            },
+            settings.SECRET_KEY,
+            algorithm="HS256",
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.patch(
+                    f"/api/value/{value.pk}/",
+                    {"title": "Honesty"},
+                    content_type="application/json",
+                    HTTP_AUTHORIZATION=f"Bearer {token}",
+                )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len([q for q in queries if q["sql"].startswith('SELECT "about_value"')]),
+            1,
+        )
+        self.assertEqual(
+            LogEntry.objects.get(action=LogEntry.Action.UPDATE).changes,
+            "title: Integrity -> Honesty",
+        )
+
+
+class BulkWriteTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(username="author", email="a@example.com")
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", author=self.author) for i in range(3)
+        ]
+        LogEntry.objects.all().delete()
+
+    def bulk(self, method, data, url="/api/task/bulk/"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(
+                url, data, content_type="application/json"
+            )
+
+    def test_post_creates_and_updates_in_chunks(self):
+        items = [
+            {"title": "New 1", "author": self.author.pk},
+            {"title": "New 2", "author": self.author.pk},
+            {"title": "New 3", "author": self.author.pk, "status": "Bogus"},
+            {"title": "New 4", "author": self.author.pk},
+            {"id": self.tasks[0].pk, "title": "Renamed"},
+        ]
+
+        with mock.patch.object(TaskBulkAPIView, "bulk_chunk_size", 2):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.bulk("post", {"items": items})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 3)
+        self.assertEqual(response.json()["updated"], 1)
+        errors = response.json()["errors"]
+        self.assertEqual(
+            [(error["index"], list(error["errors"])) for error in errors],
+            [(2, ["status"])],
+        )
+        inserts = [
+            q for q in queries if q["sql"].startswith('INSERT INTO "tasks_task"')
+        ]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(Task.objects.count(), 6)
+        self.assertEqual(get_row_count(Task), 6)
+        self.assertEqual(
+            LogEntry.objects.filter(action=LogEntry.Action.CREATE).count(), 3
+        )
+        self.assertEqual(
+            LogEntry.objects.get(action=LogEntry.Action.UPDATE).changes.split(", ")[0],
+            "title: Task 0 -> Renamed",
+        )
+
+    def test_patch_writes_per_item_values(self):
+        before = Task.objects.get(pk=self.tasks[0].pk).updated_at
+        response = self.bulk(
+            "patch",
+            {
+                "items": [
+                    {"id": self.tasks[0].pk, "priority": "High"},
+                    {"id": self.tasks[1].pk, "priority": "Low"},
+                    {"id": 999, "priority": "Low"},
+                ]
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 2)
+        self.assertEqual(response.json()["errors"][0]["id"], 999)
+        self.assertEqual(
+            list(Task.objects.values_list("priority", flat=True)),
+            ["High", "Low", "None"],
+        )
+        self.assertGreater(Task.objects.get(pk=self.tasks[0].pk).updated_at, before)
+
+    def test_patch_same_values_for_many_ids(self):
+        response = self.bulk(
+            "patch",
+            {
+                "ids": [task.pk for task in self.tasks],
+                "values": {"status": "Complete"},
+            },
+        )
+
+        self.assertEqual(response.json()["updated"], 3)
+        self.assertEqual(Task.objects.filter(status="Complete").count(), 3)
+
+    def test_constraint_violations_fail_per_item(self):
+        items = [
+            {"email": "a@example.com"},
+            {"email": "b@example.com"},
+            {"email": "a@example.com"},
+        ]
+        response = self.bulk("post", {"items": items}, "/api/subscribers/bulk/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["created"], 2)
+        self.assertEqual([error["index"] for error in response.json()["errors"]], [2])
+        self.assertEqual(Subscribers.objects.count(), 2)
+        self.assertEqual(
+            LogEntry.objects.filter(action=LogEntry.Action.CREATE).count(), 2
+        )
+
+    def test_models_with_save_hooks_are_saved_one_by_one(self):
+        response = self.bulk(
+            "post",
+            {
+                "items": [
+                    {
+                        "name": "NEWS",
+                        "subtitle": "Latest",
+                        "title": "News",
+                        "alignment": "Left",
+                    }
+                ]
+            },
+            "/api/sectionheader/del/bulk/",
+        )
+
+        self.assertEqual(response.json()["created"], 1)
+        self.assertTrue(SectionHeader.objects.filter(name="news").exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            valid, errors = validate_bulk_items(
+                TokenBlacklistSerializer, TokenBlacklist, [{"token": "abc.def.ghi"}]
+            )
+            write_bulk_items(TokenBlacklist, valid)
+
+        self.assertEqual(errors, [])
+        self.assertIsNotNone(TokenBlacklist.objects.get().token_hash)
+        self.assertTrue(is_token_blacklisted("abc.def.ghi"))
+        self.assertEqual(get_row_count(TokenBlacklist), 1)
+
+    def test_all_invalid_items_are_rejected(self):
+        response = self.bulk("patch", {"items": [{"id": 999, "title": "Gone"}]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["updated"], 0)
+        response = self.bulk("patch", {"items": [{"title": "x"}]})
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(
+            username="author", email="a@example.com", is_staff=True
+        )
+        self.auth = self.get_auth("author")
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}",
+                author=self.author,
+                status="Complete" if i % 2 else "Incomplete",
+            )
+            for i in range(5)
+        ]
+
+    def get_auth(self, username):
+        token = jwt.encode(
+            {
+                "user": username,
+                "exp": datetime.datetime.utcnow() + datetime.timedelta(days=1),
+            },
+            settings.SECRET_KEY,
+            algorithm="HS256",
+        )
+
+        return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def export(self, model_name="task", **params):
+        response = self.client.get(f"/api/export/{model_name}/", params, **self.auth)
+
+        if response.status_code == 200:
+            self.assertTrue(response.streaming)
+
+        return response
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response = self.export(fields="field_keys")
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="task.csv"', response["Content-Disposition"])
+        rows = self.read(response).splitlines()
+        self.assertEqual(rows[0], "id,title,priority,status")
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1], f"{self.tasks[0].pk},Task 0,None,Incomplete")
+
+    def test_ndjson_export(self):
+        response = self.export(format="ndjson", fields="title")
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            rows, [{"id": task.pk, "title": task.title} for task in self.tasks]
+        )
+
+    def test_filter_options_narrow_the_rows(self):
+        response = self.export(format="ndjson", fields="status", status="Complete")
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+
+        self.assertEqual(
+            [row["id"] for row in rows], [self.tasks[1].pk, self.tasks[3].pk]
+        )
+
+    def test_serializer_fields_by_default(self):
+        response = self.export("user", format="ndjson")
+        row = json.loads(self.read(response).splitlines()[0])
+
+        self.assertIn("username", row)
+        self.assertIn("is_staff", row)
+
+        for name in ("password", "salt", "is_superuser", "last_login"):
+            self.assertNotIn(name, row)
+
+        self.assertEqual(self.export("user", fields="salt").status_code, 400)
+
+    def test_tokens_are_not_exported(self):
+        TokenBlacklist.objects.create(token="secret-token")
+        rows = self.read(self.export("tokenblacklist", format="ndjson"))
+
+        self.assertNotIn("secret-token", rows)
+        self.assertEqual(self.export("tokenblacklist", fields="token").status_code, 400)
+
+    def test_staff_only(self):
+        User.objects.create(username="member", email="m@example.com")
+
+        self.auth = {}
+        self.assertEqual(self.export("user").status_code, 403)
+
+        self.auth = self.get_auth("member")
+        self.assertEqual(self.export("user").status_code, 403)
+
+    def test_rows_hidden_by_the_default_manager_are_exported(self):
+        posts = [
+            Post.objects.create(
+                title=f"Post {i}",
+                content="...",
+                author=self.author,
+                is_highlighted=bool(i),
+            )
+            for i in range(2)
+        ]
+        response = self.export("post", format="ndjson", fields="title")
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+
+        self.assertEqual([row["id"] for row in rows], [post.pk for post in posts])
+
+    def test_errors(self):
+        self.assertEqual(self.export(format="xml").status_code, 400)
+        self.assertEqual(self.export(fields="title,password").status_code, 400)
+        self.assertEqual(self.export(fields="title,bogus").status_code, 400)
+        self.assertEqual(self.export("bogus").status_code, 404)
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(username="author", email="a@example.com")
+        self.task = Task.objects.create(title="Existing", author=self.author)
+        LogEntry.objects.all().delete()
+
+    def upload(self, body, content_type, model_name="subscribers"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                f"/api/import/{model_name}/?batch_size=2",
+                body,
+                content_type=content_type,
+            )
+
+    def get_counts(self, result):
+        return [result[key] for key in ("rows", "created", "updated", "failed")]
+
+    def test_csv_import_in_batches(self):
+        body = "email\none@example.com\nnot-an-email\ntwo@example.com\n"
+        body += '"two@example.com"\nthree@example.com\none@example.com\n'
+        response = self.upload(body, "text/csv")
+
+        self.assertEqual(response.status_code, 200)
+        result = response.json()
+        self.assertEqual(self.get_counts(result), [6, 3, 0, 3])
+        self.assertEqual(
+            [(error["line"], list(error["errors"])) for error in result["errors"]],
+            [(3, ["email"]), (5, ["non_field_errors"]), (7, ["email"])],
+        )
+        self.assertEqual(
+            sorted(Subscribers.objects.values_list("email", flat=True)),
+            ["one@example.com", "three@example.com", "two@example.com"],
+        )
+        self.assertEqual(
+            LogEntry.objects.filter(action=LogEntry.Action.CREATE).count(), 3
+        )
+
+    def test_ndjson_import(self):
+        body = "\n".join(
+            [json.dumps({"email": f"{i}@example.com"}) for i in range(2)]
+            + ["", json.dumps({"email": "2@example.com"})]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.upload(body, "application/x-ndjson")
+
+        self.assertEqual(self.get_counts(response.json()), [3, 3, 0, 0])
+        inserts = [
+            query
+            for query in queries
+            if query["sql"].startswith('INSERT INTO "support_subscribers"')
+        ]
+        self.assertEqual(len(inserts), 2)
+
+    def test_rows_with_an_id_update_the_object(self):
+        body = json.dumps({"id": self.task.pk, "title": "Renamed"})
+        response = self.upload(body, "application/x-ndjson", "task")
+
+        self.assertEqual(self.get_counts(response.json()), [1, 0, 1, 0])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "Renamed")
+        self.assertIn(
+            "title: Existing -> Renamed",
+            LogEntry.objects.get(action=LogEntry.Action.UPDATE).changes,
+        )
+
+    def test_imports_run_the_model_save_hooks(self):
+        response = self.upload(
+            json.dumps({"token": "abc.def.ghi"}),
+            "application/x-ndjson",
+            "tokenblacklist",
+        )
+
+        self.assertEqual(response.json()["created"], 1)
+        self.assertIsNotNone(TokenBlacklist.objects.get().token_hash)
+        self.assertTrue(is_token_blacklisted("abc.def.ghi"))
+
+        questionnaire = Questionnaire.objects.create(
+            title="Survey", slug="survey", description="Survey"
+        )
+        question_set = QuestionSet.objects.create(
+            questionnaire=questionnaire, title="Set", description="Set", order=1
+        )
+        question = Question.objects.create(question_set=question_set, text="Color?")
+        red, blue = [
+            AnswerChoice.objects.create(question=question, text=text)
+            for text in ("Red", "Blue")
+        ]
+        result = QuestionnaireResults.objects.create(
+            questionnaire=questionnaire,
+            contact_name="Contact",
+            contact_email="contact@example.com",
+            results={},
+        )
+        answer = QuestionnaireResultAnswer.objects.create(
+            questionnaire_result=result, question=question, answer_choice=red
+        )
+        response = self.upload(
+            json.dumps({"id": answer.id, "answer_choice": blue.id}),
+            "application/x-ndjson",
+            "questionnaireresultanswer",
+        )
+
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(check_answer_counts(), [])
+        self.assertEqual(
+            QuestionnaireAnswerCount.objects.get(answer_choice=blue).count, 1
+        )
+
+    def test_bad_line_keeps_earlier_batches(self):
+        body = "\n".join(
+            [json.dumps({"email": f"{i}@example.com"}) for i in range(2)] + ["{oops"]
+        )
+        response = self.upload(body, "application/x-ndjson")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Line 3", response.json()["detail"])
+        self.assertEqual(response.json()["created"], 2)
+        self.assertEqual(Subscribers.objects.count(), 2)
+
+    def test_errors(self):
+        response = self.upload(json.dumps({"email": "x"}), "application/x-ndjson")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["failed"], 1)
+        self.assertEqual(self.upload("", "text/csv").status_code, 400)
+
+        response = self.client.post("/api/import/bogus/", "", content_type="text/csv")
+        self.assertEqual(response.status_code, 404)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write("email\none@example.com\nx\ntwo@example.com\n")
+            file.flush()
+            stdout, stderr = StringIO(), StringIO()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command(
+                    "import_model_data",
+                    "support.subscribers",
+                    file.name,
+                    "--batch-size=2",
+                    "--user=author",
+                    stdout=stdout,
+                    stderr=stderr,
+                )
+
+        self.assertIn("2 rows: 1 created, 0 updated, 1 failed", stdout.getvalue())
+        self.assertIn("Imported 2 of 3 rows", stdout.getvalue())
+        self.assertIn("Line 3:", stderr.getvalue())
+        self.assertEqual(
+            set(LogEntry.objects.values_list("actor", flat=True)), {self.author.pk}
+        )
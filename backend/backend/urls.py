@@ -16,6 +16,11 @@ urlpatterns = (
             views.ModelMetadataAPIView.as_view(),
             name="get_metadata",
         ),
+        path(
+            "api/get_filter_choices/<str:model_name>/",
+            views.FilterChoicesAPIView.as_view(),
+            name="get_filter_choices",
+        ),
         path(
             "api/get_models/",
             views.ModelEndpointAPIView.as_view(),
@@ -46,6 +51,26 @@ urlpatterns = (
             views.RecentAdminActionsView.as_view(),
             name="recent_admin_actions",
         ),
+        path(
+            "api/search/",
+            views.SearchAPIView.as_view(),
+            name="search",
+        ),
+        path(
+            "api/batch/",
+            views.BatchAPIView.as_view(),
+            name="batch",
+        ),
+        path(
+            "api/export/<str:model_name>/",
+            views.ExportView.as_view(),
+            name="export",
+        ),
+        path(
+            "api/import/<str:model_name>/",
+            views.ImportAPIView.as_view(),
+            name="import",
+        ),
         path(
             "api/subscribe/",
             views.subscribe_to_newsletter,
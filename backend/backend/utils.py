@@ -1,38 +1,24 @@
+import copy
+
 from auditlog.models import LogEntry
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from django.db import models
 from django.apps import apps
+from .audit import build_log_entry, queue_log_entries
+from .choices import get_filter_choices
+from .counts import get_row_counts
 
 
-def get_filter_choices(model, filter_options):
-    filter_choices = {}
-
-    for option in filter_options:
-        field = model._meta.get_field(option)
-        if isinstance(field, models.ForeignKey) or isinstance(
-            field, models.ManyToManyField
-        ):
-            related_model = field.related_model
-            choices_qs = related_model.objects.all()
-            choices = [{"value": c.pk, "display_name": str(c)} for c in choices_qs]
-        else:
-            choices_qs = (
-                model.objects.order_by().values_list(option, flat=True).distinct()
-            )
-            choices = [{"value": c, "display_name": str(c)} for c in choices_qs]
-
-        filter_choices[option] = choices
-
-    return filter_choices
-
-
-def analyze_django_app(models):
+def analyze_django_app(models, refresh=False):
     """
     Analyze a Django app and provide statistics about its models.
 
+    Row counts come from the maintained counts in ``backend.counts``.
+
     Parameters:
-        app_name (str): The name of the Django app to analyze.
+        models (list): The models of the Django app to analyze.
+        refresh (bool): Count every table exactly instead.
 
     Returns:
         dict: A dictionary containing various statistics about the app's models.
@@ -41,19 +27,19 @@ def analyze_django_app(models):
     num_objects = 0
     model_stats = []
 
-    for model in models:
+    for model, count in get_row_counts(models, refresh=refresh).items():
         model_stats.append(
             {
                 "name": model._meta.verbose_name,
                 "icon": model._meta.icon,
                 "related_components": model._meta.related_components,
                 "related_components_count": len(model._meta.related_components),
-                "num_objects": model.objects.count(),
+                "num_objects": count,
                 "visibility": model._meta.visibility,
             }
         )
         num_models += 1
-        num_objects += model.objects.count()
+        num_objects += count
 
     return {
         "num_models": num_models,
@@ -90,48 +76,140 @@ def return_changes(instance, old_instance):
     return change_message_str
 
 
+def take_snapshot(instance):
+    """
+    Record the field values of a loaded instance for ``return_snapshot_changes``.
+
+    Values are read by ``attname`` from the instance as it is, so taking a
+    snapshot never queries; related objects that are already cached are
+    kept so their old names can be logged without loading them again.
+    """
+    values = {}
+    related = {}
+
+    for field in instance._meta.fields:
+        if field.attname not in instance.__dict__:
+            continue
+
+        value = instance.__dict__[field.attname]
+
+        if isinstance(field, models.FileField):
+            value = str(getattr(instance, field.attname))
+        elif isinstance(value, (dict, list)):
+            value = copy.deepcopy(value)
+
+        values[field.attname] = value
+
+        if field.is_relation and field.is_cached(instance):
+            related[field.name] = field.get_cached_value(instance)
+
+    return values, related
+
+
+def get_snapshot_related(field, snapshot):
+    pk = snapshot[0][field.attname]
+
+    if pk is None:
+        return None
+
+    related = snapshot[1].get(field.name)
+
+    if related is not None and str(related.pk) == str(pk):
+        return related
+
+    return field.related_model._base_manager.filter(pk=pk).first()
+
+
+def return_snapshot_changes(instance, snapshot):
+    """
+    Describe how an instance changed since ``take_snapshot``.
+
+    Gives the same message as ``return_changes`` with the instance as it
+    was loaded, without loading it again: raw values are compared, and
+    related objects are only fetched for foreign keys whose id changed.
+    """
+    values = snapshot[0]
+    changes = {}
+
+    for field in instance._meta.fields:
+        if field.attname not in values:
+            continue
+
+        old_value = values[field.attname]
+
+        if field.is_relation:
+            if str(old_value) == str(getattr(instance, field.attname)):
+                continue
+
+            old_value = get_snapshot_related(field, snapshot)
+            new_value = getattr(instance, field.name)
+        else:
+            new_value = getattr(instance, field.attname)
+
+        if str(new_value) != str(old_value):
+            changes[field.name] = [old_value, new_value]
+
+    return return_change_message_str(changes)
+
+
 def create_log_entry(action, username, instance, changes):
-    content_type = ContentType.objects.get_for_model(instance)
-
-    if not changes:
-        changes = ""
-
-    log_entry = LogEntry(
-        content_type=content_type,
-        object_id=instance.pk,
-        object_repr=str(instance),
-        action=action,
-        actor=username,
-        changes=changes,
-        timestamp=timezone.now(),
+    queue_log_entries([build_log_entry(action, username, instance, changes)])
+
+
+def create_log_entries(action, username, instances, changes=None):
+    """
+    Log the same action for many objects with a single INSERT.
+
+    ``changes`` is either one change string for every object or a dict
+    mapping each object's pk to its change string.
+    """
+    timestamp = timezone.now()
+
+    queue_log_entries(
+        [
+            build_log_entry(
+                action,
+                username,
+                instance,
+                changes.get(instance.pk) if isinstance(changes, dict) else changes,
+                timestamp,
+            )
+            for instance in instances
+        ]
     )
-    log_entry.save()
 
 
-def get_serialized_page_data(model_dict, request):
-    data = {}
-    for dto_name, model_options in model_dict.items():
-        many = True
+def serialize_page_section(dto_name, model_options, request):
+    """
+    Query and serialize one ``model_dict`` entry of a composite page.
+    """
+    many = True
 
-        app_label = model_options.get("app_label", {})
-        model_name = model_options.get("model_name", dto_name)
-        print(app_label, model_name)
-        model = apps.get_model(app_label=app_label, model_name=model_name)
+    app_label = model_options.get("app_label", {})
+    model_name = model_options.get("model_name", dto_name)
+    model = apps.get_model(app_label=app_label, model_name=model_name)
+    queryset = model.objects.all()
 
-        if model_options.get("filter", False):
-            queryset = model.objects.filter(**model_options.get("filter", {}))
+    if hasattr(model.serializer_class, "setup_eager_loading"):
+        queryset = model.serializer_class.setup_eager_loading(queryset)
 
-        elif model_options.get("get_first", False):
-            queryset = model.objects.first()
-            many = False
+    if model_options.get("filter", False):
+        queryset = queryset.filter(**model_options.get("filter", {}))
 
-        else:
-            queryset = model.objects.all()
+    elif model_options.get("get_first", False):
+        queryset = queryset.first()
+        many = False
+
+    serializer = model.serializer_class(
+        instance=queryset, many=many, context={"request": request}
+    )
+
+    return serializer.data
 
-        serializer = model.serializer_class(
-            instance=queryset, many=many, context={"request": request}
-        )
 
-        data[dto_name] = serializer.data
+def get_serialized_page_data(model_dict, request):
+    data = {}
+    for dto_name, model_options in model_dict.items():
+        data[dto_name] = serialize_page_section(dto_name, model_options, request)
 
     return data
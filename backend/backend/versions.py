@@ -0,0 +1,157 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.checks import Tags, Warning, register
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+def bump_cache_counter(key):
+    """
+    Increment a counter kept in the cache, starting it at 1.
+
+    ``incr`` fails when the key was evicted between the ``add`` and the
+    ``incr``; the counter then restarts at 1.
+    """
+    cache.add(key, 0, None)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+LOCAL_CACHE_BACKENDS = [
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+]
+
+
+def uses_shared_cache():
+    """
+    Whether every process serving requests sees the same cache: the default
+    cache is not local to a process, or ``CACHE_SINGLE_PROCESS`` says there
+    is only one process.
+
+    Model versions are only reliable in a shared cache, so responses are
+    not cached or validated against them otherwise.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+
+    return backend not in LOCAL_CACHE_BACKENDS or getattr(
+        settings, "CACHE_SINGLE_PROCESS", False
+    )
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warn when the default cache is not shared between processes: each
+    worker would then keep its own model versions, so pages and conditional
+    GETs are not cached.
+    """
+    if uses_shared_cache():
+        return []
+
+    return [
+        Warning(
+            "The default cache is local to each process.",
+            hint=(
+                "Set CACHE_URL, or CACHES, to a cache shared by every worker, "
+                "e.g. Redis; pages and conditional GETs are not cached until then."
+            ),
+            id="backend.W001",
+        )
+    ]
+
+
+def get_version_key(label):
+    return f"model-version:{label}"
+
+
+def bump_model_version(model):
+    """
+    Mark the rows of ``model`` as changed.
+
+    A version is the time of the last change in nanoseconds, so it never
+    repeats across restarts and doubles as a Last-Modified date.
+    """
+    cache.set(get_version_key(model._meta.label), time.time_ns(), None)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_version_on_change(sender, **kwargs):
+    bump_model_version(sender)
+
+
+@receiver(m2m_changed)
+def bump_version_on_m2m_change(sender, instance, action, model, **kwargs):
+    if action.startswith("post_"):
+        bump_model_version(type(instance))
+        bump_model_version(model)
+
+
+def get_model_versions(labels):
+    """
+    Return ``{label: version}`` for model labels with one cache read.
+
+    Models without a stored version get the current time, i.e. they are
+    treated as changed just now.
+    """
+    keys = {label: get_version_key(label) for label in labels}
+    stored = cache.get_many(list(keys.values()))
+    versions = {}
+
+    for label, key in keys.items():
+        if key not in stored:
+            cache.add(key, time.time_ns(), None)
+            stored[key] = cache.get(key)
+
+        versions[label] = stored[key]
+
+    return versions
+
+
+def get_last_modified(versions):
+    """
+    Return the Last-Modified timestamp, in seconds, of a set of versions.
+    """
+    return max(versions.values(), default=0) // 1_000_000_000
+
+
+def get_serializer_models(serializer, seen=None):
+    """
+    Return the models a serializer reads: its own model, the models of its
+    relation fields and, recursively, those of nested serializers.
+    """
+    seen = set() if seen is None else seen
+
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+
+    if model is None or model in seen:
+        return seen
+
+    seen.add(model)
+
+    for field in serializer.fields.values():
+        if isinstance(field, BaseSerializer):
+            get_serializer_models(field, seen)
+            continue
+
+        source = (field.source or "").split(".")[0]
+
+        try:
+            model_field = model._meta.get_field(source)
+        except Exception:
+            continue
+
+        if model_field.is_relation and model_field.related_model is not None:
+            seen.add(model_field.related_model)
+
+    return seen
@@ -4,217 +4,120 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import generics, serializers, status
 from django.apps import apps
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from authorization.models import User
 from authorization.serializers import UserSerializer
 from django.urls import reverse, NoReverseMatch
 from rest_framework.views import APIView
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.http import Http404
 from django.shortcuts import render, get_object_or_404
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
 from auditlog.models import LogEntry
 import json
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 from support.models import Subscribers
 from posts.models import Post, PostTag
+from posts.utils import get_tag_counts
 from .utils import analyze_django_app, get_filter_choices
+from .registry import model_registry, resolve_field_choices
+from .search import get_searchable_models, search_model
+from .choices import FILTER_CHOICES_LIMIT, get_field_choices, get_filter_options
+from .activity import (
+    FEED_CACHE_TIMEOUT,
+    build_activity_feed,
+    get_feed_cache_key,
+    get_feed_queryset,
+)
+from .pagination import KeysetPagination
+from .batch import BatchError, parse_batch, run_batch
+from .export import (
+    EXPORT_FORMATS,
+    ExportError,
+    get_export_columns,
+    get_export_queryset,
+    stream_export,
+)
+from .importers import (
+    DEFAULT_BATCH_SIZE,
+    ImportFormatError,
+    get_import_format,
+    import_records,
+    iter_import_records,
+)
+from django.core.cache import cache
 from django.db import models
 from django.db.models import Q
 
 
-def get_model_metadata(model_name):
-    all_models = apps.get_models(include_auto_created=True)
+def get_model_metadata(model_name, app_label=None):
+    entry = model_registry.get(model_name, app_label)
 
-    model = next(
-        (m for m in all_models if m.__name__.lower() == model_name.lower()), None
-    )
-
-    if model is None:
+    if entry is None or entry["metadata"] is None:
         return {}
 
-    serializer_class = getattr(model, "serializer_class", serializers.ModelSerializer)
-    serializer = serializer_class()
-    fields = serializer.get_fields()
+    model = entry["model"]
+    metadata = {**entry["metadata"], "fields": resolve_field_choices(entry)}
 
     if hasattr(model._meta, "filter_choices"):
-        filter_choices = get_filter_choices(
+        metadata["filter_choices"] = get_filter_choices(
             model,
             model._meta.filter_options
             if hasattr(model._meta, "filter_options")
             else None,
         )
 
-    metadata = {
-        "modelName": model.__name__,
-        "verboseName": model._meta.verbose_name,
-        "verboseNamePlural": model._meta.verbose_name_plural,
-        "appLabel": model._meta.app_label,
-        "primaryKey": model._meta.pk.name,
-        "ordering": model._meta.ordering,
-        "uniqueTogether": model._meta.unique_together,
-        "indexes": model._meta.indexes,
-        "permissions": model._meta.permissions,
-        "abstract": model._meta.abstract,
-        "fields": {},
-        "autoFormLabel": model._meta.autoform_label
-        if hasattr(model._meta, "autoform_label")
-        else None,
-        "longDescription": model._meta.long_description
-        if hasattr(model._meta, "long_description")
-        else None,
-        "shortDescription": model._meta.short_description
-        if hasattr(model._meta, "short_description")
-        else None,
-        "pagesAssociated": model._meta.pages_associated
-        if hasattr(model._meta, "pages_associated")
-        else None,
-        "preview": model._meta.include_preview
-        if hasattr(model._meta, "include_preview")
-        else False,
-        "icon": model._meta.icon if hasattr(model._meta, "icon") else None,
-        "icon_class": model._meta.icon_class
-        if hasattr(model._meta, "icon_class")
-        else None,
-        "slug": model._meta.slug if hasattr(model._meta, "slug") else None,
-        "tags": model._meta.tags if hasattr(model._meta, "tags") else False,
-        "relatedComponents": model._meta.related_components
-        if hasattr(model._meta, "related_components")
-        else None,
-        "visibility": model._meta.visibility
-        if hasattr(model._meta, "visibility")
-        else None,
-        "access_level": model._meta.access_level
-        if hasattr(model._meta, "access_level")
-        else None,
-        "info_dump": model._meta.info_dump
-        if hasattr(model._meta, "info_dump")
-        else None,
-        "filter_options": model._meta.filter_options
-        if hasattr(model._meta, "filter_options")
-        else None,
-        "filter_choices": filter_choices,
-        "allowed": model._meta.allowed if hasattr(model._meta, "allowed") else None,
-        "category": model._meta.category if hasattr(model._meta, "category") else None,
-    }
+    return metadata
 
-    if hasattr(model._meta, "category"):
-        print("yes")
-        print(model._meta.category)
-
-    for field_name, field in fields.items():
-        all_fields_choices = []
-        if (
-            field_name == "data_source"
-            or field_name == "content_type_info"
-            or field_name == "used_on"
-            or field_name == "page_set_data"
-            or field_name == "jobs_data"
-            or field_name == "contact_set_data"
-            or field_name == "author_details"
-            or field_name == "category_details"
-            or field_name == "seo_data_details"
-            or field_name == "element_data"
-            or field_name == "tag_details"
-            or field_name == "list_items"
-            or field_name == "question_sets"
-            or field_name == "question_data"
-            or field_name == "answer_data"
-            or field_name == "completed_date"
-        ):
-            continue
-
-        if isinstance(field, models.ForeignKey):
-            field_type = "ForeignKey"
-        else:
-            field_type = field.__class__.__name__
-
-        if field_type == "CharField" and "base_template" in field.style:
-            field_type = "TextField"
-
-        choices = getattr(field, "choices", None)
-
-        if choices:
-            if field_name == "content":
-                choices_dict = dict(choices)
-
-                for value, display in choices_dict.items():
-                    content_type = ContentType.objects.get_for_id(value)
-                    try:
-                        content_model_name = content_type.model_class().__name__
-                        content_model_category = (
-                            content_type.model_class()._meta.category
-                        )
-
-                        field_choices = {
-                            "value": value,
-                            "display": display,
-                            "model_name": content_model_name,
-                            "category": content_model_category,
-                        }
-                    except:
-                        field_choices = {"value": value, "display": display}
-
-                    all_fields_choices.append(field_choices)
-            else:
-                choices_dict = dict(choices)
-                field_choices = [
-                    {"value": value, "display": display}
-                    for value, display in choices_dict.items()
-                ]
-                all_fields_choices.append(field_choices)
-        else:
-            field_choices = None
-
-        field_metadata = {
-            "type": field_type,
-            "required": field.required,
-            "read_only": field.read_only,
-            "label": field.label,
-            "help_text": field.help_text,
-            "min_length": getattr(field, "min_length", None),
-            "max_length": getattr(field, "max_length", None),
-            "min_value": getattr(field, "min_value", None),
-            "max_value": getattr(field, "max_value", None),
-            "source": getattr(field, "source", None),
-            "choices": all_fields_choices,
-            "verbose_name": getattr(
-                model._meta.get_field(field_name), "verbose_name", None
-            ),
-        }
 
-        metadata["fields"][field_name] = field_metadata
-
-    for field in model._meta.fields:
-        if not field.name == "password" and not field.name == "salt":
-            if hasattr(field, "xs_column_count"):
-                metadata["fields"][field.name]["xs_column_count"] = getattr(
-                    field, "xs_column_count", 12
-                )
-
-            if hasattr(field, "md_column_count"):
-                metadata["fields"][field.name]["md_column_count"] = getattr(
-                    field, "md_column_count", 12
-                )
-
-            if hasattr(field, "justify"):
-                metadata["fields"][field.name]["justify"] = getattr(
-                    field, "justify", "left"
-                )
-
-            if hasattr(field, "markdown"):
-                metadata["fields"][field.name]["markdown"] = getattr(
-                    field, "markdown", "false"
-                )
-            if hasattr(field, "min_rows"):
-                metadata["fields"][field.name]["min_rows"] = getattr(
-                    field, "min_rows", 6
-                )
+class FilterChoicesAPIView(APIView):
+    """
+    Typeahead for one filter option of a model.
 
-    return metadata
+    ``field`` names the option, ``q`` is a prefix to match and ``limit``
+    caps the number of choices returned.
+    """
+
+    def get(self, request, model_name, format=None):
+        entry = model_registry.get(model_name)
+
+        if entry is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+
+        model = entry["model"]
+        option = request.query_params.get("field")
+
+        if option not in get_filter_options(model):
+            return Response(
+                {"field": f"'{option}' is not a filter option of {model_name}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = min(
+                int(request.query_params.get("limit", FILTER_CHOICES_LIMIT)),
+                FILTER_CHOICES_LIMIT,
+            )
+        except ValueError:
+            return Response(
+                {"limit": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            result = get_field_choices(
+                model, option, request.query_params.get("q"), max(limit, 1)
+            )
+        except FieldDoesNotExist:
+            return Response(
+                {"field": f"'{option}' is not a field of {model_name}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response({"field": option, **result})
 
 
 class ModelMetadataAPIView(APIView):
@@ -265,224 +168,61 @@ def custom_admin_url_return(request, content_type_id, object_id):
 
 @method_decorator(csrf_exempt, name="dispatch")
 class RecentAdminActionsView(APIView):
+    """
+    Recent admin actions for the dashboard's activity widget.
+
+    ``items`` limits the number of entries (``all`` for no limit); sending
+    ``cursor`` or ``page_size`` pages through the feed by timestamp instead.
+    Responses are cached until the next LogEntry is written.
+    """
+
+    pagination_class = KeysetPagination
+    pagination_ordering = ("-timestamp", "-pk")
+    paginate = True
+
     def get(self, request, *args, **kwargs):
+        cache_key = get_feed_cache_key(request)
+        cached = cache.get(cache_key)
+
+        if cached is not None:
+            data, headers = cached
+            return Response(data, headers=headers)
+
         items = request.query_params.get("items", 10)
         app = request.query_params.get("app", None)
         model_query = request.query_params.get("model", None)
-        print(model_query)
-        all_models = apps.get_models()
-
-        if items == "all":
-            if app:
-                recent_actions = LogEntry.objects.filter(
-                    content_type__app_label=app
-                ).order_by("-timestamp")
-            elif model_query:
-                if model_query == "messages":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="support"
-                    )
-                elif (
-                    model_query == "questionnaire"
-                    or model_query == "questionset"
-                    or model_query == "question"
-                    or model_query == "answerchoice"
-                ):
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="quizes"
-                    )
-                elif model_query == "teammember":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="contact"
-                    )
-                elif (
-                    model_query == "servicetablelabels"
-                    or model_query == "servicecomparerows"
-                    or model_query == "servicetable"
-                ):
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="tables"
-                    )
-                elif model_query == "header":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="general"
-                    )
-                elif model_query == "contactinformation":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="contact"
-                    )
-                elif model_query == "page":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="pages"
-                    )
-                elif model_query == "faq":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="faqs"
-                    )
-
-                else:
-                    content_type = ContentType.objects.get(model=model_query.lower())
-
-                recent_actions = LogEntry.objects.filter(
-                    content_type=content_type
-                ).order_by("-timestamp")
-            else:
-                recent_actions = LogEntry.objects.order_by("-timestamp")
+
+        try:
+            recent_actions = get_feed_queryset(app, model_query)
+        except ContentType.DoesNotExist:
+            raise Http404(f"Unknown model '{model_query}'")
+
+        paginator = self.pagination_class()
+        page = None
+
+        if paginator.requests_page(request):
+            page = paginator.paginate_queryset(recent_actions, request, view=self)
+
+        if page is not None:
+            response = paginator.get_paginated_response(build_activity_feed(page))
         else:
-            if app:
-                recent_actions = LogEntry.objects.filter(
-                    content_type__app_label=app
-                ).order_by("-timestamp")[: int(items)]
-
-            elif model_query:
-                if model_query == "messages":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="support"
-                    )
-                elif (
-                    model_query == "questionnaire"
-                    or model_query == "questionset"
-                    or model_query == "question"
-                    or model_query == "answerchoice"
-                ):
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="quizes"
-                    )
-                elif model_query == "teammember":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="contact"
-                    )
-                elif (
-                    model_query == "servicetablelabels"
-                    or model_query == "servicecomparerows"
-                    or model_query == "servicetable"
-                ):
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="tables"
-                    )
-                elif model_query == "header":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="general"
-                    )
-                elif model_query == "contactinformation":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="contact"
-                    )
-                elif model_query == "page":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="pages"
-                    )
-                elif model_query == "faq":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="faqs"
-                    )
-                elif model_query == "servicetier":
-                    content_type = ContentType.objects.get(
-                        model=model_query.lower(), app_label="services"
-                    )
-
-                else:
-                    content_type = ContentType.objects.get(model=model_query.lower())
-
-                recent_actions = LogEntry.objects.filter(
-                    content_type=content_type
-                ).order_by("-timestamp")[: int(items)]
-            else:
-                recent_actions = LogEntry.objects.order_by("-timestamp")[: int(items)]
-
-        data = []
-        for action in recent_actions:
-            object_repr = action.object_repr
-            change_message = action.changes
-            app_label = action.content_type.app_label
-            model_name = action.content_type.model
-            change_message_str = ""
-
-            try:
-                model_class = apps.get_model(app_label=app_label, model_name=model_name)
-                model_verbose_name = model_class._meta.verbose_name.title()
-            except:
-                model_verbose_name = "Not Found"
-
-            if action.action == LogEntry.Action.CREATE:
-                object_repr = f"Added {object_repr}"
-                change_message_str = object_repr
-                try:
-                    obj = action.content_type.get_object_for_this_type(
-                        pk=action.object_pk
-                    )
-
-                    if model_name == "messages" or model_name == "application":
-                        obj_url = f"/admin/{model_name}/read/{obj.pk}/"
-                    else:
-                        obj_url = f"/admin/{model_name}/control/{obj.pk}/"
-                except:
-                    try:
-                        obj = action.content_type.get_object_for_this_type(
-                            pk=action.object_id
-                        )
-
-                        if model_name == "messages" or model_name == "application":
-                            obj_url = f"/admin/{model_name}/read/{obj.pk}/"
-                        else:
-                            obj_url = f"/admin/{model_name}/control/{obj.pk}/"
-                    except:
-                        obj_url = "Object not found"
-
-            elif action.action == LogEntry.Action.UPDATE:
-                object_repr = f"Changed {object_repr}"
-                change_message_str = change_message
-
-                try:
-                    obj = action.content_type.get_object_for_this_type(
-                        pk=action.object_pk
-                    )
-
-                    if model_name == "messages" or model_name == "application":
-                        obj_url = f"/admin/{model_name}/read/{obj.pk}/"
-                    else:
-                        obj_url = f"/admin/{model_name}/control/{obj.pk}/"
-                except:
-                    try:
-                        obj = action.content_type.get_object_for_this_type(
-                            pk=action.object_id
-                        )
-
-                        if model_name == "messages" or model_name == "application":
-                            obj_url = f"/admin/{model_name}/read/{obj.pk}/"
-                        else:
-                            obj_url = f"/admin/{model_name}/control/{obj.pk}/"
-                    except:
-                        obj_url = "Failed"
-
-            elif action.action == LogEntry.Action.DELETE:
-                object_repr = f"Deleted {object_repr}"
-                change_message_str = object_repr
-                obj_url = "Not Applicable"
-
-            data.append(
-                {
-                    "user": str(action.actor),
-                    "action_time": action.timestamp,
-                    "action_flag": action.get_action_display().capitalize(),
-                    "content_type": str(action.content_type),
-                    "app_label": app_label.capitalize(),
-                    "model_name": model_verbose_name,
-                    "object_id": str(action.object_pk),
-                    "object_repr": object_repr,
-                    "change_message": change_message_str,
-                    "obj_url": obj_url,
-                }
-            )
+            if items != "all":
+                recent_actions = recent_actions[: int(items)]
 
-        return Response(data)
+            response = Response(build_activity_feed(recent_actions))
 
-    dispatch = method_decorator(cache_page(60 * 5))(APIView.dispatch)
+        headers = {
+            key: value
+            for key, value in response.items()
+            if key.lower().startswith("x-") or key.lower() == "link"
+        }
+        cache.set(cache_key, (response.data, headers), FEED_CACHE_TIMEOUT)
+
+        return response
 
 
 class ModelEndpointAPIView(APIView):
     def get(self, request, format=None):
-        models = apps.get_models(include_auto_created=False)
         app_configs = {
             app_config.label: app_config for app_config in apps.get_app_configs()
         }
@@ -520,194 +260,42 @@ class ModelEndpointAPIView(APIView):
                 }
                 endpoints["models"][app_label] = []
 
-        for model in models:
-            app_name = model._meta.app_label
-            model_name = model.__name__.lower()
-            serializer_class = getattr(model, "serializer_class", None)
-            if serializer_class is None:
+        for entry in model_registry.all():
+            if entry["endpoint"] is None:
                 continue
 
-            serializer = serializer_class()
-            fields = serializer.get_fields()
-            metadata = {}
-
-            for field_name, field in fields.items():
-                if not field_name == "id":
-                    metadata[field_name] = {"type": field.__class__.__name__}
-
-                    try:
-                        if model._meta.get_field(field_name).verbose_name:
-                            metadata[field_name][
-                                "verbose_name"
-                            ] = model._meta.get_field(field_name).verbose_name
-                    except:
-                        metadata[field_name]["verbose_name"] = None
-
-            if "alignment" in metadata:
-                metadata["alignment"]["choices"] = dict(model.ALIGNMENT_CHOICES)
-
-            try:
-                url = reverse(f"{model_name}-list")
-                url = url.replace("/api/", "/")
-            except NoReverseMatch:
-                url = None
-
-            endpoint = {
-                "model_name": model_name,
-                "verbose_name": model._meta.verbose_name,
-                "verbose_name_plural": model._meta.verbose_name_plural,
-                "url": url,
-                "metadata": metadata,
-                "keys": serializer.FIELD_KEYS,
-                "autoFormLabel": model._meta.autoform_label
-                if hasattr(model._meta, "autoform_label")
-                else None,
-                "longDescription": model._meta.long_description
-                if hasattr(model._meta, "long_description")
-                else None,
-                "shortDescription": model._meta.short_description
-                if hasattr(model._meta, "short_description")
-                else None,
-                "pagesAssociated": model._meta.pages_associated
-                if hasattr(model._meta, "pages_associated")
-                else None,
-                "preview": model._meta.include_preview
-                if hasattr(model._meta, "include_preview")
-                else False,
-                "icon": model._meta.icon if hasattr(model._meta, "icon") else None,
-                "icon_class": model._meta.icon_class
-                if hasattr(model._meta, "icon_class")
-                else None,
-                "slug": model._meta.slug if hasattr(model._meta, "slug") else None,
-                "tags": model._meta.tags if hasattr(model._meta, "tags") else False,
-                "relatedComponents": model._meta.related_components
-                if hasattr(model._meta, "related_components")
-                else None,
-                "visibility": model._meta.visibility
-                if hasattr(model._meta, "visibility")
-                else None,
-                "access_level": model._meta.access_level
-                if hasattr(model._meta, "access_level")
-                else None,
-                "info_dump": model._meta.info_dump
-                if hasattr(model._meta, "info_dump")
-                else None,
-            }
-
-            if hasattr(serializer, "SEARCH_KEYS"):
-                endpoint["search_keys"] = serializer.SEARCH_KEYS
-
-            endpoints["models"][app_name].append(endpoint)
+            endpoints["models"][entry["app_label"]].append(entry["endpoint"])
 
         return Response(endpoints)
 
 
 class SingleModelAPIView(APIView):
     def get(self, request, model_name=None, format=None):
-        models = apps.get_models(include_auto_created=True)
-        model = None
-
-        for m in models:
-            if m.__name__.lower() == model_name:
-                model = m
-                break
+        entry = model_registry.get(model_name)
 
-        if model is None:
+        if entry is None or entry["model"]._meta.auto_created:
             raise Http404("Model not found")
 
-        serializer_class = getattr(model, "serializer_class", None)
-
-        if serializer_class is None:
+        if entry["endpoint"] is None:
             raise Http404("Serializer class not found")
 
-        serializer = serializer_class()
-        fields = serializer.get_fields()
-        metadata = {}
-
-        for field_name, field in fields.items():
-            if not field_name == "id":
-                metadata[field_name] = {"type": field.__class__.__name__}
-
-                try:
-                    if model._meta.get_field(field_name).verbose_name:
-                        metadata[field_name]["verbose_name"] = model._meta.get_field(
-                            field_name
-                        ).verbose_name
-                except:
-                    print(field_name)
-                    if field_name == "used_on":
-                        metadata[field_name]["verbose_name"] = "Used On"
-                    else:
-                        metadata[field_name]["verbose_name"] = "Default"
-        try:
-            url = reverse(f"{model_name}-list")
-            url = url.replace("/api/", "/")
-        except NoReverseMatch:
-            url = None
+        model = entry["model"]
+        metadata = {**entry["endpoint"]["metadata"]}
 
-        if "alignment" in metadata:
-            metadata["alignment"]["choices"] = dict(model.ALIGNMENT_CHOICES)
+        for field_name in entry["unresolved"]:
+            metadata[field_name] = {
+                **metadata[field_name],
+                "verbose_name": "Used On" if field_name == "used_on" else "Default",
+            }
 
         endpoint = {
             "app_name": model._meta.app_label,
-            "model_name": model_name,
-            "verbose_name": model._meta.verbose_name,
-            "verbose_name_plural": model._meta.verbose_name_plural,
-            "url": url,
+            **entry["endpoint"],
             "metadata": metadata,
-            "keys": serializer.FIELD_KEYS,
-            "autoFormLabel": model._meta.autoform_label
-            if hasattr(model._meta, "autoform_label")
-            else None,
-            "longDescription": model._meta.long_description
-            if hasattr(model._meta, "long_description")
-            else None,
-            "shortDescription": model._meta.short_description
-            if hasattr(model._meta, "short_description")
-            else None,
-            "pagesAssociated": model._meta.pages_associated
-            if hasattr(model._meta, "pages_associated")
-            else None,
-            "preview": model._meta.include_preview
-            if hasattr(model._meta, "include_preview")
-            else False,
-            "icon": model._meta.icon if hasattr(model._meta, "icon") else None,
-            "icon_class": model._meta.icon_class
-            if hasattr(model._meta, "icon_class")
-            else None,
-            "slug": model._meta.slug if hasattr(model._meta, "slug") else None,
-            "tags": model._meta.tags if hasattr(model._meta, "tags") else False,
-            "relatedComponents": model._meta.related_components
-            if hasattr(model._meta, "related_components")
-            else None,
-            "visibility": model._meta.visibility
-            if hasattr(model._meta, "visibility")
-            else None,
-            "access_level": model._meta.access_level
-            if hasattr(model._meta, "access_level")
-            else None,
-            "info_dump": model._meta.info_dump
-            if hasattr(model._meta, "info_dump")
-            else None,
         }
 
-        if hasattr(serializer, "SEARCH_KEYS"):
-            endpoint["search_keys"] = serializer.SEARCH_KEYS
-
         if model_name == "tags":
-            tag_counts = {}
-            posts = Post.objects.all()
-            all_tags = PostTag.objects.all()
-
-            for tag in all_tags:
-                tag_counts[tag.detail] = 0
-
-            for post in posts:
-                for tag in post.tags.all():
-                    if tag.detail not in tag_counts:
-                        tag_counts[tag.detail] = 1
-                    else:
-                        tag_counts[tag.detail] += 1
+            tag_counts = get_tag_counts()
 
             endpoint["count"] = {
                 "type": "integer",
@@ -719,9 +307,13 @@ class SingleModelAPIView(APIView):
 
 
 class SingleAppEndpointAPIView(APIView):
+    """
+    Models and overview statistics of one app; ``?refresh=true`` recounts
+    the tables exactly.
+    """
+
     def get(self, request, app_name=None, format=None):
         app_config = apps.get_app_config(app_name)
-        models = app_config.get_models()
 
         endpoints = {
             "models": {},
@@ -735,85 +327,24 @@ class SingleAppEndpointAPIView(APIView):
                 "visibility": app_config.visibility
                 if hasattr(app_config, "visibility")
                 else None,
-                "app_info": analyze_django_app(app_config.get_models()),
+                "app_info": analyze_django_app(
+                    app_config.get_models(),
+                    refresh=request.query_params.get("refresh") == "true",
+                ),
             }
 
-        for model in models:
-            model_name = model.__name__.lower()
-            endpoints["models"][model_name] = []
-            serializer_class = getattr(model, "serializer_class", None)
-            if serializer_class is None:
-                print(model)
-                continue
-
-            serializer = serializer_class()
-            fields = serializer.get_fields()
-            metadata = {}
-
-            for field_name, field in fields.items():
-                if not field_name == "id":
-                    metadata[field_name] = {"type": field.__class__.__name__}
-
-                    try:
-                        if model._meta.get_field(field_name).verbose_name:
-                            metadata[field_name][
-                                "verbose_name"
-                            ] = model._meta.get_field(field_name).verbose_name
-                    except:
-                        metadata[field_name]["verbose_name"] = None
-
-            if "alignment" in metadata:
-                metadata["alignment"]["choices"] = dict(model.ALIGNMENT_CHOICES)
+        for entry in model_registry.for_app(app_config.label):
+            endpoints["models"][entry["model_name"]] = []
 
-            try:
-                url = reverse(f"{model_name}-list")
-                url = url.replace("/api/", "/")
-            except NoReverseMatch:
-                url = None
+            if entry["endpoint"] is None:
+                continue
 
             endpoint = {
-                "model_name": model_name,
-                "verbose_name": model._meta.verbose_name,
-                "verbose_name_plural": model._meta.verbose_name_plural,
-                "url": url,
-                "metadata": metadata,
-                "keys": serializer.FIELD_KEYS,
-                "autoFormLabel": model._meta.autoform_label
-                if hasattr(model._meta, "autoform_label")
-                else None,
-                "longDescription": model._meta.long_description
-                if hasattr(model._meta, "long_description")
-                else None,
-                "shortDescription": model._meta.short_description
-                if hasattr(model._meta, "short_description")
-                else None,
-                "pagesAssociated": model._meta.pages_associated
-                if hasattr(model._meta, "pages_associated")
-                else None,
-                "preview": model._meta.include_preview
-                if hasattr(model._meta, "include_preview")
-                else False,
-                "icon": model._meta.icon if hasattr(model._meta, "icon") else None,
-                "icon_class": model._meta.icon_class
-                if hasattr(model._meta, "icon_class")
-                else None,
-                "slug": model._meta.slug if hasattr(model._meta, "slug") else None,
-                "tags": model._meta.tags if hasattr(model._meta, "tags") else False,
-                "relatedComponents": model._meta.related_components
-                if hasattr(model._meta, "related_components")
-                else None,
-                "visibility": model._meta.visibility
-                if hasattr(model._meta, "visibility")
-                else None,
-                "access_level": model._meta.access_level
-                if hasattr(model._meta, "access_level")
-                else None,
+                key: value
+                for key, value in entry["endpoint"].items()
+                if key != "info_dump"
             }
-
-            if hasattr(serializer, "SEARCH_KEYS"):
-                endpoint["search_keys"] = serializer.SEARCH_KEYS
-
-            endpoints["models"][model_name].append(endpoint)
+            endpoints["models"][entry["model_name"]].append(endpoint)
 
         return Response(endpoints)
 
@@ -830,11 +361,248 @@ class ContentTypeEndpointAPIView(APIView):
             raise Http404("Model not found")
 
         model_name = model.__name__.lower()
-        metadata = get_model_metadata(model_name)
+        metadata = get_model_metadata(model_name, content_type.app_label)
 
         return Response(metadata)
 
 
+class SearchAPIView(APIView):
+    """
+    Full-text search over the models whose serializer declares SEARCH_KEYS.
+
+    ``q`` is required; ``model`` limits the search to one model. Each model's
+    matches are ranked and paged separately with ``page`` and ``page_size``.
+    """
+
+    default_page_size = 10
+    max_page_size = 50
+
+    def get(self, request, format=None):
+        query = request.query_params.get("q", "").strip()
+
+        if not query:
+            return Response(
+                {"q": "This parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            page = max(int(request.query_params.get("page", 1)), 1)
+            page_size = int(
+                request.query_params.get("page_size", self.default_page_size)
+            )
+        except ValueError:
+            return Response(
+                {"page": "page and page_size must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        page_size = min(max(page_size, 1), self.max_page_size)
+        models = get_searchable_models()
+        model_name = request.query_params.get("model")
+
+        if model_name:
+            models = [m for m in models if m.__name__.lower() == model_name.lower()]
+
+            if not models:
+                raise Http404(f"'{model_name}' is not searchable")
+
+        results = {}
+
+        for model in models:
+            count, objects = search_model(
+                model, query, offset=(page - 1) * page_size, limit=page_size
+            )
+            serializer = model.serializer_class(
+                objects, many=True, context={"request": request}
+            )
+            results[model.__name__.lower()] = {
+                "verbose_name": model._meta.verbose_name,
+                "count": count,
+                "page": page,
+                "page_size": page_size,
+                "results": serializer.data,
+            }
+
+        return Response({"query": query, "results": results})
+
+
+class BatchAPIView(APIView):
+    """
+    Run several API requests in one round trip.
+
+    The body is ``{"requests": [...], "parallel": false}``; each sub-request
+    has a ``path`` and optional ``method``, ``params``, ``body`` and ``id``.
+    Sub-requests are resolved and run in-process, reusing the batch
+    request's authentication, and their results are returned in order.
+    """
+
+    def post(self, request, format=None):
+        data = request.data
+
+        if isinstance(data, list):
+            data = {"requests": data}
+
+        try:
+            sub_requests = parse_batch(data.get("requests"))
+        except BatchError as error:
+            return Response(
+                {"requests": str(error)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = run_batch(
+            request._request,
+            sub_requests,
+            type(self),
+            parallel=bool(data.get("parallel")),
+        )
+
+        return Response({"responses": results})
+
+
+def is_staff_request(request):
+    user = getattr(request, "username", None)
+
+    try:
+        return bool(user) and user.is_staff
+    except User.DoesNotExist:
+        return False
+
+
+class ExportView(View):
+    """
+    Stream every row of a model as CSV or NDJSON to staff users.
+
+    ``format`` picks the output (``csv`` by default), ``fields`` the
+    columns, either ``field_keys`` or a comma-separated list of the fields
+    the model's serializer reads, and the model's filter options narrow the
+    rows as they do in the admin lists.
+    """
+
+    content_types = {
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+    }
+
+    def get(self, request, model_name):
+        if not is_staff_request(request):
+            return JsonResponse(
+                {"detail": "Exports are only available to staff users."},
+                status=403,
+            )
+
+        entry = model_registry.get(model_name)
+
+        if entry is None:
+            return JsonResponse(
+                {"detail": f"'{model_name}' is not a model."}, status=404
+            )
+
+        format = request.GET.get("format", "csv")
+
+        if format not in EXPORT_FORMATS:
+            return JsonResponse(
+                {"format": f"Must be one of {', '.join(EXPORT_FORMATS)}."},
+                status=400,
+            )
+
+        model = entry["model"]
+
+        try:
+            columns = get_export_columns(model, request.GET.get("fields"))
+        except ExportError as error:
+            return JsonResponse({"fields": str(error)}, status=400)
+
+        queryset = get_export_queryset(model, request.GET, columns)
+        response = StreamingHttpResponse(
+            stream_export(queryset, columns, format),
+            content_type=self.content_types[format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{entry["model_name"]}.{format}"'
+        )
+
+        return response
+
+
+class ImportAPIView(APIView):
+    """
+    Stream a CSV or NDJSON upload into a model's table.
+
+    The file is the request body, or the ``file`` field of a multipart
+    upload, and is parsed incrementally. Rows are validated with the
+    model's serializer and written ``batch_size`` at a time; rows with an
+    ``id`` update that object. Each batch is committed on its own, so the
+    response reports the rows written and the errors by line.
+    """
+
+    def get_batch_size(self, request):
+        try:
+            batch_size = request.query_params.get("batch_size", DEFAULT_BATCH_SIZE)
+            return max(1, int(batch_size))
+        except ValueError:
+            return DEFAULT_BATCH_SIZE
+
+    def post(self, request, model_name):
+        entry = model_registry.get(model_name)
+
+        if entry is None:
+            return Response(
+                {"detail": f"'{model_name}' is not a model."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if entry["serializer_class"] is None:
+            return Response(
+                {"detail": f"'{model_name}' cannot be imported."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if request.content_type.startswith("multipart/form-data"):
+            stream = request.FILES.get("file")
+            file_name = getattr(stream, "name", "")
+        else:
+            stream = request.stream
+            file_name = ""
+
+        if stream is None:
+            return Response(
+                {"detail": "Request body is empty"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        records = iter_import_records(
+            stream, get_import_format(request.content_type, file_name)
+        )
+        result = {"rows": 0, "created": 0, "updated": 0, "failed": 0, "errors": []}
+
+        try:
+            result = import_records(
+                entry["model"],
+                records,
+                entry["serializer_class"],
+                getattr(request, "username", None),
+                self.get_batch_size(request),
+                {"request": request},
+                progress=lambda current, errors: result.update(current),
+            )
+        except (ImportFormatError, UnicodeDecodeError) as exc:
+            return Response(
+                {**result, "detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        written = result["created"] + result["updated"]
+
+        return Response(
+            result,
+            status=(
+                status.HTTP_400_BAD_REQUEST
+                if result["failed"] and not written
+                else status.HTTP_200_OK
+            ),
+        )
+
+
 @api_view(["GET"])
 def component_preview_data(request):
     if request.method == "GET":
@@ -843,10 +611,12 @@ def component_preview_data(request):
             content_type = ContentType.objects.get(id=model_id)
             model_class = content_type.model_class()
         else:
-            for model in apps.get_models():
-                if model.__name__ == model_id:
-                    model_class = model
-                    break
+            entry = model_registry.get(model_id)
+
+            if entry is None:
+                raise Http404("Model not found")
+
+            model_class = entry["model"]
 
         query_params = {}
         for key, value in request.query_params.items():
@@ -2,12 +2,13 @@ from .models import *
 from .serializers import *
 from backend.custom_views import *
 
-from backend.utils import get_serialized_page_data
+from backend.page_cache import aget_cached_page_response
+from django.views import View
 from django.shortcuts import get_object_or_404
 
 
-class ContactFullView(generics.GenericAPIView):
-    def get(self, request, *args, **kwargs):
+class ContactFullView(View):
+    async def get(self, request, *args, **kwargs):
         model_dict = {
             "contactInfo": {
                 "app_label": "contact",
@@ -35,8 +36,7 @@ class ContactFullView(generics.GenericAPIView):
             },
         }
 
-        data = get_serialized_page_data(model_dict, request)
-        return Response(data)
+        return await aget_cached_page_response("contact", model_dict, request)
 
 
 class ContactInformationAPIView(BaseListView):
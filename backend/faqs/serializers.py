@@ -4,6 +4,7 @@ from .models import *
 
 class FAQQuestionSerializer(serializers.ModelSerializer):
     FIELD_KEYS = ["name"]
+    SEARCH_KEYS = ["name", "question"]
 
     class Meta:
         model = FAQQuestion
@@ -12,6 +13,7 @@ class FAQQuestionSerializer(serializers.ModelSerializer):
 
 class FAQAnswerSerializer(serializers.ModelSerializer):
     FIELD_KEYS = ["name"]
+    SEARCH_KEYS = ["name", "answer"]
 
     class Meta:
         model = FAQAnswer
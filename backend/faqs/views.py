@@ -102,7 +102,7 @@ class FAQBuilder(generics.CreateAPIView):
     def post(self, request, *args, **kwargs):
         data = request.data.copy()
         faq_items_data = data.pop("faqItems")
-        author = User.objects.get(username=request.username)
+        author = request.username
         data["author"] = author
         faq = FAQSet.objects.create(**data)
 
@@ -139,4 +139,5 @@ APPLICAITON_METADATA = {
         "status",
     ],
     "allowed": False,
+    "paginate": True,
 }
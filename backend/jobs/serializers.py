@@ -33,6 +33,15 @@ class JobPostingSerializer(serializers.ModelSerializer):
         "type",
         "filled",
     ]
+    SEARCH_KEYS = [
+        "position",
+        "location",
+        "type",
+        "tagline",
+        "who_we_are",
+        "looking_for",
+        "why_apply",
+    ]
 
     class Meta:
         model = JobPosting
@@ -119,6 +128,7 @@ class ApplicationSerializer(serializers.ModelSerializer):
         "status",
         "job",
     ]
+    SEARCH_KEYS = ["last_name", "first_name", "email", "city"]
 
     class Meta:
         model = Application
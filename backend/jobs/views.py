@@ -5,7 +5,7 @@ from rest_framework.response import Response
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from auditlog.models import LogEntry
-from backend.utils import create_log_entry, return_changes
+from backend.utils import create_log_entry, return_snapshot_changes, take_snapshot
 from backend.custom_views import *
 
 
@@ -75,7 +75,7 @@ class JobPostingDetailView(BaseDetailView):
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
-        old_instance = JobPosting.objects.get(pk=instance.pk)
+        snapshot = take_snapshot(instance)
         formatted_data = self.serializer_class().format_data(request.data)
         requirements_list = formatted_data.get("requirements", [])
         responsibilities_list = formatted_data.get("responsibilities", [])
@@ -115,7 +115,7 @@ class JobPostingDetailView(BaseDetailView):
         instance.responsibilities.set(responsibility_objs)
         serializer = self.get_serializer(instance)
 
-        changes = return_changes(instance, old_instance)
+        changes = return_snapshot_changes(instance, snapshot)
         create_log_entry(
             LogEntry.Action.UPDATE,
             request.username if request.username else None,
@@ -195,7 +195,7 @@ class ApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
-        old_instance = Application.objects.get(pk=instance.pk)
+        snapshot = take_snapshot(instance)
         resume = request.FILES.get("resume")
 
         if resume is None:
@@ -210,7 +210,7 @@ class ApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
 
-        changes = return_changes(instance, old_instance)
+        changes = return_snapshot_changes(instance, snapshot)
         create_log_entry(
             LogEntry.Action.UPDATE,
             request.username if request.username else None,
@@ -180,6 +180,10 @@ class LatestPosts(models.Model):
         verbose_name_plural = "Latest News"
 
 
+# Bulk writes save it one object at a time, so the receivers below run.
+SectionHeader.save_hooks = True
+
+
 @receiver(pre_save, sender=SectionHeader)
 def lowercase_name(sender, instance, **kwargs):
     instance.name = instance.name.lower()
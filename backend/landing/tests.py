@@ -1,3 +1,60 @@
+import datetime
+
+import jwt
+from authorization.models import User
+from backend.references import resolve_references
+from django.conf import settings
 from django.test import TestCase
+from posts.models import Post
+from .models import LatestPosts, SectionHeader
+
+
+class LatestPostsWriteTests(TestCase):
+    def setUp(self):
+        author = User.objects.create(username="author", email="a@example.com")
+        token = jwt.encode(
+            {
+                "user": "author",
+                "exp": datetime.datetime.utcnow() + datetime.timedelta(days=1),
+            },
+            settings.SECRET_KEY,
+            algorithm="HS256",
+        )
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        self.plain, self.highlighted = [
+            Post.objects.create(
+                title=f"Post {i}", content="...", author=author, is_highlighted=bool(i)
+            )
+            for i in range(2)
+        ]
+        self.header = SectionHeader.objects.create(name="news")
+        self.latest = LatestPosts.objects.create(name="latest", title_block=self.header)
+
+    def test_references_ignore_the_default_manager(self):
+        fk_objects, m2m_objects = resolve_references(
+            LatestPosts,
+            {
+                "title_block": self.header.pk,
+                "latest_posts[0][id]": self.plain.pk,
+                "latest_posts[1][id]": self.highlighted.pk,
+            },
+        )
+
+        self.assertEqual(fk_objects, {"title_block": self.header})
+        self.assertEqual(
+            m2m_objects, {"latest_posts": [self.plain, self.highlighted]}
+        )
+
+    def test_update_accepts_posts_that_are_not_highlighted(self):
+        response = self.client.put(
+            f"/api/latestposts/{self.latest.pk}/",
+            {"name": "renamed", "latest_posts[0][id]": self.plain.pk},
+            content_type="application/json",
+            **self.auth,
+        )
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(Post.objects.filter(latest_posts_highlighted_objects=self.latest)),
+            [self.plain],
+        )
@@ -2,12 +2,13 @@ from rest_framework import generics, mixins
 from rest_framework.response import Response
 from .models import *
 from .serializers import *
-from backend.utils import get_serialized_page_data
+from backend.page_cache import aget_cached_page_response
+from django.views import View
 from backend.custom_views import *
 
 
-class LandingFullTestView(generics.GenericAPIView):
-    def get(self, request, *args, **kwargs):
+class LandingFullTestView(View):
+    async def get(self, request, *args, **kwargs):
         model_dict = {
             "hero": {
                 "app_label": "landing",
@@ -49,9 +50,7 @@ class LandingFullTestView(generics.GenericAPIView):
             },
         }
 
-        data = get_serialized_page_data(model_dict, request)
-
-        return Response(data)
+        return await aget_cached_page_response("landing", model_dict, request)
 
 
 class HeroHeaderMainAPIView(
@@ -3,6 +3,8 @@ from django import forms
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from .models import *
+from backend.versions import bump_model_version
+from .utils import get_tag_post_counts
 from django.contrib.admin import AdminSite
 
 admin_site = AdminSite(name="admin")
@@ -88,11 +90,13 @@ class PostAdmin(admin.ModelAdmin):
 
     def make_highlighted(self, request, queryset):
         queryset.update(is_highlighted=True)
+        bump_model_version(Post)
 
     make_highlighted.short_description = "Mark selected posts as highlighted"
 
     def make_unhighlighted(self, request, queryset):
         queryset.update(is_highlighted=False)
+        bump_model_version(Post)
 
     make_unhighlighted.short_description = "Mark selected posts as not highlighted"
 
@@ -103,5 +107,15 @@ class PostAdmin(admin.ModelAdmin):
         obj.save()
 
 
+class PostTagAdmin(admin.ModelAdmin):
+    list_display = ("detail", "post_count")
+    search_fields = ("detail",)
+
+    def post_count(self, obj):
+        return get_tag_post_counts().get(obj.pk, 0)
+
+    post_count.short_description = "Post Count"
+
+
 admin.site.register(Post)
-admin.site.register(PostTag)
+admin.site.register(PostTag, PostTagAdmin)
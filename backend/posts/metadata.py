@@ -80,4 +80,5 @@ POST_METADATA = {
         "is_highlighted",
     ],
     "allowed": False,
+    "paginate": True,
 }
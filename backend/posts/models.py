@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from authorization.models import User
 from backend.customs import *
 from .metadata import *
@@ -22,7 +24,9 @@ class PostTag(models.Model):
         return self.detail
 
     def post_count(self):
-        return self.post_set.count()
+        from .utils import get_tag_post_counts
+
+        return get_tag_post_counts().get(self.pk, 0)
 
     post_count.short_description = "Post Count"
 
@@ -62,3 +66,18 @@ class Post(models.Model):
     class Meta:
         verbose_name = "Post"
         verbose_name_plural = "Posts"
+
+
+# Bulk writes save it one object at a time, so the receivers below run.
+PostTag.save_hooks = True
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=PostTag)
+@receiver(post_delete, sender=PostTag)
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_statistics(sender, **kwargs):
+    from .utils import invalidate_tag_statistics
+
+    if kwargs.get("action", "post_").startswith("post_"):
+        invalidate_tag_statistics()
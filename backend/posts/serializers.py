@@ -1,3 +1,5 @@
+from collections import defaultdict
+from django.db import models
 from rest_framework import serializers
 from .models import *
 from authorization.models import User
@@ -33,6 +35,14 @@ class RelatedArticleSerializer(serializers.ModelSerializer):
         ]
 
 
+class PostListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        posts = list(data.all() if isinstance(data, models.Manager) else data)
+        self.child.prepare(posts)
+
+        return super().to_representation(posts)
+
+
 class PostSerializer(serializers.ModelSerializer):
     author = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
     author_details = UserSerializer(source="author", read_only=True)
@@ -47,9 +57,11 @@ class PostSerializer(serializers.ModelSerializer):
         "author",
         "image",
     ]
+    SEARCH_KEYS = ["title", "content"]
 
     class Meta:
         model = Post
+        list_serializer_class = PostListSerializer
         fields = [
             "id",
             "title",
@@ -65,22 +77,75 @@ class PostSerializer(serializers.ModelSerializer):
             "tags_options",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("author").prefetch_related("tags")
+
+    def prepare(self, posts):
+        """
+        Compute the related posts and tag options for a batch of posts at once.
+        Fields dropped from the serializer, e.g. by ``?fields=``, are skipped.
+        """
+
+        if "tags_options" in self.fields:
+            self._tags_options = list(PostTag.objects.values())
+
+        if "related_posts" in self.fields:
+            self._related_posts = self.build_related_posts(posts)
+
+    def build_related_posts(self, posts):
+        tag_ids = {post.id: {tag.id for tag in post.tags.all()} for post in posts}
+        all_tag_ids = set().union(*tag_ids.values())
+
+        if not all_tag_ids:
+            return {post.id: [] for post in posts}
+
+        post_ids_by_tag = defaultdict(set)
+        links = Post.tags.through.objects.filter(posttag_id__in=all_tag_ids)
+
+        for post_id, tag_id in links.values_list("post_id", "posttag_id"):
+            post_ids_by_tag[tag_id].add(post_id)
+
+        related_ids = set().union(*post_ids_by_tag.values())
+        related_posts = self.setup_eager_loading(Post.objects.filter(id__in=related_ids))
+        serialized = {
+            post.id: RelatedArticleSerializer(
+                post,
+                context={"request": self.context.get("request")},
+            ).data
+            for post in related_posts
+        }
+
+        related = {}
+
+        for post in posts:
+            ids = set()
+
+            for tag_id in tag_ids[post.id]:
+                ids |= post_ids_by_tag[tag_id]
+
+            ids.discard(post.id)
+            related[post.id] = [
+                serialized[related_id]
+                for related_id in sorted(ids)
+                if related_id in serialized
+            ]
+
+        return related
+
     def get_related_posts(self, obj):
-        related_posts = Post.objects.filter(tags__in=obj.tags.all()).exclude(id=obj.id)
+        related_posts = getattr(self, "_related_posts", {})
+
+        if obj.id not in related_posts:
+            return self.build_related_posts([obj])[obj.id]
 
-        return RelatedArticleSerializer(
-            related_posts,
-            many=True,
-            context={"request": self.context["request"]},
-        ).data
+        return related_posts[obj.id]
 
     def get_tags_options(self, obj):
-        return list(PostTag.objects.values())
+        if not hasattr(self, "_tags_options"):
+            self._tags_options = list(PostTag.objects.values())
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation["author_details"] = UserSerializer(instance.author).data
-        return representation
+        return self._tags_options
 
     def format_data(self, data):
         formatted_data = {
@@ -1,3 +1,113 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from authorization.models import User
+from .models import Post, PostTag
+from .serializers import PostSerializer
+from .utils import get_tag_counts, get_tag_post_counts, get_tag_statistics
 
-# Create your tests here.
+
+class PostSerializerQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username="author",
+            email="author@example.com",
+            password="password",
+        )
+        cls.tags = [PostTag.objects.create(detail=f"Tag {i}") for i in range(3)]
+
+    def create_posts(self, count):
+        for i in range(count):
+            post = Post.objects.create(
+                title=f"Post {i}",
+                content="Content",
+                author=self.author,
+            )
+            post.tags.set([self.tags[i % len(self.tags)]])
+
+    def serialize_posts(self):
+        request = APIRequestFactory().get("/api/post/")
+        queryset = PostSerializer.setup_eager_loading(Post.objects.order_by("id"))
+
+        return PostSerializer(queryset, many=True, context={"request": request}).data
+
+    def test_list_query_count_does_not_grow_with_posts(self):
+        self.create_posts(5)
+
+        with CaptureQueriesContext(connection) as small:
+            self.serialize_posts()
+
+        self.create_posts(25)
+
+        with CaptureQueriesContext(connection) as large:
+            data = self.serialize_posts()
+
+        self.assertEqual(len(data), 30)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertLessEqual(len(large.captured_queries), 6)
+
+    def test_related_posts_share_a_tag(self):
+        self.create_posts(6)
+        data = self.serialize_posts()
+
+        for post in data:
+            tag_ids = {tag["id"] for tag in post["tags"]}
+            related_ids = [related["id"] for related in post["related_posts"]]
+
+            self.assertNotIn(post["id"], related_ids)
+            self.assertEqual(len(related_ids), 1)
+
+            for related in post["related_posts"]:
+                self.assertTrue(tag_ids & set(related["tags"]))
+                self.assertEqual(related["author_details"]["username"], "author")
+
+    def test_single_post_matches_list_representation(self):
+        self.create_posts(3)
+        request = APIRequestFactory().get("/api/post/")
+        post = Post.objects.order_by("id").first()
+        data = PostSerializer(post, context={"request": request}).data
+
+        self.assertEqual(data, self.serialize_posts()[0])
+
+
+class TagStatisticsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username="author",
+            email="author@example.com",
+            password="password",
+        )
+        cls.tags = [PostTag.objects.create(detail=f"Tag {i}") for i in range(3)]
+
+    def create_post(self, *tags):
+        post = Post.objects.create(title="Post", content="Content", author=self.author)
+        post.tags.set(tags)
+
+        return post
+
+    def test_counts_come_from_one_cached_query(self):
+        self.create_post(self.tags[0], self.tags[1])
+        self.create_post(self.tags[0])
+
+        with self.assertNumQueries(1):
+            get_tag_statistics()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_tag_counts(), {"Tag 0": 2, "Tag 1": 1, "Tag 2": 0})
+            self.assertEqual(self.tags[0].post_count(), 2)
+
+    def test_counts_follow_tag_changes(self):
+        post = self.create_post(self.tags[0])
+        self.assertEqual(get_tag_post_counts()[self.tags[0].pk], 1)
+
+        post.tags.add(self.tags[2])
+        self.assertEqual(get_tag_post_counts()[self.tags[2].pk], 1)
+
+        post.delete()
+        self.assertEqual(get_tag_post_counts()[self.tags[0].pk], 0)
+
+        response = self.client.get("/api/tags/stats/")
+        self.assertEqual([tag["post_count"] for tag in response.data], [0, 0, 0])
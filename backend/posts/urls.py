@@ -8,6 +8,11 @@ urlpatterns = [
         TagsView.as_view(),
         name="tags-list",
     ),
+    path(
+        "tags/stats/",
+        TagStatisticsView.as_view(),
+        name="tags-stats",
+    ),
     path(
         "tags/<int:pk>/",
         TagsRetrieveUpdateDestroyView.as_view(),
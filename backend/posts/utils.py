@@ -0,0 +1,56 @@
+from .models import *
+from backend.versions import bump_cache_counter
+from django.core.cache import cache
+from django.db.models import Count
+
+
+TAG_STATISTICS_VERSION_KEY = "tag-statistics-version"
+TAG_STATISTICS_CACHE_TIMEOUT = 60 * 60
+
+
+def invalidate_tag_statistics():
+    bump_cache_counter(TAG_STATISTICS_VERSION_KEY)
+
+
+def get_tag_statistics():
+    """
+    Return every tag with the number of posts using it, in tag id order.
+
+    All counts come from one annotated query, cached until a post, a tag or
+    a post's tags change.
+
+    Returns:
+        A list of ``{"id", "detail", "post_count"}`` dicts.
+    """
+    version = cache.get(TAG_STATISTICS_VERSION_KEY, 0)
+    cache_key = f"tag-statistics:{version}"
+    statistics = cache.get(cache_key)
+
+    if statistics is None:
+        statistics = list(
+            PostTag.objects.annotate(post_count=Count("post"))
+            .order_by("id")
+            .values("id", "detail", "post_count")
+        )
+        cache.set(cache_key, statistics, TAG_STATISTICS_CACHE_TIMEOUT)
+
+    return statistics
+
+
+def get_tag_post_counts():
+    """
+    Return ``{tag_id: post_count}`` for every tag.
+    """
+    return {tag["id"]: tag["post_count"] for tag in get_tag_statistics()}
+
+
+def get_tag_counts():
+    """
+    Return ``{detail: post_count}``; tags sharing a name are added together.
+    """
+    counts = {}
+
+    for tag in get_tag_statistics():
+        counts[tag["detail"]] = counts.get(tag["detail"], 0) + tag["post_count"]
+
+    return counts
@@ -4,12 +4,15 @@ from rest_framework.response import Response
 from .models import *
 from authorization.models import User
 from .serializers import *
+from .utils import get_tag_statistics
+from rest_framework.views import APIView
 from auditlog.models import LogEntry
-from backend.utils import create_log_entry, return_changes
+from backend.fieldsets import SparseFieldsetMixin
+from backend.utils import create_log_entry, return_snapshot_changes, take_snapshot
 
 
-class PostListCreateView(generics.ListCreateAPIView):
-    queryset = Post.objects.all()
+class PostListCreateView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = PostSerializer.setup_eager_loading(Post.objects.all())
     serializer_class = PostSerializer
 
     def create(self, request, *args, **kwargs):
@@ -20,7 +23,7 @@ class PostListCreateView(generics.ListCreateAPIView):
         else:
             image = None
 
-        author = User.objects.get(username=request.username)
+        author = request.username
 
         data = {
             "title": form_data.get("title"),
@@ -60,20 +63,24 @@ class RecentPostView(PostListCreateView):
         return JsonResponse(serializer.data, safe=False)
 
 
-class HighlightedPostView(generics.ListCreateAPIView):
-    queryset = Post.objects.filter(is_highlighted=True)
+class HighlightedPostView(SparseFieldsetMixin, generics.ListCreateAPIView):
+    queryset = PostSerializer.setup_eager_loading(
+        Post.objects.filter(is_highlighted=True)
+    )
     serializer_class = PostSerializer
 
 
-class PostRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Post.objects.all()
+class PostRetrieveUpdateDestroyView(
+    SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView
+):
+    queryset = PostSerializer.setup_eager_loading(Post.objects.all())
     serializer_class = PostSerializer
 
     def update(self, request, *args, **kwargs):
         post = self.get_object()
-        old_instance = Post.objects.get(pk=post.pk)
+        snapshot = take_snapshot(post)
         formatted_data = self.serializer_class().format_data(request.data)
-        author = User.objects.get(username=request.username)
+        author = request.username
 
         title = formatted_data.get("title", post.title)
         content = formatted_data.get("content", post.content)
@@ -101,7 +108,7 @@ class PostRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
 
         serializer = self.get_serializer(post)
 
-        changes = return_changes(post, old_instance)
+        changes = return_snapshot_changes(post, snapshot)
         create_log_entry(
             LogEntry.Action.UPDATE,
             request.username if request.username else None,
@@ -139,19 +146,28 @@ class TagsView(generics.ListCreateAPIView):
         return serializer.save()
 
 
+class TagStatisticsView(APIView):
+    """
+    Every tag with its number of posts, e.g. for a tag cloud.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_tag_statistics())
+
+
 class TagsRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     queryset = PostTag.objects.all()
     serializer_class = PostTagSerializer
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
-        old_instance = PostTag.objects.get(pk=instance.pk)
+        snapshot = take_snapshot(instance)
 
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
 
-        changes = return_changes(instance, old_instance)
+        changes = return_snapshot_changes(instance, snapshot)
         create_log_entry(LogEntry.Action.UPDATE, request.username, instance, changes)
 
         return Response(serializer.data)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from quizes.utils import check_answer_counts, rebuild_answer_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the questionnaire answer counters from the submitted answers, "
+        "or check them with --check."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--questionnaire",
+            type=int,
+            action="append",
+            dest="questionnaires",
+            help="Only process this questionnaire id (can be repeated).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Report counters that differ from the answers without changing them.",
+        )
+
+    def handle(self, *args, **options):
+        questionnaire_ids = options["questionnaires"]
+
+        if options["check"]:
+            mismatches = check_answer_counts(questionnaire_ids)
+
+            for mismatch in mismatches:
+                self.stdout.write(
+                    "Questionnaire {questionnaire}, question {question}, "
+                    "answer choice {answer_choice}: stored {stored}, "
+                    "expected {expected}".format(**mismatch)
+                )
+
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} answer counters are inconsistent")
+
+            self.stdout.write(self.style.SUCCESS("Answer counters are consistent"))
+            return
+
+        count = rebuild_answer_counts(questionnaire_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} answer counters"))
@@ -172,6 +172,7 @@ QUESTIONNAIRE_RESULT_METADATA = {
         "questionnaire",
     ],
     "allowed": False,
+    "paginate": True,
 }
 
 
@@ -212,4 +213,44 @@ QUESTIONNAIRE_RESULT_ANSWER_METADATA = {
         "questionnaire_result",
     ],
     "allowed": False,
+    "paginate": True,
+}
+
+
+QUESTIONNAIRE_ANSWER_COUNT_METADATA = {
+    "autoform_label": "Questionnaire Answer Count",
+    "long_description": "This model keeps a running count of how many times each answer choice was selected for a question in a questionnaire.",
+    "short_description": "Running answer counts for questionnaire analysis.",
+    "pages_associated": {
+        "Services": "/services",
+    },
+    "include_preview": False,
+    "icon": "SummarizeIcon",
+    "icon_class": None,
+    "slug": "questionnaire-answer-count",
+    "tags": ["Questionnaire", "Answer", "Statistics"],
+    "related_components": ["Questionnaire", "Quiz"],
+    "visibility": False,
+    "access_level": "All",
+    "info_dump": {
+        "purpose": "This model stores one counter per questionnaire, question and answer choice. It is updated with every submitted questionnaire result and read by the questionnaire analysis, so the analysis does not have to scan every answer.",
+        "fields": {
+            "Questionnaire": "A foreign key reference to the questionnaire the counter belongs to.",
+            "Question": "A foreign key reference to the question that was answered.",
+            "Answer Choice": "A foreign key reference to the answer choice that was selected.",
+            "Count": "How many submitted answers selected this answer choice.",
+        },
+        "model_links": {
+            "Django documentation": "https://docs.djangoproject.com/en/3.2/topics/db/models/",
+            "QuestionnaireAnswerCount model reference": "/docs/model/questionnaireanswercount/",
+            "General app documentation": "/docs/app/quizes/",
+        },
+    },
+    "filter_options": [
+        "id",
+        "questionnaire",
+        "question",
+        "answer_choice",
+    ],
+    "allowed": False,
 }
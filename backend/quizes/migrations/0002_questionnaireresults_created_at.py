@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionnaireresults',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_answer_counts(apps, schema_editor):
+    QuestionnaireAnswerCount = apps.get_model('quizes', 'QuestionnaireAnswerCount')
+    QuestionnaireResultAnswer = apps.get_model('quizes', 'QuestionnaireResultAnswer')
+
+    rows = (
+        QuestionnaireResultAnswer.objects.filter(answer_choice__isnull=False)
+        .values_list('questionnaire_result__questionnaire_id', 'question_id', 'answer_choice_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    QuestionnaireAnswerCount.objects.bulk_create(
+        [
+            QuestionnaireAnswerCount(
+                questionnaire_id=questionnaire_id,
+                question_id=question_id,
+                answer_choice_id=answer_choice_id,
+                count=count,
+            )
+            for questionnaire_id, question_id, answer_choice_id, count in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizes', '0002_questionnaireresults_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionnaireAnswerCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('answer_choice', models.ForeignKey(help_text='Linked Answer Choice', on_delete=django.db.models.deletion.CASCADE, to='quizes.answerchoice', verbose_name='Answer Choice')),
+                ('question', models.ForeignKey(help_text='Linked Question', on_delete=django.db.models.deletion.CASCADE, to='quizes.question', verbose_name='Question')),
+                ('questionnaire', models.ForeignKey(help_text='Linked Questionnaire', on_delete=django.db.models.deletion.CASCADE, related_name='answer_counts', to='quizes.questionnaire', verbose_name='Questionnaire')),
+            ],
+            options={
+                'verbose_name': 'Questionnaire Answer Count',
+                'verbose_name_plural': 'Questionnaire Answer Counts',
+                'constraints': [models.UniqueConstraint(fields=('questionnaire', 'question', 'answer_choice'), name='unique_questionnaire_answer_count')],
+            },
+        ),
+        migrations.RunPython(build_answer_counts, migrations.RunPython.noop),
+    ]
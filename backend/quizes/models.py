@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
 from backend.customs import *
 from .metadata import *
 
@@ -195,6 +197,7 @@ class QuestionnaireResults(models.Model):
         help_text="Contact State of Residence",
     )
     results = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, null=True, db_index=True)
 
     def __str__(self):
         return f"{self.contact_name} ({self.questionnaire})"
@@ -251,3 +254,123 @@ class QuestionnaireResultAnswer(models.Model):
     class Meta:
         verbose_name = "Questionnaire Result Answer Choice"
         verbose_name_plural = "Questionnaire Result Answer Choices"
+
+
+@metadata(**QUESTIONNAIRE_ANSWER_COUNT_METADATA)
+class QuestionnaireAnswerCount(models.Model):
+    questionnaire = models.ForeignKey(
+        Questionnaire,
+        on_delete=models.CASCADE,
+        related_name="answer_counts",
+        verbose_name="Questionnaire",
+        help_text="Linked Questionnaire",
+    )
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        verbose_name="Question",
+        help_text="Linked Question",
+    )
+    answer_choice = models.ForeignKey(
+        AnswerChoice,
+        on_delete=models.CASCADE,
+        verbose_name="Answer Choice",
+        help_text="Linked Answer Choice",
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.questionnaire} ({self.answer_choice}: {self.count})"
+
+    class Meta:
+        verbose_name = "Questionnaire Answer Count"
+        verbose_name_plural = "Questionnaire Answer Counts"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["questionnaire", "question", "answer_choice"],
+                name="unique_questionnaire_answer_count",
+            )
+        ]
+
+
+def get_answer_count_key(questionnaire_result_id, question_id, answer_choice_id):
+    """
+    Return the ``(questionnaire_id, (question_id, answer_choice_id))`` counter
+    an answer is counted in, or None when it is not counted.
+    """
+    if answer_choice_id is None:
+        return None
+
+    questionnaire_id = (
+        QuestionnaireResults.objects.filter(id=questionnaire_result_id)
+        .values_list("questionnaire_id", flat=True)
+        .first()
+    )
+
+    if questionnaire_id is None:
+        return None
+
+    return questionnaire_id, (question_id, answer_choice_id)
+
+
+# Bulk writes save it one object at a time, so the receivers below run.
+QuestionnaireResultAnswer.save_hooks = True
+
+
+@receiver(pre_save, sender=QuestionnaireResultAnswer)
+def remember_answer_count_key(sender, instance, raw=False, **kwargs):
+    instance._answer_count_key = None
+
+    if raw or instance.pk is None:
+        return
+
+    old = (
+        sender._base_manager.filter(pk=instance.pk)
+        .values_list("questionnaire_result_id", "question_id", "answer_choice_id")
+        .first()
+    )
+
+    if old is not None:
+        instance._answer_count_key = get_answer_count_key(*old)
+
+
+@receiver(post_save, sender=QuestionnaireResultAnswer)
+def move_answer_count(sender, instance, created, raw=False, **kwargs):
+    """
+    Count answers saved one by one, e.g. through the generic API; the
+    submission serializer counts the answers it bulk creates itself.
+    """
+    from .utils import update_answer_counts
+
+    if raw:
+        return
+
+    old_key = None if created else getattr(instance, "_answer_count_key", None)
+    new_key = get_answer_count_key(
+        instance.questionnaire_result_id,
+        instance.question_id,
+        instance.answer_choice_id,
+    )
+
+    if old_key == new_key:
+        return
+
+    if old_key is not None:
+        update_answer_counts(old_key[0], [old_key[1]], -1)
+
+    if new_key is not None:
+        update_answer_counts(new_key[0], [new_key[1]])
+
+
+@receiver(post_delete, sender=QuestionnaireResultAnswer)
+def decrement_answer_count(sender, instance, **kwargs):
+    from .utils import update_answer_counts
+
+    key = get_answer_count_key(
+        instance.questionnaire_result_id,
+        instance.question_id,
+        instance.answer_choice_id,
+    )
+
+    if key is not None:
+        update_answer_counts(key[0], [key[1]], -1)
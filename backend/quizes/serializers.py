@@ -1,5 +1,9 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import *
+from backend.bulk import expire_model_caches
+from backend.counts import adjust_row_count
+from .utils import update_answer_counts
 
 
 class AnswerChoiceSerializer(serializers.ModelSerializer):
@@ -108,6 +112,7 @@ class QuestionnaireResultsSerializer(serializers.ModelSerializer):
             "contact_state",
         ]
 
+    @transaction.atomic
     def create(self, validated_data):
         instance = super().create(validated_data)
         results_data = validated_data.pop("results")
@@ -141,6 +146,12 @@ class QuestionnaireResultsSerializer(serializers.ModelSerializer):
                     )
 
         QuestionnaireResultAnswer.objects.bulk_create(results)
+        adjust_row_count(QuestionnaireResultAnswer, len(results))
+        expire_model_caches(QuestionnaireResultAnswer)
+        update_answer_counts(
+            instance.questionnaire_id,
+            [(answer.question_id, answer.answer_choice_id) for answer in results],
+        )
 
         return instance
 
@@ -1,3 +1,178 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+import jwt
+from authorization.models import User
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from .models import *
+from .serializers import QuestionnaireResultsSerializer
+from .utils import check_answer_counts
+
+
+class QuestionnaireResultsAnalysisTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.questionnaire = Questionnaire.objects.create(
+            title="Survey", slug="survey", description="Survey"
+        )
+        cls.first_set = QuestionSet.objects.create(
+            questionnaire=cls.questionnaire, title="First", description="First", order=1
+        )
+        cls.second_set = QuestionSet.objects.create(
+            questionnaire=cls.questionnaire, title="Second", description="Second", order=2
+        )
+        cls.color = Question.objects.create(question_set=cls.first_set, text="Color?")
+        cls.size = Question.objects.create(question_set=cls.second_set, text="Size?")
+        cls.red = AnswerChoice.objects.create(question=cls.color, text="Red", order=1)
+        cls.blue = AnswerChoice.objects.create(question=cls.color, text="Blue", order=2)
+        cls.small = AnswerChoice.objects.create(question=cls.size, text="Small")
+        cls.large = AnswerChoice.objects.create(question=cls.size, text="Large")
+
+    def submit(self, results):
+        serializer = QuestionnaireResultsSerializer(
+            data={
+                "questionnaire": self.questionnaire.id,
+                "contact_name": "Contact",
+                "contact_email": "contact@example.com",
+                "results": results,
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+
+        return serializer.save()
+
+    def get_results(self, query=""):
+        return self.client.get(
+            f"/api/questionnaires/{self.questionnaire.id}/results/{query}"
+        ).json()
+
+    def test_results_are_aggregated(self):
+        self.submit(
+            {str(self.color.id): self.red.id, str(self.size.id): [self.small.id]}
+        )
+        self.submit(
+            {str(self.color.id): self.red.id, str(self.size.id): [self.large.id]}
+        )
+        self.submit({str(self.color.id): self.blue.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get_results()
+
+        self.assertLessEqual(len(queries), 3)
+        self.assertEqual(data["num_responses"], 3)
+        self.assertEqual(
+            data["question_analysis"],
+            {
+                "Color?": {
+                    "Red": {"count": 2, "percent": 67},
+                    "Blue": {"count": 1, "percent": 33},
+                },
+                "Size?": {
+                    "Small": {"count": 1, "percent": 50},
+                    "Large": {"count": 1, "percent": 50},
+                },
+            },
+        )
+
+    def test_question_set_and_date_filters(self):
+        old = self.submit({str(self.color.id): self.red.id})
+        QuestionnaireResults.objects.filter(id=old.id).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+        self.submit(
+            {str(self.color.id): self.blue.id, str(self.size.id): [self.small.id]}
+        )
+
+        data = self.get_results(f"?question_set={self.second_set.id}")
+        self.assertEqual(list(data["question_analysis"]), ["Size?"])
+
+        start = (timezone.now() - timedelta(days=1)).date().isoformat()
+        data = self.get_results(f"?start={start}")
+        self.assertEqual(data["num_responses"], 1)
+        self.assertEqual(
+            data["question_analysis"]["Color?"], {"Blue": {"count": 1, "percent": 100}}
+        )
+
+        response = self.client.get(
+            f"/api/questionnaires/{self.questionnaire.id}/results/?end=yesterday"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_answer_counts_follow_submissions_and_deletes(self):
+        first = self.submit(
+            {str(self.color.id): self.red.id, str(self.size.id): [self.small.id]}
+        )
+        self.submit({str(self.color.id): self.red.id})
+
+        counter = QuestionnaireAnswerCount.objects.get(answer_choice=self.red)
+        self.assertEqual(counter.count, 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get_results()
+
+        self.assertNotIn(
+            "quizes_questionnaireresultanswer",
+            " ".join(query["sql"] for query in queries),
+        )
+        self.assertEqual(data["question_analysis"]["Color?"]["Red"]["count"], 2)
+
+        first.delete()
+        counter.refresh_from_db()
+        self.assertEqual(counter.count, 1)
+        self.assertEqual(check_answer_counts(), [])
+
+        QuestionnaireAnswerCount.objects.update(count=7)
+        self.assertEqual(len(check_answer_counts()), 2)
+
+        call_command("rebuild_questionnaire_stats", stdout=StringIO())
+        self.assertEqual(check_answer_counts(), [])
+
+    def test_answers_saved_one_by_one_keep_counts(self):
+        self.submit({str(self.color.id): self.red.id})
+        User.objects.create(username="admin", email="admin@example.com")
+        token = jwt.encode(
+            {"user": "admin", "exp": datetime.utcnow() + timedelta(days=1)},
+            settings.SECRET_KEY,
+            algorithm="HS256",
+        )
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        result = QuestionnaireResults.objects.create(
+            questionnaire=self.questionnaire,
+            contact_name="Admin",
+            contact_email="admin@example.com",
+            results={},
+        )
+
+        answer = QuestionnaireResultAnswer.objects.create(
+            questionnaire_result=result, question=self.color, answer_choice=self.red
+        )
+        self.assertEqual(
+            QuestionnaireAnswerCount.objects.get(answer_choice=self.red).count, 2
+        )
+        self.assertEqual(check_answer_counts(), [])
+
+        response = self.client.put(
+            f"/api/questionnaireresultanswer/{answer.id}/",
+            {"answer_choice": self.blue.id},
+            content_type="application/json",
+            **auth,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(check_answer_counts(), [])
+        self.assertEqual(
+            QuestionnaireAnswerCount.objects.get(answer_choice=self.blue).count, 1
+        )
 
-# Create your tests here.
+        self.client.delete(f"/api/questionnaireresultanswer/{answer.id}/", **auth)
+        self.assertEqual(check_answer_counts(), [])
+        self.assertEqual(
+            QuestionnaireAnswerCount.objects.get(answer_choice=self.red).count, 1
+        )
+        self.assertEqual(
+            QuestionnaireAnswerCount.objects.get(answer_choice=self.blue).count, 0
+        )
@@ -1,39 +1,288 @@
 from .models import *
-from collections import defaultdict
-from typing import Dict
+from backend.bulk import expire_model_caches
+from backend.counts import adjust_row_count, forget_row_count
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
-def analyze_questionnaire_results(results) -> Dict[str, Dict[str, int]]:
+def filter_questionnaire_results(results, start=None, end=None):
+    """
+    Restrict QuestionnaireResults to those submitted within a date range.
+
+    Args:
+        results: QuerySet of QuestionnaireResults objects.
+        start: Optional ISO date or datetime string, inclusive.
+        end: Optional ISO date or datetime string, inclusive.
+
+    Returns:
+        The filtered QuerySet.
+
+    Raises:
+        ValueError: If ``start`` or ``end`` is not a valid date or datetime.
+    """
+    for lookup, value in (("gte", start), ("lte", end)):
+        if not value:
+            continue
+
+        day = parse_date(value)
+
+        if day is not None:
+            results = results.filter(**{f"created_at__date__{lookup}": day})
+            continue
+
+        moment = parse_datetime(value)
+
+        if moment is None:
+            raise ValueError(f"Invalid date: {value}")
+
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+
+        results = results.filter(**{f"created_at__{lookup}": moment})
+
+    return results
+
+
+def analyze_questionnaire_results(
+    results, question_sets: Optional[Iterable[int]] = None
+) -> Dict[str, Dict[str, int]]:
     """
     Analyze the results of a particular questionnaire and return a dictionary with statistics for each question and answer choice.
 
+    The answers are counted with a single grouped query.
+
     Args:
         results: QuerySet of QuestionnaireResult objects to analyze.
+        question_sets: Optional QuestionSet ids to restrict the questions to.
 
     Returns:
         A dictionary with statistics for each question and answer choice.
     """
-    stats = defaultdict(lambda: defaultdict(int))
+    answers = QuestionnaireResultAnswer.objects.filter(
+        questionnaire_result__in=results,
+        answer_choice__isnull=False,
+    )
 
-    for result in results:
-        answers = QuestionnaireResultAnswer.objects.filter(questionnaire_result=result)
+    if question_sets:
+        answers = answers.filter(question__question_set__in=question_sets)
 
-        for answer in answers:
-            question = answer.question
-            answer_choice = answer.answer_choice
+    counts = (
+        answers.values("question__text", "answer_choice__text")
+        .annotate(count=Count("id"))
+        .order_by(
+            "question__question_set__order",
+            "question__order",
+            "answer_choice__order",
+        )
+    )
 
-            stats[question.text][answer_choice.text] += 1
-            stats[question.text]["total"] += 1
+    return format_answer_stats(counts)
 
-    stats_dict = dict(stats)
 
-    for question, answer_stats in stats_dict.items():
-        total_answers = answer_stats.pop("total")
-        for answer_choice, count in answer_stats.items():
-            percentage = round(count / total_answers * 100)
-            answer_stats[answer_choice] = {
+def format_answer_stats(counts) -> Dict[str, Dict[str, int]]:
+    """
+    Turn ``question__text``/``answer_choice__text``/``count`` rows into the
+    per-question statistics returned by the results endpoint.
+    """
+    stats = defaultdict(lambda: defaultdict(int))
+
+    for row in counts:
+        stats[row["question__text"]][row["answer_choice__text"]] += row["count"]
+
+    stats_dict = {}
+
+    for question, answer_stats in stats.items():
+        total_answers = sum(answer_stats.values())
+        stats_dict[question] = {
+            answer_choice: {
                 "count": count,
-                "percent": percentage,
+                "percent": round(count / total_answers * 100),
             }
+            for answer_choice, count in answer_stats.items()
+        }
 
     return stats_dict
+
+
+def get_answer_count_stats(
+    questionnaire, question_sets: Optional[Iterable[int]] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    Read the statistics of a questionnaire from its QuestionnaireAnswerCount
+    counters instead of scanning the submitted answers.
+
+    Args:
+        questionnaire: The Questionnaire (or its id) to read.
+        question_sets: Optional QuestionSet ids to restrict the questions to.
+
+    Returns:
+        The same dictionary as ``analyze_questionnaire_results``.
+    """
+    counts = QuestionnaireAnswerCount.objects.filter(
+        questionnaire=questionnaire, count__gt=0
+    )
+
+    if question_sets:
+        counts = counts.filter(question__question_set__in=question_sets)
+
+    counts = counts.values("question__text", "answer_choice__text", "count").order_by(
+        "question__question_set__order",
+        "question__order",
+        "answer_choice__order",
+        "id",
+    )
+
+    return format_answer_stats(counts)
+
+
+def update_answer_counts(
+    questionnaire_id: int, answers: Iterable[Tuple[int, int]], delta: int = 1
+) -> None:
+    """
+    Add ``delta`` to the counter of every ``(question_id, answer_choice_id)``
+    pair in ``answers``; pairs may repeat.
+
+    Missing counters are created first, then one UPDATE is issued per
+    distinct increment, so a submission costs a constant number of queries.
+    Counters never go below zero.
+    """
+    answers = Counter(answers)
+
+    if not answers:
+        return
+
+    if delta > 0:
+        QuestionnaireAnswerCount.objects.bulk_create(
+            [
+                QuestionnaireAnswerCount(
+                    questionnaire_id=questionnaire_id,
+                    question_id=question_id,
+                    answer_choice_id=answer_choice_id,
+                )
+                for question_id, answer_choice_id in answers
+            ],
+            ignore_conflicts=True,
+        )
+        # Conflicting rows are skipped silently, so the number of new
+        # counters is unknown.
+        forget_row_count(QuestionnaireAnswerCount)
+
+    increments = defaultdict(Q)
+
+    for (question_id, answer_choice_id), count in answers.items():
+        increments[count * delta] |= Q(
+            question_id=question_id, answer_choice_id=answer_choice_id
+        )
+
+    for increment, query in increments.items():
+        QuestionnaireAnswerCount.objects.filter(
+            query, questionnaire_id=questionnaire_id
+        ).update(count=Greatest(F("count") + increment, 0))
+
+    expire_model_caches(QuestionnaireAnswerCount)
+
+
+def count_answers(questionnaire_ids: Optional[Iterable[int]] = None):
+    """
+    Count the submitted answers per questionnaire, question and answer choice.
+
+    Returns:
+        A dict mapping ``(questionnaire_id, question_id, answer_choice_id)``
+        to the number of answers.
+    """
+    answers = QuestionnaireResultAnswer.objects.filter(answer_choice__isnull=False)
+
+    if questionnaire_ids is not None:
+        answers = answers.filter(
+            questionnaire_result__questionnaire__in=questionnaire_ids
+        )
+
+    rows = (
+        answers.values_list(
+            "questionnaire_result__questionnaire_id", "question_id", "answer_choice_id"
+        )
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    return {tuple(row[:3]): row[3] for row in rows}
+
+
+def check_answer_counts(
+    questionnaire_ids: Optional[Iterable[int]] = None,
+) -> List[Dict[str, int]]:
+    """
+    Compare the QuestionnaireAnswerCount counters with the submitted answers.
+
+    Returns:
+        One dict per mismatching counter with the ids, the stored count and
+        the expected count.
+    """
+    expected = count_answers(questionnaire_ids)
+    counters = QuestionnaireAnswerCount.objects.all()
+
+    if questionnaire_ids is not None:
+        counters = counters.filter(questionnaire__in=questionnaire_ids)
+
+    stored = {
+        tuple(row[:3]): row[3]
+        for row in counters.values_list(
+            "questionnaire_id", "question_id", "answer_choice_id", "count"
+        )
+    }
+    mismatches = []
+
+    for key in sorted(set(expected) | set(stored)):
+        if expected.get(key, 0) != stored.get(key, 0):
+            mismatches.append(
+                {
+                    "questionnaire": key[0],
+                    "question": key[1],
+                    "answer_choice": key[2],
+                    "stored": stored.get(key, 0),
+                    "expected": expected.get(key, 0),
+                }
+            )
+
+    return mismatches
+
+
+@transaction.atomic
+def rebuild_answer_counts(questionnaire_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recreate the QuestionnaireAnswerCount counters from the submitted answers.
+
+    Returns:
+        The number of counters written.
+    """
+    counters = QuestionnaireAnswerCount.objects.all()
+
+    if questionnaire_ids is not None:
+        counters = counters.filter(questionnaire__in=questionnaire_ids)
+
+    counters.delete()
+    created = QuestionnaireAnswerCount.objects.bulk_create(
+        [
+            QuestionnaireAnswerCount(
+                questionnaire_id=questionnaire_id,
+                question_id=question_id,
+                answer_choice_id=answer_choice_id,
+                count=count,
+            )
+            for (
+                questionnaire_id,
+                question_id,
+                answer_choice_id,
+            ), count in count_answers(questionnaire_ids).items()
+        ],
+        batch_size=500,
+    )
+    adjust_row_count(QuestionnaireAnswerCount, len(created))
+    expire_model_caches(QuestionnaireAnswerCount)
+
+    return len(created)
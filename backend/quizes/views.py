@@ -4,7 +4,11 @@ from backend.custom_views import *
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
-from .utils import analyze_questionnaire_results
+from .utils import (
+    analyze_questionnaire_results,
+    filter_questionnaire_results,
+    get_answer_count_stats,
+)
 from rest_framework.decorators import api_view
 
 
@@ -124,13 +128,29 @@ class QuestionnaireResultAnswerBulkAPIView(BaseBulkView):
 def questionnaire_results(request, pk):
     questionnaire = get_object_or_404(Questionnaire, id=pk)
     results = QuestionnaireResults.objects.filter(questionnaire=questionnaire)
-    analysis = analyze_questionnaire_results(results)
-    print(len(results))
+    question_sets = [
+        question_set
+        for question_set in request.GET.get("question_set", "").split(",")
+        if question_set.strip().isdigit()
+    ]
+
+    start = request.GET.get("start")
+    end = request.GET.get("end")
+
+    if start or end:
+        try:
+            results = filter_questionnaire_results(results, start, end)
+        except ValueError as e:
+            return JsonResponse({"detail": str(e)}, status=400)
+
+        analysis = analyze_questionnaire_results(results, question_sets)
+    else:
+        analysis = get_answer_count_stats(questionnaire, question_sets)
 
     response_data = {
         "questionnaire_id": pk,
         "questionnaire_name": questionnaire.title,
-        "num_responses": len(results),
+        "num_responses": results.count(),
         "question_analysis": analysis,
     }
     return JsonResponse(response_data)
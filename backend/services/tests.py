@@ -1,3 +1,79 @@
+import datetime
+
+import jwt
+from authorization.models import User
+from django.conf import settings
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from .models import Feature, ServiceTier, SupportedSites
+
+
+class ServiceTierWriteTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(
+            username="member", email="member@example.com", password="password"
+        )
+        token = jwt.encode(
+            {
+                "user": "member",
+                "exp": datetime.datetime.utcnow() + datetime.timedelta(days=1),
+            },
+            settings.SECRET_KEY,
+            algorithm="HS256",
+        )
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        self.features = [
+            Feature.objects.create(detail=f"Feature {i}") for i in range(40)
+        ]
+        self.site = SupportedSites.objects.create(detail="Web")
+        self.tier = ServiceTier.objects.create(
+            image="pricing_images/tier.png", service_title="Basic", price="9.99"
+        )
+
+    def update(self, data):
+        return self.client.put(
+            f"/api/servicetier/{self.tier.pk}/",
+            data,
+            content_type="application/json",
+            **self.auth,
+        )
+
+    def get_data(self, features):
+        data = {"service_title": "Pro", "supported_sites[0][id]": self.site.pk}
+
+        for index, feature in enumerate(features):
+            data[f"features[{index}][id]"] = feature.pk
+
+        return data
+
+    def measure(self, features):
+        self.tier.features.clear()
+        self.tier.supported_sites.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.update(self.get_data(features))
+
+        self.assertEqual(response.status_code, 200)
+
+        return len(queries)
+
+    def test_references_are_resolved_in_bulk(self):
+        self.update(self.get_data([]))
+
+        self.assertEqual(self.measure(self.features), self.measure(self.features[:1]))
+        self.assertEqual(self.tier.features.count(), 1)
+
+        self.measure(self.features)
+        self.assertEqual(self.tier.features.count(), 40)
+        self.assertEqual(list(self.tier.supported_sites.all()), [self.site])
+
+    def test_missing_ids_are_validation_errors(self):
+        response = self.update({"features[0][id]": 999})
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {"features": ['Invalid pk "999" - object does not exist.']},
+        )
+        self.assertFalse(Feature.objects.filter(pk=999).exists())
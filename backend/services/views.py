@@ -6,12 +6,14 @@ from tables.models import *
 from tables.serializers import *
 from django.shortcuts import get_object_or_404
 from auditlog.models import LogEntry
-from backend.utils import create_log_entry, return_changes, get_serialized_page_data
+from backend.page_cache import aget_cached_page_response
+from django.views import View
+from backend.utils import create_log_entry, return_changes
 from backend.custom_views import *
 
 
-class ServiceFullTestView(generics.GenericAPIView):
-    def get(self, request, *args, **kwargs):
+class ServiceFullTestView(View):
+    async def get(self, request, *args, **kwargs):
         model_dict = {
             "processText": {
                 "app_label": "services",
@@ -65,9 +67,7 @@ class ServiceFullTestView(generics.GenericAPIView):
             },
         }
 
-        data = get_serialized_page_data(model_dict, request)
-
-        return Response(data)
+        return await aget_cached_page_response("services", model_dict, request)
 
 
 class BenefitsAPIView(BaseListView):
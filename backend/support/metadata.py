@@ -42,6 +42,7 @@ MESSAGE_METADATA = {
         "is_archived",
     ],
     "allowed": False,
+    "paginate": True,
 }
 
 
@@ -76,4 +77,5 @@ SUBSCRIBER_METADATA = {
         "email",
     ],
     "allowed": False,
+    "paginate": True,
 }
@@ -11,6 +11,7 @@ class MessagesSerializer(serializers.ModelSerializer):
         "is_read",
         "is_archived",
     ]
+    SEARCH_KEYS = ["subject", "name", "email", "message"]
 
     class Meta:
         model = Messages
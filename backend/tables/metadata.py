@@ -123,4 +123,5 @@ CELL_METADATA = {
     },
     "allowed": True,
     "filter_options": ["value"],
+    "paginate": True,
 }
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import *
+from .utils import load_tables
 
 
 class CellSerializer(serializers.ModelSerializer):
@@ -28,6 +29,26 @@ class ColumnSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+def get_table_layout(context):
+    request = context.get("request")
+
+    if request is None:
+        return "nested"
+
+    query_params = getattr(request, "query_params", request.GET)
+
+    return "columnar" if query_params.get("layout") == "columnar" else "nested"
+
+
+class TableListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        tables = data.all() if hasattr(data, "all") else data
+
+        return load_tables(
+            tables, get_table_layout(self.context), fields=list(self.child.fields)
+        )
+
+
 class TableSerializer(serializers.ModelSerializer):
     columns = ColumnSerializer(many=True, read_only=True)
     rows = RowSerializer(many=True, read_only=True)
@@ -41,6 +62,21 @@ class TableSerializer(serializers.ModelSerializer):
             "columns",
             "rows",
         ]
+        list_serializer_class = TableListSerializer
+
+    def to_representation(self, instance):
+        """
+        Serialize a table with its columns, rows and cells in a fixed number
+        of queries; ``?layout=columnar`` returns a value matrix instead.
+        Only the fields left on the serializer, e.g. by ``?fields=``, are
+        loaded.
+        """
+        if self.parent is not None:
+            return super().to_representation(instance)
+
+        return load_tables(
+            [instance], get_table_layout(self.context), fields=list(self.fields)
+        )[0]
 
 
 class TableBuildSerializer(serializers.ModelSerializer):
@@ -1,3 +1,157 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from .models import Table, Column, Row, Cell
+from .serializers import TableSerializer
 
-# Create your tests here.
+
+class TableSerializerTests(TestCase):
+    def create_table(self, column_count, row_count):
+        table = Table.objects.create(name=f"Table {column_count}x{row_count}")
+        columns = [
+            Column.objects.create(table=table, name=f"Column {i}", icon="star")
+            for i in range(column_count)
+        ]
+
+        for r in range(row_count):
+            row = Row.objects.create(table=table, name=f"Row {r}")
+
+            for c, column in enumerate(columns):
+                Cell.objects.create(row=row, column=column, value=f"{r}:{c}")
+
+        return table
+
+    def test_query_count_does_not_grow_with_table_size(self):
+        small = self.create_table(2, 2)
+        large = self.create_table(6, 10)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            TableSerializer(small).data
+
+        with CaptureQueriesContext(connection) as large_queries:
+            data = TableSerializer(large).data
+
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertEqual(len(data["columns"]), 6)
+        self.assertEqual(len(data["rows"]), 10)
+        self.assertEqual(len(data["rows"][0]["cells"]), 6)
+
+        with CaptureQueriesContext(connection) as list_queries:
+            TableSerializer(Table.objects.all(), many=True).data
+
+        self.assertEqual(len(list_queries), len(small_queries) + 1)
+
+    def test_columnar_layout(self):
+        table = self.create_table(3, 2)
+        request = APIRequestFactory().get("/api/table/", {"layout": "columnar"})
+        data = TableSerializer(table, context={"request": request}).data
+
+        self.assertEqual([column["name"] for column in data["columns"]], [
+            "Column 0",
+            "Column 1",
+            "Column 2",
+        ])
+        self.assertEqual([row["name"] for row in data["rows"]], ["Row 0", "Row 1"])
+        self.assertEqual(data["values"], [["0:0", "0:1", "0:2"], ["1:0", "1:1", "1:2"]])
+
+
+class TableImportTests(TestCase):
+    def test_builder_creates_table_in_bulk(self):
+        data = {
+            "name": "Plans",
+            "columns": [
+                {
+                    "name": "Basic",
+                    "rows": [
+                        {"name": "Price", "cells": [{"value": "10"}]},
+                        {"name": "Seats", "cells": [{"value": "1"}]},
+                    ],
+                },
+                {
+                    "name": "Pro",
+                    "rows": [
+                        {"name": "Price", "cells": [{"value": "20"}]},
+                        {"name": "Seats", "cells": [{"value": "5"}]},
+                    ],
+                },
+            ],
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/table-builder/", data, content_type="application/json"
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertLessEqual(len(queries), 6)
+
+        table = Table.objects.get(name="Plans")
+        self.assertEqual(response.json(), TableSerializer(table).data)
+        self.assertEqual(table.rows.count(), 2)
+        self.assertEqual(Cell.objects.filter(row__table=table).count(), 4)
+
+    def test_builder_expires_cached_responses(self):
+        etag = self.client.get("/api/cell/")["ETag"]
+        data = {
+            "name": "Plans",
+            "columns": [
+                {
+                    "name": "Basic",
+                    "rows": [{"name": "Price", "cells": [{"value": "10"}]}],
+                }
+            ],
+        }
+        response = self.client.post(
+            "/api/table-builder/", data, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get("/api/cell/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_csv_import(self):
+        body = "Feature,Basic,Pro\nPrice,10,20\nSeats,1,\n\"Multi\nline\",x,y\n"
+        response = self.client.post(
+            "/api/table-import/csv/?name=Plans&batch_size=2",
+            body,
+            content_type="text/csv",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["rows"], 3)
+        self.assertEqual(response.json()["cells"], 5)
+
+        table = Table.objects.get(id=response.json()["id"])
+        self.assertEqual(
+            TableSerializer(table).data["rows"][2]["name"],
+            "Multi\nline",
+        )
+
+    def test_ndjson_import(self):
+        body = "\n".join(
+            [
+                '{"name": "Plans", "columns": ["Basic", {"name": "Pro", "icon": "star"}]}',
+                '{"name": "Price", "cells": ["10", "20"]}',
+                '["1", "5"]',
+            ]
+        )
+        response = self.client.post(
+            "/api/table-import/json/", body, content_type="application/x-ndjson"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["cells"], 4)
+        self.assertEqual(Column.objects.get(name="Pro").icon, "star")
+
+    def test_invalid_import_is_rolled_back(self):
+        body = "Feature,Basic\nPrice,10,20\n"
+        response = self.client.post(
+            "/api/table-import/csv/?name=Plans",
+            body,
+            content_type="text/csv",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Table.objects.filter(name="Plans").exists())
@@ -68,4 +68,14 @@ urlpatterns = [
         TableBuilder.as_view(),
         name="table-builder",
     ),
+    path(
+        "table-import/csv/",
+        TableImportView.as_view(import_format="csv"),
+        name="table-import-csv",
+    ),
+    path(
+        "table-import/json/",
+        TableImportView.as_view(import_format="json"),
+        name="table-import-json",
+    ),
 ]
@@ -0,0 +1,428 @@
+from .models import *
+from backend.bulk import expire_model_caches
+from backend.counts import adjust_row_count
+from backend.importers import (
+    DEFAULT_BATCH_SIZE,
+    ImportFormatError,
+    chunked,
+    iter_csv_rows,
+    iter_ndjson,
+)
+from collections import defaultdict
+from django.db import transaction
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+COLUMN_FIELDS = ["id", "name", "icon", "link", "table_id"]
+ROW_FIELDS = ["id", "name", "table_id"]
+CELL_FIELDS = ["id", "value", "column_id", "row_id"]
+
+
+def assemble_tables(
+    tables: Iterable[Dict[str, Any]],
+    columns: Iterable[Dict[str, Any]],
+    rows: Iterable[Dict[str, Any]],
+    cells: Iterable[Dict[str, Any]],
+    layout: str = "nested",
+) -> List[Dict[str, Any]]:
+    """
+    Assemble flat table, column, row and cell values into serialized tables.
+
+    Args:
+        tables: Dicts with the ``id`` and ``name`` of each table, in output order.
+        columns: Dicts with the ``COLUMN_FIELDS`` keys.
+        rows: Dicts with the ``ROW_FIELDS`` keys.
+        cells: Dicts with the ``CELL_FIELDS`` keys.
+        layout: ``"nested"`` for the TableSerializer shape, or ``"columnar"``
+            for a column list plus a row-by-column matrix of cell values.
+
+    Returns:
+        A list with one dictionary per table.
+    """
+    columns_by_table = defaultdict(list)
+    rows_by_table = defaultdict(list)
+    cells_by_row = defaultdict(list)
+
+    for column in sorted(columns, key=lambda column: column["id"]):
+        columns_by_table[column["table_id"]].append(column)
+
+    for row in sorted(rows, key=lambda row: row["id"]):
+        rows_by_table[row["table_id"]].append(row)
+
+    for cell in sorted(cells, key=lambda cell: cell["id"]):
+        cells_by_row[cell["row_id"]].append(cell)
+
+    if layout == "columnar":
+        return [
+            build_table_matrix(
+                table,
+                columns_by_table[table["id"]],
+                rows_by_table[table["id"]],
+                cells_by_row,
+            )
+            for table in tables
+        ]
+
+    return [
+        {
+            "id": table["id"],
+            "name": table["name"],
+            "columns": [
+                {
+                    "id": column["id"],
+                    "name": column["name"],
+                    "icon": column["icon"],
+                    "link": column["link"],
+                    "table": column["table_id"],
+                }
+                for column in columns_by_table[table["id"]]
+            ],
+            "rows": [
+                {
+                    "id": row["id"],
+                    "cells": [
+                        {
+                            "id": cell["id"],
+                            "value": cell["value"],
+                            "column": cell["column_id"],
+                            "row": cell["row_id"],
+                        }
+                        for cell in cells_by_row[row["id"]]
+                    ],
+                    "name": row["name"],
+                }
+                for row in rows_by_table[table["id"]]
+            ],
+        }
+        for table in tables
+    ]
+
+
+def build_table_matrix(table, columns, rows, cells_by_row) -> Dict[str, Any]:
+    column_index = {column["id"]: index for index, column in enumerate(columns)}
+    values = []
+
+    for row in rows:
+        row_values = [None] * len(columns)
+
+        for cell in cells_by_row[row["id"]]:
+            index = column_index.get(cell["column_id"])
+
+            if index is not None:
+                row_values[index] = cell["value"]
+
+        values.append(row_values)
+
+    return {
+        "id": table["id"],
+        "name": table["name"],
+        "columns": [
+            {
+                "id": column["id"],
+                "name": column["name"],
+                "icon": column["icon"],
+                "link": column["link"],
+            }
+            for column in columns
+        ],
+        "rows": [{"id": row["id"], "name": row["name"]} for row in rows],
+        "values": values,
+    }
+
+
+def select_table_fields(table: Dict[str, Any], fields) -> Dict[str, Any]:
+    kept = set(fields) | {"id"}
+
+    if "rows" in kept:
+        kept.add("values")
+
+    return {key: value for key, value in table.items() if key in kept}
+
+
+def load_tables(tables, layout: str = "nested", fields=None) -> List[Dict[str, Any]]:
+    """
+    Load one or many tables with all of their columns, rows and cells.
+
+    Runs one query per level (columns, rows, cells) regardless of the table
+    size, plus one for the tables themselves when ids are passed.
+
+    Args:
+        tables: Table instances, or table ids, in output order.
+        layout: ``"nested"`` or ``"columnar"``, see ``assemble_tables``.
+        fields: The fields of each table to return, all by default. Levels
+            that are left out are not queried; ``rows`` covers the cells and
+            the columnar ``values``.
+
+    Returns:
+        A list with one dictionary per table.
+    """
+    tables = list(tables)
+
+    if tables and not isinstance(tables[0], Table):
+        table_map = Table.objects.in_bulk(tables)
+        tables = [table_map[table_id] for table_id in tables if table_id in table_map]
+
+    table_ids = [table.id for table in tables]
+
+    if not table_ids:
+        return []
+
+    load_rows = fields is None or "rows" in fields
+    load_columns = (
+        fields is None or "columns" in fields or (layout == "columnar" and load_rows)
+    )
+    columns = []
+    rows = []
+    cells = []
+
+    if load_columns:
+        columns = Column.objects.filter(table_id__in=table_ids).values(*COLUMN_FIELDS)
+
+    if load_rows:
+        rows = Row.objects.filter(table_id__in=table_ids).values(*ROW_FIELDS)
+        cells = Cell.objects.filter(row__table_id__in=table_ids).values(*CELL_FIELDS)
+
+    result = assemble_tables(
+        [{"id": table.id, "name": table.name} for table in tables],
+        columns,
+        rows,
+        cells,
+        layout,
+    )
+
+    if fields is None:
+        return result
+
+    return [select_table_fields(table, fields) for table in result]
+
+
+def get_values(instance, fields) -> Dict[str, Any]:
+    return {field: getattr(instance, field) for field in fields}
+
+
+@transaction.atomic
+def build_table(data: Dict[str, Any], layout: str = "nested") -> Dict[str, Any]:
+    """
+    Create a table from TableBuilder data with one INSERT per level.
+
+    Columns, rows and cells are each written with a single ``bulk_create``
+    inside one transaction. Rows are shared between columns by name. The
+    created table is assembled from the saved instances without re-querying.
+
+    Args:
+        data: Validated builder data with ``name`` and nested ``columns``.
+        layout: ``"nested"`` or ``"columnar"``, see ``assemble_tables``.
+
+    Returns:
+        The serialized table.
+    """
+    table = Table.objects.create(name=data["name"])
+    columns = []
+    rows = {}
+    cell_data = []
+
+    for column_data in data["columns"]:
+        column = Column(
+            table=table,
+            **{key: value for key, value in column_data.items() if key != "rows"},
+        )
+        columns.append(column)
+
+        for row_data in column_data.get("rows", []):
+            row_name = row_data["name"]
+
+            if row_name not in rows:
+                rows[row_name] = Row(table=table, name=row_name)
+
+            for cell in row_data.get("cells", []):
+                cell_data.append((column, rows[row_name], cell))
+
+    Column.objects.bulk_create(columns)
+    Row.objects.bulk_create(rows.values())
+    cells = Cell.objects.bulk_create(
+        [Cell(column=column, row=row, **cell) for column, row, cell in cell_data]
+    )
+    adjust_row_count(Column, len(columns))
+    adjust_row_count(Row, len(rows))
+    adjust_row_count(Cell, len(cells))
+
+    for model in (Column, Row, Cell):
+        expire_model_caches(model)
+
+    return assemble_tables(
+        [{"id": table.id, "name": table.name}],
+        [get_values(column, COLUMN_FIELDS) for column in columns],
+        [get_values(row, ROW_FIELDS) for row in rows.values()],
+        [get_values(cell, CELL_FIELDS) for cell in cells],
+        layout,
+    )[0]
+
+
+def check_length(value, max_length, label, line=None):
+    if value is None or str(value).strip() == "":
+        raise ImportFormatError(f"{label} cannot be empty", line)
+
+    if len(str(value)) > max_length:
+        raise ImportFormatError(
+            f"{label} must be at most {max_length} characters long", line
+        )
+
+
+@transaction.atomic
+def import_table(
+    name: str,
+    columns: List[Dict[str, Any]],
+    rows: Iterable[Tuple[int, Optional[str], List[Any]]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Create a table from a stream of rows.
+
+    Rows are consumed lazily and written ``batch_size`` at a time, so only
+    one batch of rows and cells is held in memory. The whole import runs in
+    one transaction and is rolled back on the first invalid line.
+
+    Args:
+        name: The table name.
+        columns: Column dicts with a ``name`` and optional ``icon``/``link``.
+        rows: ``(line, row_name, values)`` tuples; ``values`` are matched to
+            ``columns`` by position and empty values are skipped.
+        batch_size: How many rows to insert per ``bulk_create``.
+
+    Returns:
+        The table id and name with the number of columns, rows and cells.
+    """
+    check_length(name, Table._meta.get_field("name").max_length, "Table name")
+
+    if not columns:
+        raise ImportFormatError("At least one column is required")
+
+    column_max_length = Column._meta.get_field("name").max_length
+    row_max_length = Row._meta.get_field("name").max_length
+    cell_max_length = Cell._meta.get_field("value").max_length
+
+    for column in columns:
+        check_length(column.get("name"), column_max_length, "Column name")
+
+    table = Table.objects.create(name=name)
+    column_objects = Column.objects.bulk_create(
+        [
+            Column(
+                table=table,
+                name=column["name"],
+                icon=column.get("icon") or "",
+                link=column.get("link") or "",
+            )
+            for column in columns
+        ]
+    )
+    row_count = 0
+    cell_count = 0
+
+    for batch in chunked(rows, batch_size):
+        row_objects = []
+
+        for line, row_name, values in batch:
+            if len(values) > len(column_objects):
+                raise ImportFormatError(
+                    f"Expected at most {len(column_objects)} values, got {len(values)}",
+                    line,
+                )
+
+            if row_name not in (None, ""):
+                check_length(row_name, row_max_length, "Row name", line)
+
+            for value in values:
+                if value not in (None, ""):
+                    check_length(value, cell_max_length, "Cell value", line)
+
+            row_objects.append(Row(table=table, name=row_name or None))
+
+        Row.objects.bulk_create(row_objects)
+        cells = [
+            Cell(column=column, row=row, value=str(value))
+            for row, (line, row_name, values) in zip(row_objects, batch)
+            for column, value in zip(column_objects, values)
+            if value not in (None, "")
+        ]
+        Cell.objects.bulk_create(cells)
+
+        row_count += len(row_objects)
+        cell_count += len(cells)
+
+    adjust_row_count(Column, len(column_objects))
+    adjust_row_count(Row, row_count)
+    adjust_row_count(Cell, cell_count)
+
+    for model in (Column, Row, Cell):
+        expire_model_caches(model)
+
+    return {
+        "id": table.id,
+        "name": table.name,
+        "columns": len(column_objects),
+        "rows": row_count,
+        "cells": cell_count,
+    }
+
+
+def read_csv_table(stream) -> Tuple[List[Dict[str, Any]], Iterable]:
+    """
+    Read a CSV table whose header holds the column names.
+
+    The first field of every record is the row name; the header's first
+    field is the label of that row-name column and is ignored.
+
+    Returns:
+        The column dicts and a lazy iterator of ``import_table`` rows.
+    """
+    records = iter_csv_rows(stream)
+    header = next(records, None)
+
+    if not header:
+        raise ImportFormatError("The CSV header is missing", 1)
+
+    columns = [{"name": column_name.strip()} for column_name in header[1:]]
+    rows = (
+        (line, record[0].strip(), record[1:])
+        for line, record in enumerate(records, start=2)
+        if record
+    )
+
+    return columns, rows
+
+
+def read_ndjson_table(stream) -> Tuple[Dict[str, Any], Iterable]:
+    """
+    Read an NDJSON table.
+
+    The first line is a header object with the table ``name`` and its
+    ``columns`` (names, or objects with ``name``, ``icon`` and ``link``).
+    Every following line is a row, either ``{"name": ..., "cells": [...]}``
+    or a plain list of cell values.
+
+    Returns:
+        The header dict with normalized columns and a lazy iterator of
+        ``import_table`` rows.
+    """
+    values = iter_ndjson(stream)
+    header = next(values, None)
+
+    if not isinstance(header, dict):
+        raise ImportFormatError("The first line must be a table header object", 1)
+
+    header["columns"] = [
+        column if isinstance(column, dict) else {"name": column}
+        for column in header.get("columns") or []
+    ]
+
+    def get_rows():
+        for line, value in enumerate(values, start=2):
+            if isinstance(value, list):
+                yield line, None, value
+            elif isinstance(value, dict) and isinstance(value.get("cells"), list):
+                yield line, value.get("name"), value["cells"]
+            else:
+                raise ImportFormatError("Each row must be a list or have cells", line)
+
+    return header, get_rows()
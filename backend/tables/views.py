@@ -1,8 +1,11 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import *
 from .serializers import *
+from .utils import build_table, import_table, read_csv_table, read_ndjson_table
 from backend.custom_views import *
+from backend.importers import DEFAULT_BATCH_SIZE, ImportFormatError
 
 
 class TableAPIView(BaseListView):
@@ -134,34 +137,47 @@ class TableBuilder(generics.CreateAPIView):
 
     def post(self, request, *args, **kwargs):
         data = self.validate_data(request.data)
-        columns_data = data.pop("columns")
-        table = Table(**data)
-        table.save()
+        table = build_table(data, get_table_layout({"request": request}))
 
-        created_rows = {}
-        for column_data in columns_data:
-            rows = column_data.pop("rows", [])
-            column = Column.objects.create(table=table, **column_data)
+        return Response(table, status=status.HTTP_201_CREATED)
 
-            for row_data in rows:
-                row_name = row_data.pop("name")
-                cells_data = row_data.pop("cells", [])
 
-                if row_name in created_rows:
-                    row = created_rows[row_name]
-                else:
-                    row = Row.objects.create(table=table, name=row_name)
-                    created_rows[row_name] = row
+class TableImportView(APIView):
+    """
+    Stream a CSV or NDJSON request body into a new table.
 
-                for cell_data in cells_data:
-                    cell = Cell.objects.create(column=column, row=row, **cell_data)
+    The body is read incrementally from the request stream instead of being
+    parsed into ``request.data``, and rows are inserted in batches.
+    """
 
-        table = Table.objects.get(id=table.id)
+    import_format = "csv"
 
-        serializer = TableSerializer(instance=table, data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-        else:
-            print(serializer.errors)
+    def get_batch_size(self, request):
+        try:
+            return max(1, int(request.query_params.get("batch_size", DEFAULT_BATCH_SIZE)))
+        except ValueError:
+            return DEFAULT_BATCH_SIZE
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    def post(self, request, *args, **kwargs):
+        stream = request.stream
+
+        if stream is None:
+            return Response(
+                {"detail": "Request body is empty"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            if self.import_format == "json":
+                header, rows = read_ndjson_table(stream)
+                name = header.get("name") or request.query_params.get("name")
+                columns = header["columns"]
+            else:
+                columns, rows = read_csv_table(stream)
+                name = request.query_params.get("name")
+
+            result = import_table(name, columns, rows, self.get_batch_size(request))
+        except (ImportFormatError, UnicodeDecodeError) as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(result, status=status.HTTP_201_CREATED)
@@ -1,6 +1,8 @@
 from backend.custom_views import *
 from .models import *
 from .serializers import *
+from backend.bulk import expire_model_caches
+from backend.counts import adjust_row_count
 from rest_framework import generics
 from django.db.models import Q
 from django.utils.text import slugify
@@ -57,9 +59,8 @@ class TaskListDetailAPIView(BaseDetailView):
     def update(self, request, *args, **kwargs):
         data = request.data.copy()
         instance = self.get_object()
-        old_instance = self.model_class.objects.get(pk=instance.pk)
         sections = data.pop("sections")
-        author = User.objects.get(username=request.username)
+        author = request.username
 
         created_sections = []
         for section in sections:
@@ -107,7 +108,7 @@ class TaskListBuilder(generics.CreateAPIView):
 
     def post(self, request, *args, **kwargs):
         data = request.data.copy()
-        author = User.objects.get(username=request.username)
+        author = request.username
         data["author"] = author
 
         task_list = TaskList.objects.create(**data)
@@ -141,5 +142,9 @@ class TaskListByTitle(generics.ListAPIView):
             not in [t.lower() for t in existing_titles]
         ]
         TaskList.objects.bulk_create(new_task_lists)
+        adjust_row_count(TaskList, len(new_task_lists))
+
+        if new_task_lists:
+            expire_model_caches(TaskList)
 
         return TaskList.objects.filter(query)
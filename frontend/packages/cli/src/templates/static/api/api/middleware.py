@@ -6,6 +6,9 @@ from django.http import JsonResponse, HttpResponseForbidden, HttpRequest, HttpRe
 from django.contrib.auth import get_user_model
 from django.conf import settings
 from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from authorization.tokens import get_lazy_token_user, get_token_from_header
+from .sy_audit import buffered_audit_log
 
 
 User = get_user_model()
@@ -23,25 +26,27 @@ class SyMiddleware:
 
         self.get_response = get_response
 
-    def check_headers_for_user(self, request: HttpRequest) -> Optional[User]:
+    def check_headers_for_user(self, request: HttpRequest) -> Optional[SimpleLazyObject]:
         """
-        Checks the request headers for an authorization header containing a JWT token. If a valid token is found, it decodes the token, retrieves the corresponding user from the database, and returns the user object.
+        Checks the request headers for an authorization header containing a JWT token. If a valid token is found, it returns a lazy user that is loaded from the database the first time it is used.
+        The lazy user is stored on the request, so every middleware and view shares one lookup.
         """
 
-        auth_header = request.headers.get("Authorization")
+        if hasattr(request, "_sy_token_user"):
+            return request._sy_token_user
 
-        if auth_header:
-            token = auth_header.split(" ")[1]
+        token = get_token_from_header(request)
+        user = None
 
-            decoded_token = jwt.decode(
-                jwt=token, key=settings.SECRET_KEY, algorithms=["HS256"]
-            )
-            username = decoded_token["user"]
-            user = User.objects.get(username=username)
+        if token:
+            try:
+                user = get_lazy_token_user(token)
+            except (jwt.exceptions.InvalidTokenError, KeyError):
+                user = None
 
-            return user
+        request._sy_token_user = user
 
-        return None
+        return user
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         """
@@ -71,7 +76,7 @@ class JWTMiddleware(SyMiddleware):
 
         user = self.check_headers_for_user(request)
 
-        if user:
+        if user is not None:
             request.username = user
 
 
@@ -98,6 +103,28 @@ class RequestLoggingMiddleware(SyMiddleware):
         logger.info(log_message)
 
 
+class SyAuditLogMiddleware:
+    """
+    Middleware for batching audit log entries.
+
+    This middleware collects the log entries created while handling a request and writes them with a single
+    INSERT once the response has been produced.
+    """
+
+    def __init__(self, get_response: callable):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Handles the request inside a buffered audit log block.
+        """
+
+        with buffered_audit_log():
+            response = self.get_response(request)
+
+        return response
+
+
 class RateLimitingMiddleware(SyMiddleware):
     """
     Middleware for rate limiting requests.
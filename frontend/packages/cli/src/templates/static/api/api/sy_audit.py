@@ -0,0 +1,181 @@
+import atexit
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator, List, Optional
+
+from auditlog.models import LogEntry
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, transaction
+from django.db.models import Model
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+_request_buffer: ContextVar[Optional[List[LogEntry]]] = ContextVar(
+    "sy_audit_log_buffer", default=None
+)
+
+
+def build_log_entry(
+    action: int, actor: Any, instance: Model, changes: Optional[str], timestamp=None
+) -> LogEntry:
+    """
+    Builds an unsaved log entry for the given action, actor, model instance, and changes.
+    """
+
+    return LogEntry(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+        object_repr=str(instance),
+        action=action,
+        actor=actor,
+        changes=changes or "",
+        timestamp=timestamp or timezone.now(),
+    )
+
+
+class SyAuditLogWriter:
+    """
+    Background thread that writes queued log entries with `bulk_create`. It is used when `AUDIT_LOG_ASYNC` is
+    enabled so the INSERT does not add to the response time. Pending entries are flushed at interpreter exit.
+    """
+
+    batch_size: int = 500
+
+    def __init__(self) -> None:
+        """
+        Initializes the queue; the thread is started on first use.
+        """
+
+        self.queue: queue.Queue = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Starts the writer thread if it is not running.
+        """
+
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.run, name="sy-audit-log-writer", daemon=True
+                )
+                self.thread.start()
+
+    def put(self, entries: Iterable[LogEntry]) -> None:
+        """
+        Queues log entries for the writer thread.
+        """
+
+        self.start()
+        self.queue.put(list(entries))
+
+    def run(self) -> None:
+        """
+        Writes every batch that is waiting in the queue with one `bulk_create`.
+        """
+
+        while True:
+            batches = [self.queue.get()]
+
+            while True:
+                try:
+                    batches.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self.write(batches)
+
+    def write(self, batches: List[List[LogEntry]]) -> None:
+        """
+        Inserts the entries of the given batches and marks them as done.
+        """
+
+        entries = [entry for batch in batches for entry in batch]
+
+        try:
+            close_old_connections()
+            LogEntry.objects.bulk_create(entries, batch_size=self.batch_size)
+        except Exception:
+            logger.exception("Could not write %s audit log entries", len(entries))
+        finally:
+            for _ in batches:
+                self.queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Blocks until every queued entry has been written.
+        """
+
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+
+audit_log_writer = SyAuditLogWriter()
+atexit.register(audit_log_writer.flush)
+
+
+def write_log_entries(entries: Iterable[LogEntry]) -> None:
+    """
+    Writes log entries now, or hands them to the background writer when `AUDIT_LOG_ASYNC` is enabled.
+    """
+
+    entries = list(entries)
+
+    if not entries:
+        return
+
+    if getattr(settings, "AUDIT_LOG_ASYNC", False):
+        audit_log_writer.put(entries)
+    else:
+        LogEntry.objects.bulk_create(entries, batch_size=SyAuditLogWriter.batch_size)
+
+
+def queue_log_entries(entries: Iterable[LogEntry]) -> None:
+    """
+    Records log entries once the current transaction commits. Inside `buffered_audit_log` (every request, see
+    SyAuditLogMiddleware) the entries are collected and written with one INSERT at the end of the block.
+    Entries of a rolled back transaction are dropped.
+    """
+
+    entries = list(entries)
+
+    if not entries:
+        return
+
+    def enqueue() -> None:
+        buffer = _request_buffer.get()
+
+        if buffer is None:
+            write_log_entries(entries)
+        else:
+            buffer.extend(entries)
+
+    transaction.on_commit(enqueue)
+
+
+@contextmanager
+def buffered_audit_log() -> Iterator[None]:
+    """
+    Collects the log entries queued inside the block and writes them together when it exits.
+    """
+
+    outer = _request_buffer.get()
+    token = _request_buffer.set([])
+
+    try:
+        yield
+    finally:
+        entries = _request_buffer.get()
+        _request_buffer.reset(token)
+
+        if outer is not None:
+            outer.extend(entries)
+        else:
+            write_log_entries(entries)
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 from auditlog.models import LogEntry
 from django.db.models import ForeignKey, ManyToManyField, Model, ImageField
@@ -8,6 +8,7 @@ from django.contrib.contenttypes.models import ContentType
 from rest_framework.exceptions import NotFound
 
 from authorization.models import User
+from .sy_audit import build_log_entry, queue_log_entries
 
 
 class SyProcessingMixin:
@@ -136,8 +137,7 @@ class SyProcessingMixin:
         request and populating the author field with the user's ID.
         """
 
-        author = User.objects.get(username=request.username)
-        data["author"] = author.id
+        data["author"] = request.username.id
 
     def check_data_for_images(self, instance, request) -> Dict[str, Any]:
         """
@@ -220,24 +220,66 @@ class SyLoggingMixin:
         self, action: str, username: str, instance: Model, changes: str
     ) -> None:
         """
-        Creates a log entry for the given action, username, model instance, and changes. It saves the log entry to the database.
+        Creates a log entry for the given action, username, model instance, and changes. The entry is queued and
+        written together with the other entries of the request once the transaction commits.
         """
 
-        content_type = ContentType.objects.get_for_model(instance)
+        queue_log_entries([build_log_entry(action, username, instance, changes)])
 
-        if not changes:
-            changes = ""
+    def log_bulk_entries(
+        self,
+        request,
+        action: int,
+        instances: List[Model],
+        changes: Optional[Dict[Any, str]] = None,
+    ) -> None:
+        """
+        Creates one log entry per instance for a bulk operation and writes them with a single INSERT. `changes`
+        optionally maps an instance's primary key to its change string.
+        """
+
+        timestamp = timezone.now()
+        actor = getattr(request, "username", None)
+
+        queue_log_entries(
+            [
+                build_log_entry(
+                    action,
+                    actor,
+                    instance,
+                    changes.get(instance.pk) if changes else None,
+                    timestamp,
+                )
+                for instance in instances
+            ]
+        )
+
+    def log_bulk_update(
+        self, request, instances: List[Model], values: Dict[str, Any]
+    ) -> None:
+        """
+        Logs one update entry per instance changed by a bulk update. `instances` hold the values from before the
+        update and `values` the field values written by it.
+        """
+
+        changes: Dict[Any, str] = {}
+
+        for instance in instances:
+            instance_changes = [
+                f"{name}: {getattr(instance, name)} -> {new_value}"
+                for name, new_value in values.items()
+                if str(getattr(instance, name)) != str(new_value)
+            ]
+
+            if instance_changes:
+                changes[instance.pk] = ", ".join(instance_changes)
 
-        log_entry = LogEntry(
-            content_type=content_type,
-            object_id=instance.pk,
-            object_repr=str(instance),
-            action=action,
-            actor=username,
-            changes=changes,
-            timestamp=timezone.now(),
+        self.log_bulk_entries(
+            request,
+            LogEntry.Action.UPDATE,
+            [instance for instance in instances if instance.pk in changes],
+            changes,
         )
-        log_entry.save()
 
     def return_changes(self, instance: Model, old_instance: Model) -> str:
         """
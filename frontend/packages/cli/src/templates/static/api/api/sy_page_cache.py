@@ -0,0 +1,164 @@
+import hashlib
+from typing import Any, Dict, List, Optional, Set, Type
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from api.utils import get_serialized_page_data
+
+
+PAGE_CACHE_TIMEOUT: int = getattr(settings, "PAGE_CACHE_TIMEOUT", 60 * 60 * 24)
+
+_page_dependencies: Dict[str, List[str]] = {}
+
+
+def get_model_version_key(label: str) -> str:
+    """
+    Returns the cache key holding the version of a model's rows.
+    """
+
+    return f"page-model-version:{label}"
+
+
+def invalidate_pages(model: Type[Model]) -> None:
+    """
+    Expires every cached page that includes rows of the given model.
+    """
+
+    key = get_model_version_key(model._meta.label)
+    cache.add(key, 0, None)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_pages_on_change(sender: Type[Model], **kwargs: Any) -> None:
+    """
+    Expires the pages that include the saved or deleted object's model.
+    """
+
+    invalidate_pages(sender)
+
+
+@receiver(m2m_changed)
+def invalidate_pages_on_m2m_change(
+    sender: Type[Model], instance: Model, action: str, model: Type[Model], **kwargs: Any
+) -> None:
+    """
+    Expires the pages that include either side of a changed many-to-many relation.
+    """
+
+    if action.startswith("post_"):
+        invalidate_pages(type(instance))
+        invalidate_pages(model)
+
+
+def get_serializer_models(
+    serializer: BaseSerializer, seen: Optional[Set[Type[Model]]] = None
+) -> Set[Type[Model]]:
+    """
+    Returns the models a serializer reads: its own model, the models of its relation fields and,
+    recursively, those of nested serializers.
+    """
+
+    seen = set() if seen is None else seen
+
+    if isinstance(serializer, ListSerializer):
+        serializer = serializer.child
+
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+
+    if model is None or model in seen:
+        return seen
+
+    seen.add(model)
+
+    for field in serializer.fields.values():
+        if isinstance(field, BaseSerializer):
+            get_serializer_models(field, seen)
+            continue
+
+        source = (field.source or "").split(".")[0]
+
+        try:
+            model_field = model._meta.get_field(source)
+        except Exception:
+            continue
+
+        if model_field.is_relation and model_field.related_model is not None:
+            seen.add(model_field.related_model)
+
+    return seen
+
+
+def get_page_dependencies(page_name: str, model_dict: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Returns the labels of the models a page is built from. Each model_dict entry depends on its model
+    and the models its serializer reads; `"depends_on": ["app_label.ModelName"]` adds others.
+    """
+
+    dependencies = _page_dependencies.get(page_name)
+
+    if dependencies is None:
+        labels: Set[str] = set()
+
+        for dto_name, model_options in model_dict.items():
+            model = apps.get_model(
+                app_label=model_options.get("app_label"),
+                model_name=model_options.get("model_name", dto_name),
+            )
+            serializer = model.serializer_class()
+            labels.update(m._meta.label for m in get_serializer_models(serializer))
+            labels.update(model_options.get("depends_on", []))
+
+        dependencies = _page_dependencies[page_name] = sorted(labels)
+
+    return dependencies
+
+
+def get_page_cache_key(
+    page_name: str, model_dict: Dict[str, Dict[str, Any]], request: HttpRequest
+) -> str:
+    """
+    Builds the cache key of a page from the current version of each model it depends on and the host
+    the absolute media URLs are built with.
+    """
+
+    labels = get_page_dependencies(page_name, model_dict)
+    versions = cache.get_many([get_model_version_key(label) for label in labels])
+    signature = ",".join(
+        f"{label}={versions.get(get_model_version_key(label), 0)}" for label in labels
+    )
+    signature = f"{request.build_absolute_uri(request.path)}|{signature}"
+
+    return f"page:{page_name}:{hashlib.md5(signature.encode()).hexdigest()}"
+
+
+def get_cached_page_response(
+    page_name: str, model_dict: Dict[str, Dict[str, Any]], request: HttpRequest
+) -> HttpResponse:
+    """
+    Returns a page built by get_serialized_page_data as a JSON response. The rendered bytes are cached
+    until a model the page depends on changes and are returned as they are on a cache hit.
+    """
+
+    cache_key = get_page_cache_key(page_name, model_dict, request)
+    content: Optional[bytes] = cache.get(cache_key)
+
+    if content is None:
+        data = get_serialized_page_data(model_dict, request)
+        content = JSONRenderer().render(data)
+        cache.set(cache_key, content, PAGE_CACHE_TIMEOUT)
+
+    return HttpResponse(content, content_type="application/json")
@@ -0,0 +1,94 @@
+from typing import Optional, Tuple
+from urllib import parse
+
+from django.db.models import QuerySet
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class SyKeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination on `created_at` or the primary key. Pagination is opt-in: lists are paginated when the view sets `paginate = True`, or leaves `paginate` unset and the model was declared with `@metadata(paginate=True)`, and then hold at most `page_size` rows whether or not the request asks for a page. Other lists keep returning every row. The body stays a plain array for the admin tables; cursors are returned in the `Link`, `X-Next-Cursor` and `X-Previous-Cursor` headers, which `CORS_EXPOSE_HEADERS` exposes.
+    """
+
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> Optional[list]:
+        """
+        Returns the requested page, or None when pagination is not enabled for the request.
+        """
+
+        if not self.is_enabled(queryset, request, view):
+            return None
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def is_enabled(self, queryset: QuerySet, request, view=None) -> bool:
+        """
+        Decides whether the request should be paginated based on the view and the model metadata.
+        """
+
+        paginate = getattr(view, "paginate", None)
+
+        if paginate is not None:
+            return paginate
+
+        return getattr(queryset.model._meta, "paginate", False)
+
+    def get_ordering(self, request, queryset: QuerySet, view) -> Tuple[str, ...]:
+        """
+        Orders by the view's `pagination_ordering`, else by `-created_at` when the model has a non-null `created_at`, else by `-pk`.
+        """
+
+        ordering = getattr(view, "pagination_ordering", None)
+
+        if ordering:
+            return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+        fields = {field.name: field for field in queryset.model._meta.fields}
+        created_at = fields.get("created_at")
+
+        if created_at is not None and not created_at.null:
+            return ("-created_at", "-pk")
+
+        return ("-pk",)
+
+    def get_paginated_response(self, data) -> Response:
+        """
+        Returns the page as a plain list and exposes the cursors through response headers.
+        """
+
+        next_link = self.get_next_link()
+        previous_link = self.get_previous_link()
+        links = []
+
+        if next_link:
+            links.append(f'<{next_link}>; rel="next"')
+
+        if previous_link:
+            links.append(f'<{previous_link}>; rel="prev"')
+
+        headers = {"X-Page-Size": str(self.page_size)}
+
+        if links:
+            headers["Link"] = ", ".join(links)
+
+        if next_link:
+            headers["X-Next-Cursor"] = self.get_cursor_from_link(next_link)
+
+        if previous_link:
+            headers["X-Previous-Cursor"] = self.get_cursor_from_link(previous_link)
+
+        return Response(data, headers=headers)
+
+    def get_cursor_from_link(self, link: str) -> str:
+        """
+        Extracts the encoded cursor value from a pagination link.
+        """
+
+        query = parse.parse_qs(parse.urlsplit(link).query)
+
+        return query.get(self.cursor_query_param, [""])[0]
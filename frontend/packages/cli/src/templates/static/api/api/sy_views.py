@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Type
+from typing import Dict, Any, List, Optional, Type
 
 from django.shortcuts import get_object_or_404
 from django.db.models import Model, QuerySet
@@ -26,6 +26,7 @@ class SyBaseView(
     fk_fields: List[str] = []
     mtm_fields: Dict[str, str] = {}
     mtm_values: Dict[str, List[Any]] = {}
+    paginate: Optional[bool] = None
 
     def get_queryset(self) -> QuerySet:
         """
@@ -121,7 +122,7 @@ class SyUpdateDestroyView(SyBaseView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class SyBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
+class SyBulkView(SyLoggingMixin, generics.DestroyAPIView, generics.UpdateAPIView):
     """
     This custom view combines the update (PUT) and destroy (DELETE) operations for multiple objects in a bulk manner. It includes methods for handling bulk updates and deletions.
     """
@@ -142,12 +143,14 @@ class SyBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
 
         queryset = self.filter_queryset(self.get_queryset())
         queryset = queryset.filter(id__in=self.ids)
+        objects = list(queryset)
 
-        for obj in queryset:
+        for obj in objects:
             if hasattr(obj, "image") and obj.image is not None:
                 obj.image.delete()
 
         deleted = queryset.delete()
+        self.log_bulk_entries(request, LogEntry.Action.DELETE, objects)
 
         if self.model_class.__name__ == "Messages":
             unread_queryset = self.filter_queryset(self.get_queryset())
@@ -179,12 +182,17 @@ class SyBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
 
         queryset = self.filter_queryset(self.get_queryset())
         queryset = queryset.filter(id__in=self.ids)
+        objects = list(queryset)
 
         if field[0] == "is_archived":
-            updated = queryset.update(**{field[0]: value, "is_read": True})
+            values = {field[0]: value, "is_read": True}
+            updated = queryset.update(**values)
+            self.log_bulk_update(request, objects, values)
 
         if field[0] == "is_read" and value == True:
-            updated = queryset.update(**{field[0]: value})
+            values = {field[0]: value}
+            updated = queryset.update(**values)
+            self.log_bulk_update(request, objects, values)
             unread_queryset = self.filter_queryset(self.get_queryset())
             unread_queryset = unread_queryset.filter(is_read=False)
             count = unread_queryset.count()
@@ -192,7 +200,9 @@ class SyBulkView(generics.DestroyAPIView, generics.UpdateAPIView):
             return Response({"count": count}, status=status.HTTP_200_OK)
 
         elif field[0] == "is_read" and value == False:
-            updated = queryset.update(**{field[0]: value, "is_archived": False})
+            values = {field[0]: value, "is_archived": False}
+            updated = queryset.update(**values)
+            self.log_bulk_update(request, objects, values)
             unread_queryset = self.filter_queryset(self.get_queryset())
             unread_queryset = unread_queryset.filter(is_read=False)
             count = unread_queryset.count()
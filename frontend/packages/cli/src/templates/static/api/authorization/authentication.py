@@ -3,6 +3,7 @@ from rest_framework import exceptions
 from django.conf import settings
 import jwt
 from .models import User
+from .tokens import decode_token, resolve_token_user
 from typing import Tuple, Optional
 
 
@@ -19,14 +20,12 @@ class JWTTokenAuthentication(TokenAuthentication):
 
         try:
             token = authorization_header.split(" ")[1]
-            username = jwt.decode(
-                jwt=token, key=settings.SECRET_KEY, algorithms=["HS256"]
-            )
+            username = decode_token(token)
 
         except jwt.exceptions.InvalidTokenError:
             raise exceptions.AuthenticationFailed("Invalid token")
 
-        user = User.objects.get(username=username["user"])
+        user = resolve_token_user(token, username["user"])
 
         if not user:
             raise exceptions.AuthenticationFailed("User not found")
@@ -58,4 +58,5 @@ TOKEN_BLACKLIST_METADATA = {
         },
     },
     "allowed": False,
+    "paginate": True,
 }
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import AbstractUser, UserManager
 from api.sy_fields import *
 from .metadata import *
@@ -195,3 +197,15 @@ class TokenBlacklist(models.Model):
     class Meta:
         verbose_name = "Token Blacklist"
         verbose_name_plural = "Token Blacklist"
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs) -> None:
+    """
+    Drops the cached tokens of a user whenever the user is saved or deleted.
+    """
+
+    from .tokens import invalidate_user
+
+    invalidate_user(instance.username)
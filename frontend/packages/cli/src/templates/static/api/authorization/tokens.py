@@ -0,0 +1,129 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.utils.functional import SimpleLazyObject
+from .models import User
+
+
+TOKEN_USER_CACHE_TIMEOUT = getattr(settings, "JWT_USER_CACHE_TIMEOUT", 300)
+
+
+def get_token_hash(token: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a token.
+    """
+
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_user_generation(username: str) -> int:
+    """
+    Returns the cache generation of a user, bumped whenever the user changes.
+    """
+
+    return cache.get(f"jwt-user-generation:{username}", 0)
+
+
+def get_token_cache_key(token: str, username: str) -> str:
+    """
+    Returns the cache key holding the user id of a token.
+    """
+
+    return f"jwt-user:{username}:{get_user_generation(username)}:{get_token_hash(token)}"
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """
+    Verifies the signature and expiry of a token and returns its payload.
+    """
+
+    return jwt.decode(jwt=token, key=settings.SECRET_KEY, algorithms=["HS256"])
+
+
+def get_token_from_header(request: HttpRequest) -> Optional[str]:
+    """
+    Returns the bearer token of the Authorization header, if any.
+    """
+
+    auth_header = request.headers.get("Authorization")
+
+    if not auth_header:
+        return None
+
+    parts = auth_header.split(" ")
+
+    return parts[1] if len(parts) > 1 else None
+
+
+def resolve_token_user(token: str, username: str) -> User:
+    """
+    Returns the user a verified token belongs to. The user id is cached per token for
+    `JWT_USER_CACHE_TIMEOUT` seconds, so the lookup is a primary key fetch once the token
+    has been seen. Raises `User.DoesNotExist` if the user no longer exists or was renamed.
+    """
+
+    cache_key = get_token_cache_key(token, username)
+    user_id = cache.get(cache_key)
+
+    if user_id is not None:
+        user = User.objects.get(pk=user_id)
+
+        if user.username != username:
+            cache.delete(cache_key)
+            raise User.DoesNotExist
+
+        return user
+
+    user = User.objects.get(username=username)
+    cache.set(cache_key, user.pk, TOKEN_USER_CACHE_TIMEOUT)
+
+    return user
+
+
+def get_lazy_token_user(token: str) -> SimpleLazyObject:
+    """
+    Verifies a token and returns a lazy object for its user. The database is queried the
+    first time the user is actually used, and at most once. Raises
+    `jwt.exceptions.InvalidTokenError` if the token is invalid or expired.
+    """
+
+    username = decode_token(token)["user"]
+
+    return SimpleLazyObject(lambda: resolve_token_user(token, username))
+
+
+def invalidate_token(token: str) -> None:
+    """
+    Drops the cached user of a token, e.g. on logout.
+    """
+
+    try:
+        username = jwt.decode(
+            jwt=token,
+            key=settings.SECRET_KEY,
+            algorithms=["HS256"],
+            options={"verify_exp": False},
+        )["user"]
+    except (jwt.exceptions.InvalidTokenError, KeyError):
+        return
+
+    cache.delete(get_token_cache_key(token, username))
+
+
+def invalidate_user(username: str) -> None:
+    """
+    Drops every cached token of a user, e.g. when the user changes.
+    """
+
+    cache_key = f"jwt-user-generation:{username}"
+
+    cache.add(cache_key, 0, None)
+
+    try:
+        cache.incr(cache_key)
+    except ValueError:
+        cache.set(cache_key, 1, None)
@@ -10,6 +10,7 @@ from rest_framework.response import Response
 from django.db import IntegrityError
 from .models import User, TokenBlacklist
 from .serializers import *
+from .tokens import invalidate_token, resolve_token_user
 import json
 import jwt
 from rest_framework.decorators import permission_classes
@@ -35,7 +36,7 @@ def verify_jwt(request) -> JsonResponse:
             jwt=token, key=settings.SECRET_KEY, algorithms=["HS256"]
         )
         username = decoded_token["user"]
-        user = User.objects.get(username=username)
+        user = resolve_token_user(token, username)
         expiration_time = datetime.datetime.fromtimestamp(decoded_token["exp"])
 
         if expiration_time - datetime.timedelta(days=1) <= datetime.datetime.now():
@@ -204,6 +205,7 @@ def logout_view(request) -> JsonResponse:
     try:
         logout(request)
         TokenBlacklist.objects.create(token=token)
+        invalidate_token(token)
 
         return JsonResponse({"message": "User logged out successfully"})
 
@@ -158,4 +158,5 @@ POST_METADATA = {
         "is_highlighted",
     ],
     "allowed": False,
+    "paginate": True,
 }
@@ -5,7 +5,7 @@ from django.http import JsonResponse
 from .models import *
 from .serializers import *
 
-from api.utils import get_serialized_page_data
+from api.sy_page_cache import get_cached_page_response
 from api.sy_views import *
 
 
@@ -29,9 +29,7 @@ class HomeFullTestView(generics.GenericAPIView):
             # },
         }
 
-        data = get_serialized_page_data(model_dict, request)
-
-        return Response(data)
+        return get_cached_page_response("home", model_dict, request)
 
 
 class HeroHeaderMainAPIView(